@@ -0,0 +1,55 @@
+"""Benchmark of load case evaluation with LiftAnalysis
+
+Compares evaluation of single load cases with LiftAnalysis.__call__
+and the compiled load case operator for single cases and matrices
+of load cases. Only matrices of load cases reach sub-microsecond
+times per case, single cases are limited by Python call overhead.
+
+Run from the repository root with: python -m benchmarks.bench_loadcases
+"""
+import timeit
+
+import numpy as np
+
+from wingstructure.data.wing import Wing
+from wingstructure.aero import LiftAnalysis
+
+
+def main(Ms=(31, 63, 127), K=10000):
+    wing = Wing()
+
+    wing.append(chord=1.0, twist=1.0)
+    wing.append(chord=0.8, pos=(0.0, 3.0, 0.0))
+    wing.append(chord=0.4, twist=-2.0, pos=(0.1, 7.5, 0.0))
+
+    wing.add_controlsurface('flap', 0.5, 5.0, 0.8, 0.8, 'flap')
+    wing.add_controlsurface('aileron', 5.0, 7.0, 0.75, 0.75, 'aileron')
+
+    C_Ls = np.linspace(0.2, 1.4, K)
+    deflections = np.random.uniform(-10.0, 10.0, (K, 2))
+
+    print(f'{"M":>5} {"call [us/case]":>15} {"operator [us/case]":>19}'
+          f' {"matrix [us/case]":>17}')
+
+    for M in Ms:
+        la = LiftAnalysis.generate(wing, M=M)
+        operator = la.compile()
+
+        W = operator.factors(0.8, {'aileron': (5.0, -5.0)})
+        out = np.empty(operator.basis.shape[1])
+
+        W_K = operator.factors(C_Ls, {'aileron': deflections})
+        out_K = np.empty((K, operator.basis.shape[1]))
+
+        t_call = min(timeit.repeat(lambda: la(0.8, 'C_L', {'aileron': (5.0, -5.0)}),
+                                   number=1000, repeat=3))/1000
+        t_op = min(timeit.repeat(lambda: operator.evaluate(W, out),
+                                 number=1000, repeat=3))/1000
+        t_matrix = min(timeit.repeat(lambda: operator.evaluate(W_K, out_K),
+                                     number=10, repeat=3))/10/K
+
+        print(f'{M:5d} {t_call*1e6:15.2f} {t_op*1e6:19.2f} {t_matrix*1e6:17.3f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""Benchmark of multhopp matrix assembly and solution
+
+Compares the former element wise assembly and explicit inversion
+with the vectorized assembly and reuse of the LU factorization
+for increasing numbers of grid points M. Cold timings assemble and
+factorize without influence cache, warm timings take matrices and
+factorization from the cache.
+
+Run from the repository root with: python -m benchmarks.bench_multhop
+"""
+import timeit
+
+import numpy as np
+
+from wingstructure.aero.multhop import MulthopSystem, InfluenceCache
+
+
+def loop_solve(θs, αs, chords, dcls, b):
+    """reference implementation (python loop and explicit inverse)"""
+    M = len(θs)
+
+    Bb = np.zeros((M, M))
+    Bd = np.zeros(M)
+
+    for v, (θv, c, dcl_v) in enumerate(zip(θs, chords, dcls)):
+        for n, θn in enumerate(θs):
+            if v == n:
+                Bb[v, v] = (M+1)/(4*np.sin(θv))
+                Bd[v] = 2*b/(dcl_v*c)
+            else:
+                Bb[v, n] = - ((1-(-1.)**(v-n))/2*(np.sin(θn)/ \
+                            ((M+1)*(np.cos(θn)-np.cos(θv))**2)))
+
+    B = Bb + np.diag(Bd)
+
+    γs = np.dot(np.linalg.inv(B), αs)
+
+    return γs, Bb@γs
+
+
+def main(Ms=(15, 31, 63, 127, 255), n_rhs=4):
+    b = 15.0
+
+    print(f'{"M":>5} {"loop [ms]":>12} {"cold [ms]":>10} {"speedup":>8}'
+          f' {"warm [ms]":>10} {"reuse/rhs [ms]":>15}')
+
+    for M in Ms:
+        θs = np.linspace(np.pi/(M+1), M/(M+1)*np.pi, M)
+        chords = np.linspace(1.0, 0.4, M)
+        dcls = np.full(M, 2*np.pi)
+        αss = [np.random.rand(M) for _ in range(n_rhs)]
+
+        def loop():
+            for αs in αss:
+                loop_solve(θs, αs, chords, dcls, b)
+
+        def cold():
+            system = MulthopSystem(θs, chords, dcls, b, cache=InfluenceCache(0))
+            for αs in αss:
+                system.solve(αs)
+
+        def warm():
+            system = MulthopSystem(θs, chords, dcls, b)
+            for αs in αss:
+                system.solve(αs)
+
+        system = MulthopSystem(θs, chords, dcls, b)
+
+        def reuse():
+            system.solve(αss[0])
+
+        number = 3 if M > 100 else 10
+
+        t_loop = min(timeit.repeat(loop, number=number, repeat=3))/number
+        t_cold = min(timeit.repeat(cold, number=number, repeat=3))/number
+        t_warm = min(timeit.repeat(warm, number=number, repeat=3))/number
+        t_reuse = min(timeit.repeat(reuse, number=100, repeat=3))/100
+
+        print(f'{M:5d} {t_loop*1e3:12.3f} {t_cold*1e3:10.3f} {t_loop/t_cold:8.1f}'
+              f' {t_warm*1e3:10.3f} {t_reuse*1e3:15.4f}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,242 @@
+import numpy as np
+import pytest
+
+from wingstructure.aero import LiftAnalysis
+
+from .wings import d38wing
+
+
+@pytest.fixture
+def controlwing():
+    from wingstructure.data.wing import Wing
+
+    awing = Wing()
+
+    awing.append(chord=1.0, twist=1.0)
+    awing.append(chord=0.8, pos=(0.0, 3.0, 0.0))
+    awing.append(chord=0.4, twist=-2.0, pos=(0.1, 7.5, 0.0))
+
+    awing.add_controlsurface('flap', 0.5, 5.0, 0.8, 0.8, 'flap')
+    awing.add_controlsurface('aileron', 5.0, 7.0, 0.75, 0.75, 'aileron')
+    awing.add_controlsurface('airbrake', 1.0, 2.0, 0.5, 0.5, 'airbrake')
+
+    return awing
+
+
+def test_sweep(controlwing):
+    la = LiftAnalysis.generate(controlwing)
+
+    C_Ls = np.array([0.2, 0.8, 1.4])
+    aileron = np.array([[0.0, 0.0], [10.0, -10.0], [-5.0, 7.0]])
+    airbrake = np.array([False, True, False])
+
+    α, c_ls, C_Di, C_Mx = la.sweep(C_Ls, controls={'aileron': aileron, 'flap': (5.0, 5.0)},
+                                   airbrake=airbrake)
+
+    assert c_ls.shape == (3, len(la.ys))
+
+    for i in range(3):
+        ref = la.calculate(C_Ls[i], {'aileron': aileron[i], 'flap': (5.0, 5.0)},
+                           airbrake[i], all_results=True)
+
+        assert np.isclose(α[i], ref[0])
+        assert np.isclose(c_ls[i], ref[1]).all()
+        assert np.isclose(C_Di[i], ref[2])
+        assert np.isclose(C_Mx[i], ref[3])
+
+
+def test_call_out(controlwing):
+    """results stored in out argument match newly created results"""
+
+    from wingstructure.aero.multhop import MulthopResult
+
+    la = LiftAnalysis.generate(controlwing)
+
+    out = MulthopResult.zeros(la.ys)
+    data = out._data
+
+    for C_L, controls in ((0.5, {}), (1.2, {'aileron': (10, -5), 'flap': (5, 5)})):
+        α1, res1 = la(C_L, 'C_L', controls, airbrake=True)
+        α2, res2 = la(C_L, 'C_L', controls, airbrake=True, out=out)
+
+        assert res2 is out
+        assert out._data is data
+
+        assert np.isclose(α1, α2)
+        assert np.allclose(res1._data, res2._data)
+        assert np.isclose(res2.C_L, C_L)
+
+
+def test_call_out_no_allocation(controlwing):
+    """repeated evaluations with out argument do not allocate memory"""
+
+    import tracemalloc
+
+    from wingstructure.aero.multhop import MulthopResult
+
+    la = LiftAnalysis.generate(controlwing, M=127)
+
+    out = MulthopResult.zeros(la.ys)
+    
+    # instance calls allocate argument tuples in the interpreter
+    call = la.__call__
+
+    for target, target_type, controls in ((0.8, 'C_L', {}), (0.1, 'alpha', {}),
+                                          (0.8, 'C_L', {'aileron': (10.0, -5.0)})):
+        # warm up
+        call(target, target_type, controls, True, out=out)
+
+        tracemalloc.start()
+        try:
+            tracemalloc.clear_traces()
+            call(target, target_type, controls, True, out=out)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        assert peak == 0
+
+        α, ref = la(target, target_type, controls, True)
+        assert np.allclose(out._data, ref._data)
+
+
+def test_loadcase_operator(controlwing):
+    la = LiftAnalysis.generate(controlwing)
+    operator = la.compile()
+
+    controls = {'aileron': (10.0, -5.0), 'flap': (5.0, 5.0)}
+
+    α, res, C_Mx = operator(0.9, controls, airbrake=True)
+    α_ref, c_ls, C_Di, C_Mx_ref = la.calculate(0.9, controls, airbrake=True, all_results=True)
+
+    assert np.isclose(np.degrees(α), α_ref)
+    assert np.allclose(res.c_ls, c_ls)
+    assert np.isclose(res.C_L, 0.9)
+    assert np.isclose(res.C_Di, C_Di)
+    assert np.isclose(C_Mx, C_Mx_ref)
+
+    # matrix of load cases with preallocated output
+    αs = np.radians([0.0, 2.0, 4.0])
+    out = np.empty((3, operator.basis.shape[1]))
+
+    α, res, C_Mx = operator(αs, {'aileron': (5.0, -5.0)}, target_type='alpha', out=out)
+
+    assert np.shares_memory(res.c_ls, out)
+
+    for k in range(3):
+        C_L, c_ls = la.calculate_aoa(αs[k], {'aileron': (5.0, -5.0)})
+
+        assert np.isclose(res[k].C_L, C_L)
+        assert np.allclose(res[k].c_ls, c_ls)
+
+
+def test_adaptive_gridsize(d38wing):
+    from wingstructure.aero.liftingline import adaptive_gridsize
+
+    conv = adaptive_gridsize(d38wing, tol=1e-3, richardson=False)
+
+    assert conv.error <= 1e-3
+    assert conv.M == conv.history[-1][0]
+    assert conv.extrapolated is None
+
+    # with richardson extrapolation error estimate is available earlier
+    conv_r = adaptive_gridsize(d38wing, tol=1e-3)
+
+    assert conv_r.error <= 1e-3
+    assert conv_r.M <= conv.M
+    assert np.isclose(conv_r.extrapolated['C_L'], conv.C_L, rtol=1e-3)
+
+    la = LiftAnalysis.generate(d38wing, M='adaptive')
+
+    assert len(la.ys) == la.grid_convergence.M == conv_r.M
+
+    # tolerance of grid convergence study
+    la = LiftAnalysis.generate(d38wing, M='adaptive', adaptive_options={'tol': 1e-5})
+
+    assert la.grid_convergence.error <= 1e-5
+    assert la.grid_convergence.M > conv_r.M
+
+    # coefficients of vortex lattice method from its own quadrature
+    conv_vlm = adaptive_gridsize(d38wing, tol=1e-3, method='vortexlattice')
+    la_vlm = LiftAnalysis.generate(d38wing, method='vortexlattice', M=conv_vlm.M)
+
+    assert np.isclose(conv_vlm.C_L, 5*la_vlm._aoa.C_L*np.pi/180 + la_vlm._base.C_L)
+
+
+def test_lift_gradients():
+    """adjoint gradients agree with finite differences"""
+
+    from wingstructure.data.wing import Wing
+    from wingstructure.aero import calculate_lift_gradients
+    from wingstructure.aero.liftingline import calculate_lift, _grid_coefficients
+
+    def make_wing(twists, chords):
+        awing = Wing()
+
+        awing.append(chord=chords[0], twist=twists[0])
+        awing.append(chord=chords[1], twist=twists[1], pos=(0.0, 3.0, 0.0))
+        awing.append(chord=chords[2], twist=twists[2], pos=(0.1, 7.5, 0.0))
+
+        awing.add_controlsurface('aileron', 5.0, 7.0, 0.75, 0.75, 'aileron')
+
+        return awing
+
+    twists = np.array([1.0, 0.0, -2.0])
+    chords = np.array([1.0, 0.8, 0.4])
+    controls = {'aileron': (10.0, -5.0)}
+
+    def results(twists, chords):
+        res = calculate_lift(make_wing(twists, chords), 0.8, controls=controls, M=31,
+                             calc_cmx=True)
+
+        # induced drag of superposed circulation distribution
+        awing = make_wing(twists, chords)
+        la = LiftAnalysis.generate(awing, M=31)
+        C_Di = _grid_coefficients(la(0.8, 'C_L', controls)[1], awing.span, awing.area)[1]
+
+        return np.concatenate([[res['alpha'], C_Di, res['C_Mx']], res['c_ls']])
+
+    grads = calculate_lift_gradients(make_wing(twists, chords), 0.8, controls=controls, M=31)
+
+    h = 1e-5
+
+    for var, values in (('twist', twists), ('chord', chords)):
+        for k in range(3):
+            Δ = np.zeros(3)
+            Δ[k] = h
+
+            if var == 'twist':
+                fd = (results(twists+Δ, chords) - results(twists-Δ, chords))/(2*h)
+            else:
+                fd = (results(twists, chords+Δ) - results(twists, chords-Δ))/(2*h)
+
+            adjoint = np.concatenate([[grads['alpha'][var][k], grads['C_Di'][var][k],
+                                       grads['C_Mx'][var][k]], grads['c_ls'][var][:, k]])
+
+            assert np.allclose(adjoint, fd, atol=1e-6)
+
+    assert np.allclose(grads['C_L']['twist'], 0.0)
+
+
+def test_save_load(controlwing, tmp_path):
+    la = LiftAnalysis.generate(controlwing)
+
+    filename = str(tmp_path / 'analysis.wsa')
+    la.save(filename)
+
+    controls = {'aileron': (10.0, -5.0), 'flap': (5.0, 5.0)}
+    reference = la.calculate(0.9, controls, airbrake=True, all_results=True)
+
+    for mmap in (True, False):
+        loaded = LiftAnalysis.load(filename, mmap=mmap)
+
+        assert isinstance(loaded._aoa._data, np.memmap) == mmap
+        assert np.allclose(loaded.ys, la.ys)
+        assert list(loaded._control_surfaces) == list(la._control_surfaces)
+
+        results = loaded.calculate(0.9, controls, airbrake=True, all_results=True)
+
+        for value, ref in zip(results, reference):
+            assert np.allclose(value, ref)
+
+        assert np.allclose(loaded.sweep([0.5, 0.9])[1], la.sweep([0.5, 0.9])[1])
@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+
+from wingstructure.aero import batch_calculate_lift, iter_calculate_lift, calculate_lift
+
+from .wings import d38wing
+
+
+@pytest.fixture
+def wings(d38wing):
+    from wingstructure.data.wing import Wing
+
+    variants = []
+
+    for scale in (0.8, 1.0, 1.2):
+        awing = Wing()
+
+        for sec in d38wing.sections:
+            awing.append(sec.pos, sec.chord*scale, sec.twist, sec.airfoil)
+
+        awing.add_controlsurface('aileron', 5.0, 7.0, 0.75, 0.75, 'aileron')
+
+        variants.append(awing)
+
+    return variants
+
+
+def test_batch_calculate_lift(wings):
+    cases = [{'target': 0.8}, {'target': 1.0, 'controls': {'aileron': (5, -5)}}]
+
+    streamed = []
+
+    results = batch_calculate_lift(wings, cases, workers=2, calc_cmx=True,
+                                   callback=lambda index, res: streamed.append(index))
+
+    assert sorted(streamed) == [0, 1, 2]
+    assert len(results) == 3
+
+    for wing, wingresults in zip(wings, results):
+        for case, res in zip(cases, wingresults):
+            ref = calculate_lift(wing, case['target'], controls=case.get('controls', {}),
+                                 calc_cmx=True)
+
+            assert np.isclose(res['alpha'], ref['alpha'])
+            assert np.isclose(res['C_Mx'], ref['C_Mx'])
+            assert np.allclose(res['c_ls'], ref['c_ls'])
+
+            # both APIs return scalars as floats
+            for name in ('C_L', 'alpha', 'C_Mx'):
+                assert type(res[name]) is float
+                assert type(ref[name]) is float
+
+
+def test_iter_calculate_lift(wings):
+    serialized = [wing.serialize() for wing in wings]
+
+    results = dict(iter_calculate_lift(serialized, {'target': 0.8}, workers=0))
+
+    assert sorted(results) == [0, 1, 2]
+
+    single = batch_calculate_lift(serialized, {'target': 0.8}, workers=0)
+
+    for index, res in enumerate(single):
+        assert np.isclose(res['C_L'], 0.8)
+        assert np.allclose(res['c_ls'], results[index][0]['c_ls'])
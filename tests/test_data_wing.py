@@ -34,6 +34,54 @@ def test_properties(d43wing):
     assert (d43wing.airfoils == '').all()
 
 
+def test_cached_geometry(d38wing):
+    compiled = d38wing.compiled
+
+    assert np.allclose(compiled['y'], [0.0, 4.51, 7.5])
+    assert list(compiled['airfoil']) == ['FX 61-184', 'FX 61-184', 'FX 60-12']
+
+    # compiled data is cached and read only
+    assert d38wing.compiled is compiled
+
+    with pytest.raises(ValueError):
+        compiled['chord'][0] = 1.0
+
+    # section arrays are new arrays, modification does not change the wing
+    chords = d38wing.chords
+    chords[0] = 1.0
+
+    assert d38wing.chords[0] == 0.943
+
+    area = d38wing.area
+
+    # cache is invalidated when sections are appended
+    d38wing.append(chord=0.2, pos=(0.2, 8.0, 0.0))
+
+    assert d38wing.span == 16.0
+    assert d38wing.area > area
+    assert len(d38wing.chords) == 4
+
+    d38wing.sections.append(d38wing.sections[-1]._replace(pos=(0.2, 8.5, 0.0)))
+
+    assert d38wing.span == 17.0
+
+    # and when sections are replaced
+    area = d38wing.area
+
+    d38wing.sections[0] = d38wing.sections[0]._replace(chord=1.0)
+
+    assert d38wing.chords[0] == 1.0
+    assert d38wing.area > area
+
+    d38wing.sections = d38wing.sections[:3]
+
+    assert d38wing.span == 15.0
+
+    d38wing.sections[1:] = [sec._replace(twist=2.0) for sec in d38wing.sections[1:]]
+
+    assert (d38wing.twists == [0.0, 2.0, 2.0]).all()
+
+
 def test_heperfunctions(d43wing):
     d43wing.add_controlsurface('aileron1', 4.0, 8.5, 0.8, 0.8, 'aileron')
     d43wing.add_controlsurface('airbrake1', 2.4, 3.83, 0.5, 0.5, 'airbrake')
@@ -0,0 +1,113 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from wingstructure.aero import LiftAnalysis, AirfoilData, calculate_lift, set_disk_cache
+from wingstructure.aero.multhop import Multhop
+
+from .wings import d38wing
+
+
+@pytest.fixture
+def cache(tmp_path):
+    yield set_disk_cache(str(tmp_path / 'cache'))
+    set_disk_cache(None)
+
+
+def _fail(*args, **kwargs):
+    raise AssertionError('cached result was recalculated')
+
+
+def test_cached_generate(d38wing, cache, monkeypatch):
+    la = LiftAnalysis.generate(d38wing, M=15)
+
+    assert cache.stats['misses'] == 1
+    assert cache.stats['entries'] == 1
+
+    monkeypatch.setattr(Multhop, 'liftbases', _fail)
+
+    cached = LiftAnalysis.generate(d38wing, M=15)
+
+    assert cache.stats['hits'] == 1
+    assert np.allclose(cached(1.0)[1].c_ls, la(1.0)[1].c_ls)
+
+
+def test_cached_calculate_lift(d38wing, cache, monkeypatch):
+    res = calculate_lift(d38wing, 0.8, calc_cmx=True)
+
+    monkeypatch.setattr(Multhop, 'liftbases', _fail)
+
+    cached = calculate_lift(d38wing, 0.8, calc_cmx=True)
+
+    assert cached.keys() == res.keys()
+    assert cached['C_L'] == pytest.approx(res['C_L'])
+    assert type(cached['C_L']) is float
+    assert cached['C_Mx'] == pytest.approx(res['C_Mx'])
+    assert np.allclose(cached['c_ls'], res['c_ls'])
+    assert cached['alpha'] == pytest.approx(res['alpha'])
+
+    # changed arguments or wing are not taken from cache
+    monkeypatch.undo()
+    misses = cache.misses
+
+    calculate_lift(d38wing, 0.9)
+
+    assert cache.misses == misses + 1
+
+    d38wing.append(chord=0.2, pos=(0.2, 7.8, 0.0))
+    calculate_lift(d38wing, 0.8, calc_cmx=True)
+
+    # calculate_lift and LiftAnalysis.generate
+    assert cache.misses == misses + 3
+
+
+def test_eviction(d38wing, cache):
+    LiftAnalysis.generate(d38wing, M=15)
+    size = cache.stats['size']
+
+    cache.max_size = int(1.5*size)
+
+    LiftAnalysis.generate(d38wing, M=17)
+    LiftAnalysis.generate(d38wing, M=15)
+
+    assert cache.stats['evictions'] == 2
+    assert cache.stats['entries'] == 1
+
+
+def test_cache_key_version(d38wing, monkeypatch):
+    from wingstructure.aero import diskcache
+
+    key = diskcache.stable_hash(*diskcache.wing_key(d38wing, defaultdict(AirfoilData)))
+
+    monkeypatch.setattr(diskcache, '__version__', 'other')
+
+    assert diskcache.stable_hash(*diskcache.wing_key(d38wing, defaultdict(AirfoilData))) != key
+
+    monkeypatch.undo()
+    monkeypatch.setattr(diskcache, 'CACHE_FORMAT', diskcache.CACHE_FORMAT+1)
+
+    assert diskcache.stable_hash(*diskcache.wing_key(d38wing, defaultdict(AirfoilData))) != key
+
+
+def test_concurrent_writes(cache, monkeypatch):
+    import os
+    from concurrent.futures import ThreadPoolExecutor
+
+    arrays = {'values': np.arange(10000.0)}
+
+    with ThreadPoolExecutor(8) as executor:
+        list(executor.map(lambda _: cache.put('key', arrays), range(32)))
+
+    assert np.array_equal(cache.get('key')[0]['values'], arrays['values'])
+
+    # failed writes do not leave temporary files
+    def fail(*args):
+        raise OSError('rename failed')
+
+    monkeypatch.setattr(os, 'replace', fail)
+
+    with pytest.raises(OSError):
+        cache.put('other', arrays)
+
+    assert os.listdir(cache.directory) == ['key.wsa']
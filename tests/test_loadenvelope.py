@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from wingstructure import loadenvelope
+
+from .wings import d38wing
+
+
+def test_isa():
+    T, p, ρ = loadenvelope.isa([0.0, 5000.0, 11000.0, 15000.0])
+
+    assert np.allclose(T, [288.15, 255.65, 216.65, 216.65])
+    assert np.allclose(p, [101325.0, 54019.9, 22632.1, 12044.6], rtol=1e-4)
+    assert np.allclose(ρ, [1.225, 0.73612, 0.36392, 0.19367], rtol=1e-4)
+
+    V_TAS = loadenvelope.true_airspeed(50.0, 5000.0)
+
+    assert np.isclose(loadenvelope.equivalent_airspeed(V_TAS, 5000.0), 50.0)
+
+
+def test_loadfactors():
+    n_pos, n_neg = loadenvelope.maneuver_loadfactors([20.0, 60.0], 300.0, 5.3, -2.65, 1.5, -1.0)
+
+    assert np.allclose(n_pos, [1.225/2*400*1.5/300, 5.3])
+    assert np.allclose(n_neg, [-1.225/2*400/300, -2.65])
+
+    n_pos, n_neg = loadenvelope.gust_loadfactors(50.0, 15.0, 300.0, 0.0, 0.7, 5.5)
+
+    μ_g = 2*300.0/(9.80665*1.225*0.7*5.5)
+    Δn = 0.88*μ_g/(5.3+μ_g)*1.225*15.0*50.0*5.5/600.0
+
+    assert np.isclose(n_pos, 1+Δn)
+    assert np.isclose(n_neg, 1-Δn)
+
+
+def test_load_envelope(d38wing):
+    masses = [350.0, 450.0]
+    speeds = np.linspace(25.0, 70.0, 4)
+    altitudes = [0.0, 3000.0]
+
+    envelope = loadenvelope.load_envelope(d38wing, masses, speeds, altitudes,
+                                          gust_velocity=[15.0, 15.0, 15.0, 7.5])
+
+    cases = envelope.cases
+
+    assert len(cases) == 2*2*4*4
+    assert envelope.lineloads.shape == (len(cases), len(envelope.ys))
+
+    # wing carries whole lift without tail
+    lift = np.trapz(envelope.lineloads, envelope.ys, axis=-1)
+
+    assert np.allclose(lift, cases['n']*cases['mass']*loadenvelope.g, rtol=1e-2)
+
+    maneuver = cases[cases['kind'] == 'maneuver+']
+
+    assert np.all(maneuver['n'] <= 5.3)
+    assert not maneuver['stalled'].any()
+
+    # tail carries part of load for forward center of gravity
+    x_ac = d38wing.get_mac()[0][0] + 0.25*d38wing.mac
+
+    split = loadenvelope.load_envelope(d38wing, masses, speeds, cgs=x_ac-0.1, x_tail=5.0)
+
+    share = (5.0 - (x_ac-0.1))/(5.0 - x_ac)
+    lift = np.trapz(split.lineloads, split.ys, axis=-1)
+
+    assert np.allclose(lift, share*split.cases['n']*split.cases['mass']*loadenvelope.g, rtol=1e-2)
@@ -0,0 +1,98 @@
+import os
+import shutil
+import zipfile
+
+import numpy as np
+import pytest
+
+from wingstructure.data import Wing, WingLoader, load_wings, loader
+
+
+@pytest.fixture
+def wingdir(tmp_path):
+    source = os.path.join(os.path.dirname(__file__), 'test.yaml')
+
+    for name in ('a.yaml', 'b.yaml'):
+        shutil.copy(source, tmp_path / name)
+
+    return tmp_path
+
+
+def _assert_same(wing1, wing2):
+    assert np.allclose(wing1.chords, wing2.chords)
+    assert np.allclose(wing1.ys, wing2.ys)
+    assert np.allclose(wing1.twists, wing2.twists)
+    assert list(wing1.airfoils) == list(wing2.airfoils)
+    assert wing1.controlsurfaces == wing2.controlsurfaces
+
+
+def test_loader_cache(wingdir, monkeypatch):
+    reference = Wing.load_from_file(str(wingdir / 'a.yaml'))
+
+    wings = WingLoader(str(wingdir))
+
+    assert list(wings) == ['a.yaml', 'b.yaml']
+
+    assert 'a.yaml' in wings
+    assert 'c.yaml' not in wings
+
+    with pytest.raises(KeyError):
+        wings['c.yaml']
+
+    _assert_same(wings['a.yaml'], reference)
+    assert os.path.exists(wings.cachefile('a.yaml'))
+
+    # second access uses cache without parsing
+    def fail(content):
+        raise AssertionError('cache not used')
+
+    monkeypatch.setattr(loader, '_parse_yaml', fail)
+
+    _assert_same(wings['a.yaml'], reference)
+
+
+def test_loader_invalidation(wingdir):
+    wings = WingLoader(str(wingdir))
+    wings['a.yaml']
+
+    with open(wingdir / 'a.yaml') as datfile:
+        content = datfile.read()
+
+    with open(wingdir / 'a.yaml', 'w') as datfile:
+        datfile.write(content.replace('chord: 0.5', 'chord: 0.7', 1))
+
+    changed = Wing.load_from_file(str(wingdir / 'a.yaml'))
+    assert changed.chords[0] == 0.7
+
+    _assert_same(wings['a.yaml'], changed)
+
+
+def test_loader_archive(wingdir, tmp_path_factory, monkeypatch):
+    archive = str(tmp_path_factory.mktemp('archive') / 'wings.zip')
+
+    with zipfile.ZipFile(archive, 'w') as zf:
+        zf.write(wingdir / 'a.yaml', 'wings/a.yaml')
+
+    wings = load_wings(archive)
+
+    assert list(wings) == ['wings/a.yaml']
+    assert os.path.isdir(archive + '.cache')
+
+    _assert_same(wings['wings/a.yaml'], Wing.load_from_file(str(wingdir / 'a.yaml')))
+
+    # archive is opened once for all accesses
+    opened = []
+    ZipFile = zipfile.ZipFile
+
+    class CountingZipFile(ZipFile):
+        def __init__(self, *args, **kwargs):
+            opened.append(args)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(zipfile, 'ZipFile', CountingZipFile)
+
+    with WingLoader(archive, cache=False) as wings:
+        for _ in range(3):
+            wings['wings/a.yaml']
+
+    assert len(opened) == 1
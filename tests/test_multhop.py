@@ -41,8 +41,152 @@ def test_multhop_solve():
     assert np.isclose(γs[M//2:], γs_ref[:-1], atol=1e-4).all()
 
 
+def test_multhop_matrix():
+    """compare vectorized matrix assembly with element wise definition"""
+
+    M = 9
+
+    θs = np.linspace(np.pi/(M+1), M/(M+1)*np.pi, M)
+
+    Bb = multhop._multhop_matrix(θs)
+
+    for v, θv in enumerate(θs):
+        for n, θn in enumerate(θs):
+            if v == n:
+                ref = (M+1)/(4*np.sin(θv))
+            else:
+                ref = - ((1-(-1.)**(v-n))/2*(np.sin(θn)/ \
+                            ((M+1)*(np.cos(θn)-np.cos(θv))**2)))
+            
+            assert np.isclose(Bb[v, n], ref)
+
+
+def test_multhop_system_reuse():
+    """factorized system gives same results for further right hand sides"""
+
+    M = 15
+    b = 15
+
+    θs = np.linspace(np.pi/(M+1), M/(M+1)*np.pi, M)
+    cs = np.full(M, 1.0)
+    dcls = np.full(M, 2*np.pi)
+
+    system = multhop.MulthopSystem(θs, cs, dcls, b)
+
+    for αs in (np.ones(M), np.linspace(-1, 1, M)):
+        γs, α_is = system.solve(αs)
+
+        B = system.Bb + np.diag(system.Bd)
+
+        assert np.isclose(B@γs, αs).all()
+        assert np.isclose(system.Bb@γs, α_is).all()
+
+
+def test_multhop_batch():
+    """two dimensional αs are solved like the single cases"""
+
+    b = 15
+    S = b**2/6
+
+    ys = np.array([0, b/2])
+    cs = np.array([2.5, 1.5])
+    dcls = np.array([2*np.pi]*2)
+
+    αs = np.array([[1.0, 1.0], [0.0, 1.0], [0.5, -0.5]])
+
+    batch = multhop.multhop(ys, αs, cs, dcls, S, b, M=15)
+
+    assert isinstance(batch, multhop.MulthopBatchResult)
+    assert len(batch) == 3
+    assert batch.c_ls.shape == (3, 15)
+
+    for k, res in enumerate(batch):
+        ref = multhop.multhop(ys, αs[k], cs, dcls, S, b, M=15)
+
+        assert np.isclose(res.c_ls, ref.c_ls).all()
+        assert np.isclose(res.α_is, ref.α_is).all()
+        assert np.isclose(res.C_L, ref.C_L)
+        assert np.isclose(res.C_Di, ref.C_Di)
+
+
+def test_influence_cache():
+    """matrices are reused for same grid and evicted beyond maxsize"""
+
+    cache = multhop.InfluenceCache(maxsize=3)
+
+    θs = multhop._multhop_grid(7)
+    cs = np.ones(7)
+    dcls = np.full(7, 2*np.pi)
+
+    system1 = multhop.MulthopSystem(θs, cs, dcls, 10.0, cache=cache)
+    # differing span only changes diagonal, grid matrix is reused
+    system2 = multhop.MulthopSystem(θs, cs, dcls, 12.0, cache=cache)
+
+    assert system1.Bb is system2.Bb
+    assert cache.info().hits == 1
+    assert cache.info().misses == 3
+
+    # identical system reuses factorization as well
+    system3 = multhop.MulthopSystem(θs, cs, dcls, 10.0, cache=cache)
+    assert system3.lu is system1.lu
+    assert cache.info().hits == 3
+
+    # another grid exceeds maxsize
+    multhop.MulthopSystem(multhop._multhop_grid(9), np.ones(9), np.full(9, 2*np.pi),
+                          10.0, cache=cache)
+
+    info = cache.info()
+    assert info.currsize == 3
+    assert info.evictions == 2
+
+    cache.maxsize = 1
+    assert cache.info().currsize == 1
+
+    cache.clear()
+    assert cache.info() == (0, 0, 0, 1, 0)
+
+
 # test helper functions 
 
+def test_multhop_result_inplace():
+    """in-place operations give the same results as operators"""
+
+    ys = np.linspace(-1.0, 1.0, 5)
+
+    a = multhop.MulthopResult(ys, np.arange(5.0), np.ones(5), 2.0, 0.5, np.linspace(0, 1, 5))
+    b = multhop.MulthopResult(ys, np.ones(5), np.arange(5.0), 1.0, 0.25, np.ones(5))
+
+    expected = a + (-2.0)*b.flip()
+
+    # flip keeps circulation
+    assert np.allclose(b.flip().γs, b.γs[::-1])
+
+    res = a.copy()
+    data = res._data
+
+    res.accumulate(b, -2.0, flip=True)
+
+    assert res._data is data
+    assert np.allclose(res.c_ls, expected.c_ls)
+    assert np.allclose(res.α_is, expected.α_is)
+    assert np.allclose(res.γs, expected.γs)
+    assert np.isclose(res.C_L, expected.C_L)
+    assert np.isclose(res.C_Di, expected.C_Di)
+
+    res *= 0.5
+    res += b
+
+    expected = 0.5*expected + b
+
+    assert res._data is data
+    assert np.allclose(res._data, expected._data)
+
+    out = multhop.MulthopResult.zeros(ys)
+    a.flip(out=out)
+
+    assert np.allclose(out._data, a.flip()._data)
+
+
 def test_calc_gridpoints():
     """basic tests for multhop's grid point generation"""
 
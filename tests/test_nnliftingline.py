@@ -0,0 +1,146 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from wingstructure.aero import LiftAnalysis
+from wingstructure.aero.polars import AirfoilPolar
+from wingstructure.aero.nnliftingline import nonlinearLL
+from wingstructure.aero.multhop import AirfoilData
+
+from .wings import d38wing
+
+
+@pytest.fixture
+def stallpolar():
+    alphas = np.linspace(-10, 25, 71)
+    c_ls = np.where(alphas < 12, 2*np.pi*np.radians(alphas+2),
+                    2*np.pi*np.radians(14) - 0.05*(alphas-12))
+
+    return AirfoilPolar(alphas, c_ls)
+
+
+def test_airfoilpolar(stallpolar):
+    assert np.isclose(stallpolar.alpha0, -2.0)
+    assert np.isclose(stallpolar.dif_ca_alpha, 2*np.pi)
+
+    assert np.isclose(stallpolar.c_l(np.radians(3.0)), 2*np.pi*np.radians(5.0))
+    assert np.isclose(stallpolar.dc_l(np.radians(3.0)), 2*np.pi)
+
+
+def test_linear_equivalence(d38wing):
+    """nonlinear method with linear lift curves gives multhop results"""
+
+    d38wing.add_controlsurface('aileron', 5.0, 7.0, 0.75, 0.75, 'aileron')
+
+    linear = LiftAnalysis.generate(d38wing)
+    nonlinear = LiftAnalysis.generate(d38wing, method='nonlinear')
+
+    α1, c_ls1 = linear.calculate(0.8, {'aileron': (5, -5)})
+    α2, c_ls2 = nonlinear.calculate(0.8, {'aileron': (5, -5)})
+
+    assert nonlinear.report.converged
+    assert np.isclose(α1, α2)
+    assert np.isclose(c_ls1, c_ls2).all()
+
+
+def test_stall(d38wing, stallpolar):
+    airfoil_db = defaultdict(lambda: stallpolar)
+
+    nonlinear = LiftAnalysis.generate(d38wing, airfoil_db, method='nonlinear')
+
+    # below stall lift curve is linear
+    α, _ = nonlinear.calculate(0.5)
+    assert nonlinear.report.converged
+    assert np.isclose(α, LiftAnalysis.generate(d38wing, airfoil_db).calculate(0.5)[0])
+
+    # beyond stall lift is lower than with linear lift curves
+    res_linear = nonlinearLL(d38wing, 22.0)
+    res = nonlinearLL(d38wing, 22.0, airfoil_db)
+
+    assert res['report'].converged
+    assert res['C_L'] < res_linear['C_L']
+    assert res['c_ls'].max() <= stallpolar.c_ls.max() + 1e-6
+
+
+class SmoothPolar(AirfoilData):
+    """lift curve saturating at c_l = 1.5"""
+
+    def c_l(self, α, Re=None):
+        return 1.5*np.tanh(self.dif_ca_alpha*(α - np.radians(self.alpha0))/1.5)
+
+    def dc_l(self, α, Re=None):
+        return self.dif_ca_alpha/np.cosh(self.dif_ca_alpha*(α - np.radians(self.alpha0))/1.5)**2
+
+
+def test_gradients(d38wing):
+    """adjoint gradients of nonlinear solution agree with finite differences"""
+
+    from wingstructure.aero.multhop import Multhop, _calc_gridpoints
+    from wingstructure.aero.nnliftingline import NonlinearMulthop
+
+    airfoil_db = defaultdict(lambda: SmoothPolar(alpha0=-2.0))
+    ys = _calc_gridpoints(d38wing, 31)
+
+    def make_wing(twists, chords):
+        from wingstructure.data.wing import Wing
+
+        awing = Wing()
+
+        for sec, twist, chord in zip(d38wing.sections, twists, chords):
+            awing.append(sec.pos, chord, twist, sec.airfoil)
+
+        return awing
+
+    def results(twists, chords, α):
+        solver = NonlinearMulthop(make_wing(twists, chords), ys, airfoil_db)
+        res, report = solver.solve(solver._base_αs() + np.radians(α))
+
+        assert report.converged
+
+        return np.concatenate([[res.C_L, res.C_Di], res.c_ls])
+
+    twists = np.array([1.0, 0.0, -2.0])
+    chords = d38wing.chords
+
+    for α in (2.0, 8.0):
+        solver = NonlinearMulthop(make_wing(twists, chords), ys, airfoil_db)
+        grads = solver.gradients(solver._base_αs() + np.radians(α))
+
+        h = 1e-5
+
+        for var in ('twist', 'chord'):
+            for k in range(3):
+                Δ = np.zeros(3)
+                Δ[k] = h
+
+                if var == 'twist':
+                    fd = (results(twists+Δ, chords, α) - results(twists-Δ, chords, α))/(2*h)
+                else:
+                    fd = (results(twists, chords+Δ, α) - results(twists, chords-Δ, α))/(2*h)
+
+                adjoint = np.concatenate([[grads['C_L'][var][k], grads['C_Di'][var][k]],
+                                          grads['c_ls'][var][:, k]])
+
+                assert np.allclose(adjoint, fd, atol=1e-5)
+
+        fd = (results(twists, chords, α+h) - results(twists, chords, α-h))/(2*h)
+
+        assert np.isclose(grads['C_L']['alpha'], fd[0])
+
+    # linear lift curves give multhop gradients
+    linear = Multhop(d38wing, ys, defaultdict(AirfoilData))
+    nonlinear = NonlinearMulthop(d38wing, ys, defaultdict(AirfoilData))
+
+    αs = linear._base_αs() + np.radians(3.0)
+
+    for name, grads in linear.gradients(αs).items():
+        for var, values in grads.items():
+            assert np.allclose(nonlinear.gradients(αs)[name][var], values)
+
+    # gradients of not converged solutions are not available
+    nonlinear.max_iter = 0
+    nonlinear.tol = 0.0
+
+    with pytest.raises(ValueError):
+        nonlinear.gradients(αs)
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from wingstructure.aero import LiftAnalysis, optimize_twist
+from wingstructure.aero.liftingline import _grid_coefficients
+
+
+@pytest.fixture
+def twistwing():
+    from wingstructure.data.wing import Wing
+
+    awing = Wing()
+
+    awing.append(chord=1.0, twist=1.0)
+    awing.append(chord=0.8, pos=(0.0, 3.0, 0.0))
+    awing.append(chord=0.6, pos=(0.0, 5.0, 0.0))
+    awing.append(chord=0.4, twist=-2.0, pos=(0.1, 7.5, 0.0))
+
+    return awing
+
+
+def _apply_twists(wing, twists):
+    from wingstructure.data.wing import Wing
+
+    awing = Wing()
+
+    for sec, twist in zip(wing.sections, twists):
+        awing.append(sec.pos, sec.chord, twist, sec.airfoil)
+
+    return awing
+
+
+def test_optimize_twist(twistwing):
+    res = optimize_twist(twistwing, 0.8)
+
+    assert np.isclose(res['C_L'], 0.8)
+    assert np.isclose(res['twists'][0], 1.0)
+
+    # consistent with lift analysis of optimized wing
+    optwing = _apply_twists(twistwing, res['twists'])
+
+    la = LiftAnalysis.generate(optwing)
+    α, lift = la(0.8)
+
+    assert np.isclose(np.degrees(α), res['alpha'])
+    assert np.isclose(_grid_coefficients(lift, optwing.span, optwing.area)[1], res['C_Di'])
+
+    # initial twist has more induced drag, optimum is close to elliptic loading
+    la = LiftAnalysis.generate(twistwing)
+    _, lift = la(0.8)
+
+    C_Di_elliptic = 0.8**2/(np.pi*twistwing.aspectratio)
+
+    assert _grid_coefficients(lift, twistwing.span, twistwing.area)[1] > res['C_Di']
+    assert C_Di_elliptic <= res['C_Di'] < 1.01*C_Di_elliptic
+
+
+def test_optimize_twist_constraints(twistwing):
+    free = optimize_twist(twistwing, 0.8)
+
+    bounded = optimize_twist(twistwing, 0.8, {'bounds': (-1.0, 1.0)})
+
+    assert np.all(np.abs(bounded['twists']) <= 1.0 + 1e-9)
+    assert bounded['C_Di'] >= free['C_Di']
+
+    C_Mb = 0.95*free['C_Mb']
+    relieved = optimize_twist(twistwing, 0.8, {'root_bending': C_Mb})
+
+    assert np.isclose(relieved['C_Mb'], C_Mb)
+    assert np.isclose(relieved['C_L'], 0.8)
+    assert relieved['C_Di'] > free['C_Di']
+
+
+def test_optimize_twist_infeasible(twistwing):
+    # default fixed root twist of 1° is outside of bounds
+    with pytest.raises(ValueError, match='section 0'):
+        optimize_twist(twistwing, 0.8, {'bounds': (2.0, 3.0)}, M=31)
+
+    # all twists at their bounds do not allow smaller root bending moment
+    with pytest.raises(ValueError, match='root_bending'):
+        optimize_twist(twistwing, 0.8, {'bounds': (1.0, 1.0), 'root_bending': 0.0}, M=31)
@@ -0,0 +1,107 @@
+from collections import defaultdict
+
+import numpy as np
+import pytest
+
+from wingstructure.aero import AirfoilData
+from wingstructure.aero.polars import AirfoilPolar, PolarDatabase
+
+
+XFOIL_POLAR = """
+       XFOIL         Version 6.99
+
+ Calculated polar for: TEST
+
+ 1 1 Reynolds number fixed          Mach number fixed         
+
+ xtrf =   1.000 (top)        1.000 (bottom)  
+ Mach =   0.000     Re =     1.000 e 6     Ncrit =   9.000
+
+   alpha    CL        CD       CDp       CM     Top_Xtr  Bot_Xtr
+  ------ -------- --------- --------- -------- -------- --------
+  -4.000  -0.2000   0.01000   0.00400  -0.0500   0.9000   0.1000
+   0.000   0.2000   0.00800   0.00300  -0.0500   0.7000   0.2000
+   4.000   0.6000   0.01000   0.00400  -0.0500   0.5000   0.3000
+"""
+
+
+@pytest.fixture
+def polardb():
+    db = PolarDatabase()
+
+    alphas = np.linspace(-4, 4, 5)
+
+    db.add_polar('A', 1e6, alphas, 0.1*(alphas+2), 0.01+0.0*alphas, -0.05+0.0*alphas)
+    db.add_polar('A', 2e6, alphas, 0.1*(alphas+3), 0.02+0.0*alphas, -0.05+0.0*alphas)
+    db.add_polar('B', 1e6, alphas, 0.1*alphas)
+
+    return db
+
+
+def test_interpolation(polardb):
+    polar = polardb['A']
+
+    assert polar.c_ls.shape == (2, 5)
+    assert np.isclose(polar.c_l(0.0, 1.5e6), 0.25)
+    assert np.isclose(polar.c_d(0.0, 1.5e6), 0.015)
+    assert np.isclose(polar.dc_l(0.0, 1.5e6), 0.1*180/np.pi)
+
+    # all stations and load cases within one call
+    α = np.radians([[0.0, 2.0, 0.0], [1.0, 1.0, 1.0]])
+    c_ls, c_ds, c_ms = polardb.interpolate(['A', 'A', 'B'], α, Re=[1e6, 2e6, 1e6])
+
+    assert c_ls.shape == (2, 3)
+    assert np.isclose(c_ls, [[0.2, 0.5, 0.0], [0.3, 0.4, 0.1]]).all()
+    assert np.isclose(c_ms[:, :2], -0.05).all()
+
+
+def test_save_load(polardb, tmp_path):
+    filename = str(tmp_path/'polars.bin')
+
+    polardb.save(filename)
+
+    loaded = PolarDatabase.load(filename, mmap=True)
+
+    assert isinstance(loaded['A'].c_ls, np.memmap)
+    assert loaded.keys() == ['A', 'B']
+    assert np.isclose(loaded['A'].c_l(0.1, 1.2e6), polardb['A'].c_l(0.1, 1.2e6))
+
+    with pytest.raises(KeyError):
+        loaded['C']
+
+
+def test_xfoil(tmp_path):
+    polarfile = tmp_path/'test.pol'
+    polarfile.write_text(XFOIL_POLAR)
+
+    cache = str(tmp_path/'polars.bin')
+
+    db = PolarDatabase.from_xfoil({'TEST': [str(polarfile)]}, cache=cache)
+
+    polar = db['TEST']
+
+    assert polar.reynolds[0] == 1e6
+    assert np.isclose(polar.alpha0, -2.0)
+    assert np.isclose(polar.c_m0, -0.05)
+
+    # unchanged source, cache is used
+    cached = PolarDatabase.from_xfoil({'TEST': [str(polarfile)]}, cache=cache)
+    assert isinstance(cached['TEST'].c_ls, np.memmap)
+
+
+def test_multhop_polars(polardb):
+    """lift slope and zero lift angle of polars are used by multhop"""
+    from wingstructure.data import Wing
+    from wingstructure.aero import LiftAnalysis
+
+    wing = Wing()
+    wing.append(chord=1.0, airfoil='B')
+    wing.append(chord=0.5, pos=(0.0, 7.5, 0.0), airfoil='B')
+
+    polardb.default = AirfoilData()
+
+    la = LiftAnalysis.generate(wing, polardb)
+    la_ref = LiftAnalysis.generate(wing, defaultdict(lambda: AirfoilData(0.0, 0.1*180/np.pi)))
+
+    assert np.isclose(la.calculate(0.5)[0], la_ref.calculate(0.5)[0])
+    assert not np.isclose(la.calculate(0.5)[0], LiftAnalysis.generate(wing).calculate(0.5)[0])
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from wingstructure.aero import LiftAnalysis, stability_table
+
+from .wings import d38wing
+
+
+@pytest.fixture
+def flapwing(d38wing):
+    d38wing.add_controlsurface('flap', 0.5, 4.5, 0.8, 0.8, 'flap')
+    d38wing.add_controlsurface('aileron', 4.5, 7.0, 0.75, 0.75, 'flap')
+
+    return d38wing
+
+
+def test_stability_table(flapwing):
+    flaps = np.array([-5.0, 0.0, 10.0])
+
+    table = stability_table(flapwing, flaps, flaps=['flap'])
+
+    la = LiftAnalysis.generate(flapwing)
+
+    assert np.allclose(table['flap'], flaps)
+    assert np.allclose(table['C_L_α'], la._aoa.C_L)
+
+    # roll damping close to elliptic wing estimate -C_L_α/8
+    assert np.allclose(table['C_l_p'], table['C_l_p'][0])
+    assert np.isclose(table['C_l_p'][0], -table['C_L_α'][0]/8, rtol=0.1)
+
+    # finite differences of lift analysis results
+    Δ = 1e-3
+
+    for η, row in zip(flaps, table):
+        def C_l(δa):
+            controls = {'flap': (η, η), 'aileron': (η-δa, η+δa)}
+            return -la.calculate_aoa(0.0, controls, all_results=True)[3]
+
+        C_l_δa = (C_l(Δ) - C_l(-Δ))/(2*np.radians(Δ))
+
+        assert np.isclose(row['C_l_δa'], C_l_δa, rtol=1e-5)
+        assert row['C_l_δa'] > 0.0
+
+        C_L_0, _ = la.calculate_aoa(0.0, {'flap': (η, η), 'aileron': (η, η)})
+
+        assert np.isclose(row['C_L_0'], C_L_0)
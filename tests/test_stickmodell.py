@@ -40,6 +40,28 @@ def test_lineloadresultants():
     assert np.all(loads[:,-1] == [0, 1, 1, 2, 2 ,3, 4])
 
 
+def test_lineloadresultants_loadcases():
+    from wingstructure.structure.stickmodel import calc_lineloadresultants
+
+    ys = (-2.0, -1.0, 1.0, 2.0, 3.0, 4.0, 5.0)
+    q = np.array([
+        (1.0, 1.0, -1.0, 1.0, 2.0, 0.0, 0.0),
+        (0.0, 2.0, 1.0, -3.0, 0.0, 1.0, -1.0)
+    ])
+
+    loads = calc_lineloadresultants(ys, q)
+
+    # two resultants per segment
+    assert loads.shape == (2, 12, 7)
+    assert np.all(loads[..., -1] == np.repeat(np.arange(6), 2))
+
+    for q_k, loads_k in zip(q, loads):
+        single = calc_lineloadresultants(ys, q_k)
+        used = loads_k[:, -2] != 0.0
+
+        assert np.allclose(loads_k[used], single[single[:, -2] != 0.0])
+
+
 def test_discretemoments():
     from wingstructure.structure.stickmodel import calc_discretemoments
 
@@ -216,4 +238,178 @@ def test_2spar():
     val = np.sqrt(2)/2
 
     assert np.isclose(tloads[0,:],
-        [0, val, val, 0, val, -val]).all()
\ No newline at end of file
+        [0, val, val, 0, val, -val]).all()
+
+    # last node uses direction of last element, stacked load cases
+    assert np.isclose(tloads[1,:], tloads[0,:]).all()
+    assert np.isclose(internalloads2spar(np.stack([loads, 2*loads]), sparnodes),
+                      [tloads, 2*tloads]).all()
+
+
+def test_solve_sweep():
+    """
+    test sweep from prescribed node against full equilibrium system
+    """
+    from wingstructure.structure.stickmodel import Stickmodel
+
+    rng = np.random.default_rng(3)
+
+    n = 50
+
+    nodes = np.cumsum(rng.random((n, 3)), axis=0)
+
+    forces = np.column_stack([rng.random((80, 6)), rng.integers(0, n-1, 80)])
+    moments = np.column_stack([rng.random((20, 3)), rng.integers(0, n-1, 20)])
+
+    for node in (0, 20, n-1):
+        model = Stickmodel(nodes, {'forcename':forces}, {'momentname':moments},
+                           prescribed={node: rng.random(6)}, use_local_coordinate_system=False)
+        model.update()
+
+        sol = np.hstack([model.resulting_forces, model.resulting_moments])
+
+        assert np.allclose(sol, model._solve_sparse(model._external_loads()))
+
+
+def test_solve_loadcases():
+    """
+    test stacked load cases against separate solutions
+    """
+    from wingstructure.structure.stickmodel import Stickmodel
+
+    rng = np.random.default_rng(4)
+
+    n, K = 20, 5
+
+    nodes = np.cumsum(rng.random((n, 3)), axis=0)
+
+    forces = np.concatenate([rng.random((K, 30, 6)),
+                             rng.integers(0, n-1, (K, 30, 1))], axis=-1)
+    moments = np.column_stack([rng.random((10, 3)), rng.integers(0, n-1, 10)])
+
+    for prescribed in ({n-1: np.zeros(6)}, {7: rng.random(6)}):
+        model = Stickmodel(nodes, {'forcename':forces}, {'momentname':moments},
+                           prescribed=prescribed, use_local_coordinate_system=False)
+        model.update()
+
+        # factorized equilibrium system gives same results
+        sol = np.concatenate([model.resulting_forces, model.resulting_moments], axis=-1)
+        assert np.allclose(sol, model._solve_sparse(model._external_loads()))
+
+        model.set_local_coordinatesystem(True)
+
+        assert model.resulting_forces.shape == (K, n, 3)
+        assert model.resulting_moments.shape == (K, n, 3)
+
+        for k in range(K):
+            single = Stickmodel(nodes, {'forcename':forces[k]}, {'momentname':moments},
+                                prescribed=prescribed)
+            single.update()
+
+            assert np.allclose(model.resulting_forces[k], single.resulting_forces)
+            assert np.allclose(model.resulting_moments[k], single.resulting_moments)
+
+
+def test_incremental_updates(monkeypatch):
+    """
+    test superposition of named loads and deferred updates
+    """
+    from wingstructure.structure.stickmodel import Stickmodel
+
+    rng = np.random.default_rng(5)
+
+    n = 10
+
+    nodes = np.cumsum(rng.random((n, 3)), axis=0)
+
+    forces = [np.column_stack([rng.random((5, 6)), rng.integers(0, n-1, 5)]) for _ in range(3)]
+    moments = np.column_stack([rng.random((4, 3)), rng.integers(0, n-1, 4)])
+
+    reference = Stickmodel(nodes, {'f0': forces[0], 'f2': forces[2]}, {'m': moments},
+                           prescribed={0: rng.random(6)})
+
+    solves = []
+    solve = Stickmodel._solve
+
+    def counting_solve(self, *args, **kwargs):
+        solves.append(args)
+        return solve(self, *args, **kwargs)
+
+    monkeypatch.setattr(Stickmodel, '_solve', counting_solve)
+
+    model = Stickmodel(nodes, {'f0': forces[0]}, prescribed=reference.prescribed,
+                       do_auto_updates=False)
+
+    assert model.resulting_forces is None
+    assert len(solves) == 0
+
+    with model.deferred_updates():
+        for i, part in enumerate(forces[1:], 1):
+            model.add_discreteforces(f'f{i}', part)
+
+        model.add_discretemoments('m', moments)
+
+        assert len(solves) == 0
+
+    # prescribed values and every named load are solved once
+    assert len(solves) == 5
+    assert not model.auto_updates
+
+    model.auto_updates = True
+    model.remove_discreteforces('f1')
+
+    assert len(solves) == 5
+    assert np.allclose(model.resulting_forces, reference.resulting_forces)
+    assert np.allclose(model.resulting_moments, reference.resulting_moments)
+
+    with pytest.raises(ValueError):
+        model.add_discreteforces('wrong', moments)
+
+    assert 'wrong' not in model.acting_forces
+
+
+def test_modified_model():
+    """
+    test stored solutions are not used after modification of the model
+    """
+    from wingstructure.structure.stickmodel import Stickmodel
+
+    rng = np.random.default_rng(6)
+
+    n = 10
+
+    nodes = np.cumsum(rng.random((n, 3)), axis=0)
+
+    forces = [np.column_stack([rng.random((5, 6)), rng.integers(0, n-1, 5)]) for _ in range(2)]
+
+    def resulting_loads(model):
+        return np.concatenate([model.resulting_forces, model.resulting_moments], axis=-1)
+
+    model = Stickmodel(nodes.copy(), {'f0': forces[0].copy()}, prescribed={0: np.zeros(6)})
+
+    # changed prescribed values
+    model.prescribed = {n-1: np.zeros(6)}
+    model.add_discreteforces('f1', forces[1])
+
+    reference = Stickmodel(nodes, {'f0': forces[0], 'f1': forces[1]}, prescribed={n-1: np.zeros(6)})
+
+    assert np.allclose(resulting_loads(model), resulting_loads(reference))
+
+    # nodes and loads modified in place
+    model.nodes[:, 2] += 0.1
+    model.acting_forces['f0'][:, 3:-1] *= 2.0
+    model.set_local_coordinatesystem(True)
+
+    nodes[:, 2] += 0.1
+    reference = Stickmodel(nodes, {'f0': forces[0]*[1, 1, 1, 2, 2, 2, 1], 'f1': forces[1]},
+                           prescribed={n-1: np.zeros(6)})
+
+    assert np.allclose(resulting_loads(model), resulting_loads(reference))
+
+    # replaced loads
+    model.acting_forces['f1'] = forces[0]
+    model.remove_discreteforces('f0')
+
+    reference = Stickmodel(nodes, {'f1': forces[0]}, prescribed={n-1: np.zeros(6)})
+
+    assert np.allclose(resulting_loads(model), resulting_loads(reference))
@@ -0,0 +1,108 @@
+import numpy as np
+import pytest
+
+from wingstructure.aero import LiftAnalysis
+from wingstructure.data.wing import Wing
+from wingstructure.aero.vortexlattice import _horseshoe_velocity
+
+from .wings import d38wing, d43wing
+
+
+def test_horseshoe_velocity():
+    """downwash behind bound vortex and zero velocity on vortex lines"""
+
+    A = np.array([0.0, -1.0, 0.0])
+    B = np.array([0.0, 1.0, 0.0])
+
+    v = _horseshoe_velocity(np.array([0.5, 0.0, 0.0]), A, B)
+
+    assert v[2] < 0.0
+    assert np.allclose(v[:2], 0.0)
+
+    # broadcasting gives same result as single evaluation
+    P = np.array([[0.5, 0.0, 0.0], [1.0, 0.3, 0.1]])
+    V = _horseshoe_velocity(P[:, np.newaxis], A[np.newaxis], B[np.newaxis])
+
+    assert V.shape == (2, 1, 3)
+    assert np.allclose(V[0, 0], v)
+
+    assert np.all(np.isfinite(_horseshoe_velocity(A, A, B)))
+
+
+def test_vortexlattice_multhop(d38wing):
+    """planar unswept wing gives results close to multhop"""
+
+    d38wing.add_controlsurface('aileron', 5.0, 7.0, 0.75, 0.75, 'aileron')
+
+    multhop = LiftAnalysis.generate(d38wing, M=63)
+    vlm = LiftAnalysis.generate(d38wing, method='vortexlattice', M=63)
+
+    assert np.isclose(vlm._aoa.C_L, multhop._aoa.C_L, rtol=3e-2)
+    assert np.isclose(vlm._aoa.C_Di, multhop._aoa.C_Di, rtol=1e-1)
+
+    α1, c_ls1 = multhop.calculate(0.8, {'aileron': (5, -5)})
+    α2, c_ls2 = vlm.calculate(0.8, {'aileron': (5, -5)})
+
+    assert np.isclose(α1, α2, atol=0.3)
+    assert np.allclose(c_ls1, c_ls2, atol=0.1)
+
+
+def test_vortexlattice_interface(d38wing):
+    """load case methods work without multhop system, multhop only
+    methods are not available"""
+
+    from collections import defaultdict
+
+    from wingstructure.aero.multhop import AirfoilData, Multhop, _calc_gridpoints
+    from wingstructure.aero.vortexlattice import VortexLattice
+
+    d38wing.add_controlsurface('aileron', 5.0, 7.0, 0.75, 0.75, 'aileron')
+
+    ys = _calc_gridpoints(d38wing, 31)
+    vlm = VortexLattice(d38wing, ys, defaultdict(AirfoilData))
+
+    assert not isinstance(vlm, Multhop)
+    assert not hasattr(vlm, 'gradients')
+
+    results = [vlm.baselift(), vlm.airbrakelift(), vlm.aoa(0.1),
+               vlm.controlsurfacelift('aileron', 5.0)]
+
+    for res in results + list(vlm.liftbases()[:3]):
+        assert res.c_ls.shape == (31,)
+        assert np.allclose(vlm.coefficients(res)[:2], [res.C_L, res.C_Di])
+
+
+def test_vortexlattice_dihedral(d43wing):
+    """dihedral reduces lift slope compared to flattened wing"""
+
+    vlm = LiftAnalysis.generate(d43wing, method='vortexlattice', M=63)
+
+    flatwing = Wing()
+
+    for sec in d43wing.sections:
+        flatwing.append((sec.pos.x, sec.pos.y, 0.0), sec.chord)
+
+    flat = LiftAnalysis.generate(flatwing, method='vortexlattice', M=63)
+
+    assert vlm._aoa.C_L < flat._aoa.C_L
+    assert np.isclose(vlm._aoa.C_L, flat._aoa.C_L, rtol=2e-2)
+
+    # symmetric lift distribution
+    assert np.allclose(vlm._aoa.c_ls, vlm._aoa.c_ls[::-1])
+
+
+@pytest.mark.parametrize('sweep', [30.0, 45.0])
+def test_vortexlattice_swept_drag(sweep):
+    """induced drag of swept wings is not below the elliptic minimum"""
+
+    sweptwing = Wing()
+
+    sweptwing.append(chord=1.0)
+    sweptwing.append((7.5*np.tan(np.radians(sweep)), 7.5, 0.0), 0.5)
+
+    vlm = LiftAnalysis.generate(sweptwing, method='vortexlattice', M=63)
+
+    C_L = vlm._aoa.C_L
+    Λ = sweptwing.aspectratio
+
+    assert vlm._aoa.C_Di >= C_L**2/(np.pi*Λ)
@@ -0,0 +1,67 @@
+import numpy as np
+import pytest
+
+from wingstructure.data import Wing, WingBatch
+from wingstructure.aero import LiftAnalysis, calculate_lift_batch
+
+
+@pytest.fixture
+def wings():
+    rng = np.random.default_rng(1)
+
+    variants = []
+
+    for _ in range(5):
+        awing = Wing()
+
+        awing.append(chord=1.0+0.2*rng.random(), twist=rng.random(), airfoil='FX 61-184')
+        awing.append(chord=0.8, pos=(0.0, 3.0+rng.random(), 0.0), airfoil='FX 61-184')
+        awing.append(chord=0.3+0.2*rng.random(), twist=-2.0, pos=(0.1, 7.5, 0.0),
+                     airfoil='FX 60-12')
+
+        variants.append(awing)
+
+    return variants
+
+
+def test_wingbatch_geometry(wings):
+    batch = WingBatch.from_wings(wings)
+
+    assert len(batch) == 5
+
+    assert np.allclose(batch.span, [wing.span for wing in wings])
+    assert np.allclose(batch.area, [wing.area for wing in wings])
+    assert np.allclose(batch.aspectratio, [wing.aspectratio for wing in wings])
+    assert np.allclose(batch.mac, [wing.mac for wing in wings])
+    assert np.allclose(batch.get_mac()[0], [wing.get_mac()[0] for wing in wings])
+
+    # single wings can be recreated
+    assert np.allclose(batch[2].chords, wings[2].chords)
+    assert list(batch[2].airfoils) == list(wings[2].airfoils)
+
+    wings[0].append(chord=0.1, pos=(0.2, 8.0, 0.0))
+
+    with pytest.raises(ValueError):
+        WingBatch.from_wings(wings)
+
+
+def test_calculate_lift_batch(wings):
+    batch = WingBatch.from_wings(wings)
+
+    C_Ls = np.linspace(0.4, 1.2, 5)
+
+    res = calculate_lift_batch(batch, C_Ls, M=31)
+
+    assert np.allclose(res['C_L'], C_Ls)
+
+    for k, wing in enumerate(wings):
+        la = LiftAnalysis.generate(wing, M=31)
+        α, c_ls = la.calculate(C_Ls[k])
+
+        assert np.allclose(res['ys'][k], la.ys)
+        assert np.isclose(res['alpha'][k], α)
+        assert np.allclose(res['c_ls'][k], c_ls)
+
+        # same induced drag definition as scalar and swept evaluation
+        assert np.isclose(res['C_Di'][k], la(C_Ls[k])[1].C_Di)
+        assert np.isclose(res['C_Di'][k], la.sweep(C_Ls[k])[2][0])
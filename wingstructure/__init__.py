@@ -2,5 +2,6 @@ from . import aero
 from . import data
 from . import structure
 from . import wingloads
+from . import loadenvelope
 
 from .version import __version__
@@ -1,5 +1,12 @@
-from . import liftingline, nnliftingline
+from . import (liftingline, nnliftingline, polars, optimization, batch, stability,
+               diskcache)
 
-from .liftingline import AirfoilData, LiftAnalysis, calculate_lift
+from .liftingline import (AirfoilData, LiftAnalysis, calculate_lift, calculate_lift_gradients,
+                          calculate_lift_batch)
+from .polars import AirfoilPolar, PolarDatabase
+from .optimization import optimize_twist
+from .batch import batch_calculate_lift, iter_calculate_lift
+from .stability import stability_table
+from .diskcache import set_disk_cache, get_disk_cache
 
-from .aero_moment import mean_momentcoefficient
\ No newline at end of file
+from .aero_moment import mean_momentcoefficient
@@ -12,7 +12,7 @@ def mean_momentcoefficient(wing, airfoil_db):
     """
 
     try:
-        c_m0s = [airfoil_db[sec.airfoil].c_m0 for sec in wing.sections]
+        c_m0s = np.array([airfoil_db[airfoil].c_m0 for airfoil in wing.airfoils])
     except KeyError:
         raise KeyError('Not all airfoils used in wing are defined in airfoil_db!')
 
@@ -0,0 +1,148 @@
+"""Module providing parallel lift calculations for many wings
+
+Wings are sent to worker processes in their serialized form (or as
+file names), every worker generates one LiftAnalysis per wing and
+evaluates all load cases with it.
+"""
+
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from ..data.wing import Wing
+from .multhop import AirfoilData
+from .liftingline import LiftAnalysis, _lift_result
+
+
+def _wingdata(wing):
+    """serialized wing, file names are loaded by the workers"""
+
+    if isinstance(wing, (str, dict)):
+        return wing
+
+    return wing.serialize()
+
+
+def _calculate_wing(index, wingdata, cases, M, method, airfoil_db, calc_cmx):
+    """calculate all load cases of one wing (executed by workers)"""
+
+    if isinstance(wingdata, str):
+        wing = Wing.load_from_file(wingdata)
+    else:
+        wing = Wing.deserialize(wingdata)
+
+    la = LiftAnalysis.generate(wing, airfoil_db, M=M, method=method)
+
+    results = []
+
+    for case in cases:
+        target = case.get('target', 0.0)
+        target_type = case.get('target_type', 'C_L')
+
+        α, res = la(target, target_type, case.get('controls', {}), case.get('airbrake', False))
+
+        result = _lift_result(wing, la, α, res, calc_cmx)
+
+        results.append(result)
+
+    return index, results
+
+
+def iter_calculate_lift(wings, cases, workers:int=None, M:int=None, method='multhop',
+                        airfoil_db:dict=defaultdict(AirfoilData), calc_cmx=False):
+    """Calculate load cases for many wings, results are yielded when finished
+
+    Parameters
+    ----------
+    wings : list
+        Wing objects, serialized wings (dict) or wing file names
+    cases : dict or list
+        load case (keyword arguments of calculate_lift: target,
+        target_type, controls, airbrake) or list of load cases,
+        calculated for every wing
+    workers : int, optional
+        number of worker processes, None uses all cores, 0 calculates
+        in the calling process, by default None
+    M : int, optional
+        number of grid points, by default None
+    method : str, optional
+        calculation method, by default 'multhop'
+    airfoil_db : dict, optional
+        airfoil data, by default defaultdict(AirfoilData)
+    calc_cmx : bool, optional
+        calculate moment coefficient in flight direction, by default False
+
+    Yields
+    ------
+    tuple
+        index of wing and list of result dicts (one per load case,
+        like calculate_lift) in order of completion
+    """
+
+    if isinstance(cases, dict):
+        cases = [cases]
+
+    tasks = [(index, _wingdata(wing), cases, M, method, airfoil_db, calc_cmx)
+             for index, wing in enumerate(wings)]
+
+    if workers == 0:
+        for task in tasks:
+            yield _calculate_wing(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_calculate_wing, *task) for task in tasks]
+
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def batch_calculate_lift(wings, cases, workers:int=None, M:int=None, method='multhop',
+                         airfoil_db:dict=defaultdict(AirfoilData), calc_cmx=False,
+                         callback=None):
+    """Calculate load cases for many wings in parallel
+
+    Parameters
+    ----------
+    wings : list
+        Wing objects, serialized wings (dict) or wing file names
+    cases : dict or list
+        load case or list of load cases, see iter_calculate_lift
+    workers : int, optional
+        number of worker processes, None uses all cores, 0 calculates
+        in the calling process, by default None
+    M : int, optional
+        number of grid points, by default None
+    method : str, optional
+        calculation method, by default 'multhop'
+    airfoil_db : dict, optional
+        airfoil data, by default defaultdict(AirfoilData)
+    calc_cmx : bool, optional
+        calculate moment coefficient in flight direction, by default False
+    callback : callable, optional
+        called with index and results of every wing as soon as they are
+        available, by default None
+
+    Returns
+    -------
+    list
+        lists of result dicts for every wing in input order, a single
+        load case (dict) gives one result dict per wing
+    """
+
+    single = isinstance(cases, dict)
+
+    wings = list(wings)
+    results = [None]*len(wings)
+
+    for index, wingresults in iter_calculate_lift(wings, cases, workers, M, method,
+                                                  airfoil_db, calc_cmx):
+        if callback is not None:
+            callback(index, wingresults)
+
+        results[index] = wingresults[0] if single else wingresults
+
+    return results
@@ -0,0 +1,230 @@
+"""Module providing an opt-in disk cache for lift calculations
+
+Results are stored in the binary array file format, named by a hash of
+the serialized wing, the used airfoil data and all calculation arguments.
+The cache is shared between processes: files are written atomically and
+the least recently used files are removed when the size limit is reached.
+"""
+
+import hashlib
+import json
+import os
+
+import numpy as np
+
+from ..data import arrayfile
+from ..version import __version__
+
+
+SUFFIX = '.wsa'
+
+# part of every key, increase when cached contents change
+CACHE_FORMAT = 2
+
+_cache = None
+
+
+def _canonical(obj):
+    """JSON serializable representation of obj with stable ordering"""
+
+    if isinstance(obj, dict):
+        return {'dict': sorted((json.dumps(_canonical(key)), _canonical(value))
+                               for key, value in obj.items())}
+
+    if isinstance(obj, (list, tuple)):
+        return [_canonical(value) for value in obj]
+
+    if isinstance(obj, np.ndarray):
+        return {'array': [obj.dtype.str, list(obj.shape),
+                          hashlib.sha1(np.ascontiguousarray(obj).tobytes()).hexdigest()]}
+
+    if isinstance(obj, np.generic):
+        return _canonical(obj.item())
+
+    if isinstance(obj, float):
+        # repr keeps every digit
+        return {'float': repr(obj)}
+
+    if obj is None or isinstance(obj, (bool, int, str)):
+        return obj
+
+    if hasattr(obj, '__dict__'):
+        return {type(obj).__qualname__: _canonical(vars(obj))}
+
+    raise TypeError(f'{type(obj).__name__} objects cannot be used as cache key!')
+
+
+def stable_hash(*args):
+    """Hash of arguments, equal across processes and sessions
+
+    Library version and cache format are part of the hash, so results
+    of other versions are not used.
+    """
+
+    representation = json.dumps(_canonical((__version__, CACHE_FORMAT) + args),
+                                separators=(',', ':'))
+
+    return hashlib.sha256(representation.encode('utf-8')).hexdigest()
+
+
+def wing_key(wing, airfoil_db):
+    """Hashable description of wing and its airfoil data"""
+
+    airfoils = sorted(set(str(airfoil) for airfoil in wing.airfoils))
+
+    return wing.serialize(), {airfoil: airfoil_db[airfoil] for airfoil in airfoils}
+
+
+class DiskCache:
+    """Directory of cached results with size limit
+
+    Parameters
+    ----------
+    directory : str
+        cache directory, created if necessary
+    max_size : int, optional
+        maximum size of cache files in bytes, by default 256 MB
+    """
+
+    def __init__(self, directory:str, max_size:int=256*1024**2):
+        self.directory = directory
+        self.max_size = max_size
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    def _filename(self, key):
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def _entries(self):
+        """cache files with access time and size, oldest first"""
+
+        entries = []
+
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(SUFFIX):
+                continue
+
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                # removed by another process
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        return sorted(entries)
+
+    def get(self, key:str):
+        """Get cached arrays and meta data
+
+        Parameters
+        ----------
+        key : str
+            hash of cached calculation
+
+        Returns
+        -------
+        tuple or None
+            dict of arrays and meta data dict, None if not cached
+        """
+
+        filename = self._filename(key)
+
+        try:
+            arrays, meta = arrayfile.read_arrays(filename, mmap=False)
+            # modification time is used as access time for eviction
+            os.utime(filename)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        return arrays, meta
+
+    def put(self, key:str, arrays:dict, meta:dict=None):
+        """Store arrays and meta data, evicting old entries if necessary
+
+        Parameters
+        ----------
+        key : str
+            hash of cached calculation
+        arrays : dict
+            arrays by name
+        meta : dict, optional
+            JSON serializable meta data, by default None
+        """
+
+        arrayfile.write_arrays(self._filename(key), arrays, meta)
+
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries exceeding the size limit"""
+
+        entries = self._entries()
+        size = sum(entry[1] for entry in entries)
+
+        for _, filesize, filename in entries:
+            if size <= self.max_size:
+                break
+
+            try:
+                os.remove(filename)
+                self.evictions += 1
+            except FileNotFoundError:
+                pass
+
+            size -= filesize
+
+    def clear(self):
+        """Remove all entries"""
+
+        for _, _, filename in self._entries():
+            try:
+                os.remove(filename)
+            except FileNotFoundError:
+                pass
+
+    @property
+    def stats(self):
+        """Get hits, misses and evictions of this process as well as
+        number of entries and size of cache"""
+
+        entries = self._entries()
+
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'entries': len(entries), 'size': sum(entry[1] for entry in entries)}
+
+
+def set_disk_cache(directory:str=None, max_size:int=256*1024**2):
+    """Enable disk cache of calculate_lift and LiftAnalysis.generate
+
+    Parameters
+    ----------
+    directory : str, optional
+        cache directory, None disables the cache, by default None
+    max_size : int, optional
+        maximum size of cache in bytes, by default 256 MB
+
+    Returns
+    -------
+    DiskCache or None
+        the active cache
+    """
+
+    global _cache
+
+    _cache = None if directory is None else DiskCache(directory, max_size)
+
+    return _cache
+
+
+def get_disk_cache():
+    """Get active disk cache, None if disabled"""
+
+    return _cache
@@ -4,20 +4,50 @@ Module providing objects for calculation of prandtl's lifting line problem.
 """
 import numpy as np
 from collections import namedtuple, defaultdict
-from .multhop import _calc_gridpoints, Multhop, AirfoilData, _calc_eta_eff
+from scipy.linalg.blas import daxpy, ddot
+from .multhop import (_calc_gridpoints, Multhop, MulthopResult, AirfoilData, _calc_eta_eff, _eta_eff,
+                      _multhop_coefficients as _grid_coefficients)
+from .nnliftingline import NonlinearMulthop, ConvergenceReport
+from .vortexlattice import VortexLattice
+from ..data import arrayfile
+from . import diskcache
 
 
 π = np.pi
 
 _calculator_dict = {
     'multhop': Multhop,
+    'nonlinear': NonlinearMulthop,
+    'vortexlattice': VortexLattice,
 }
 
 
+def _default_grid(wing, M):
+    """multhopp grid with root point at zero"""
+
+    if M is not None and M%2 != 1:
+        raise ValueError('Number of grid points (M) has to be uneven!')
+
+    ys = _calc_gridpoints(wing, M)
+
+    ys[len(ys)//2] = 0.0
+
+    return ys
+
+
+def _calculator(wing, ys, airfoil_db, method, options):
+    try:
+        calculator_cls = _calculator_dict[method]
+    except KeyError:
+        raise NotImplementedError('{} is not implemented yet!'.format(method))
+
+    return calculator_cls(wing, ys, airfoil_db, **options)
+
+
 class LiftAnalysis:
     @classmethod
     def generate(cls, wing, airfoil_db=defaultdict(AirfoilData), method='multhop', grid='default',
-                 grid_pts=None, M=None):
+                 grid_pts=None, M=None, adaptive_options:dict=None, **options):
         """Build a LiftAnalysis object
         
         Parameters
@@ -26,10 +56,19 @@ class LiftAnalysis:
             a wing object
         airfoil_db : [type], optional
             , by default defaultdict(AirfoilData)
-        M : int, optional
-            number of grid points for calculation, must be uneven, by default None
+        M : int or str, optional
+            number of grid points for calculation, must be uneven, 'adaptive'
+            chooses it with adaptive_gridsize, by default None
+        adaptive_options : dict, optional
+            keyword arguments of adaptive_gridsize for M='adaptive', e.g.
+            tol or M_max, by default None
         method : str, optional
-            calculation method, by default 'multhop' (only option atm)
+            calculation method, 'multhop', 'nonlinear' (lift curves of
+            airfoil_db entries) or 'vortexlattice' (swept wings and dihedral
+            without flattening), by default 'multhop'
+        options : optional
+            additional keyword arguments for calculation method, e.g.
+            reynolds for method 'nonlinear'
         
         Returns
         -------
@@ -44,37 +83,64 @@ class LiftAnalysis:
             is raised when chosen cacluation method is available
         """
         
-        if grid == 'default':
-            if M is not None and M%2 != 1:
-                raise ValueError('Number of grid points (M) has to be uneven!')
+        cache = diskcache.get_disk_cache()
+
+        # adaptive grids and nonlinear solvers are not cached
+        cachable = cache is not None and M != 'adaptive' and \
+                   not getattr(_calculator_dict.get(method), 'nonlinear', False)
+
+        if cachable:
+            key = diskcache.stable_hash('LiftAnalysis', *diskcache.wing_key(wing, airfoil_db),
+                                        method, grid, grid_pts, M, options)
+            cached = cache.get(key)
 
-            ys = _calc_gridpoints(wing, M)
+            if cached is not None:
+                return cls._from_arrays(*cached)
 
-            ys[len(ys)//2] = 0.0
+        grid_convergence = None
 
+        if M == 'adaptive':
+            grid_convergence = adaptive_gridsize(wing, airfoil_db, method=method,
+                                                 **(adaptive_options or {}), **options)
+            M = grid_convergence.M
+
+        if grid == 'default':
+            ys = _default_grid(wing, M)
         elif grid == 'defined':
             ys = grid_pts
         else:
             raise Exception(f'Unknown grid argument: {grid}')
 
-        try:
-            calculator = _calculator_dict[method](wing, ys, airfoil_db)
-        except:
-            raise NotImplementedError('{} is not implemented yet!'.format(method))
+        calculator = _calculator(wing, ys, airfoil_db, method, options)
+
+        analysis = cls._from_calculator(wing, calculator)
+        analysis.grid_convergence = grid_convergence
+
+        if cachable:
+            cache.put(key, *analysis._to_arrays())
+
+        return analysis
+
+    @classmethod
+    def _from_calculator(cls, wing, calculator):
+        """lift analysis with lift distributions of calculator"""
 
         analysis = cls()
+
+        if getattr(calculator, 'nonlinear', False):
+            # nonlinear solutions cannot be superposed, keep solver
+            analysis._solver = calculator
         
-        analysis.ys = ys
-        analysis._base = calculator.baselift()
-        analysis._airbrake = calculator.airbrakelift()
-        analysis._aoa = calculator.aoa(1)
-        analysis._control_surfaces = {name : calculator._controlsurfacelift_n(name) \
-                                                     for name in wing.controlsurfaces.keys()}
+        analysis.ys = calculator.ys
+        analysis._base, analysis._airbrake, analysis._aoa, analysis._control_surfaces = \
+                                                     calculator.liftbases()
         analysis.chords = calculator.chords
 
         analysis._area = wing.area
         analysis._spanwidth = wing.span
 
+        analysis._drag_weights = calculator.drag_weights()
+
         return analysis
 
     def __init__(self):
@@ -85,8 +151,21 @@ class LiftAnalysis:
         self._aoa = None
         self._control_surfaces = {}
 
+        self._solver = None
+        self.report = None
+        self.grid_convergence = None
+
         self._area = 0.0
         self._spanwidth = 0.0
+
+        # induced drag is evaluated from superposed circulation
+        self._drag_weights = None
+
+        # mirrored control surface distributions and buffers of last out
+        self._flipped = {}
+        self._buffers = None
+
+        self._operator = None
     
     def calculate(self, C_L, controls:dict={}, airbrake:bool=False, all_results:bool=False):
         
@@ -116,62 +195,768 @@ class LiftAnalysis:
 
         return res.C_L, res.c_ls
 
-    def _calc_controlsurface(self, name, deflections):
-        # control surface lift distribution is proportional
-        # to effective deflection not to deflection itself
-        fac = lambda η: _calc_eta_eff(np.radians(η))
-        controllift = self._control_surfaces[name]
-        return controllift * fac(deflections[0]) \
-                + controllift.flip() * fac(deflections[1])
+    def sweep(self, C_Ls, controls:dict={}, airbrake=False):
+        """Calculate lift distributions for many target lift coefficients at once
 
-    def __call__(self, target=0.0, target_type='C_L', controls={}, airbrake=False):
+        All cases are evaluated as linear combination of the stored
+        lift distributions, no intermediate result objects are created.
         
+        Parameters
+        ----------
+        C_Ls : array
+            target lift coefficients (N,)
+        controls : dict, optional
+            control surface deflections in degrees, each value is a
+            (N, 2) or (2,) array for both wing halves, by default {}
+        airbrake : bool or array, optional
+            extended airbrakes, scalar or (N,) array, by default False
+        
+        Returns
+        -------
+        tuple
+            angles of attack in degrees (N,), lift coefficient 
+            distributions (N, M), induced drag coefficients (N,) and
+            moment coefficients in flight direction (N,)
+        """
+
+        C_Ls = np.atleast_1d(np.asarray(C_Ls, dtype=float))
+        N = len(C_Ls)
+
+        if self._solver is not None:
+            α, res = self._solve_nonlinear(C_Ls, 'C_L', controls, airbrake)
+
+            # Moment coefficient in flight direction
+            A = self._area
+            b = self._spanwidth
+            C_Mx = np.trapz(self.ys*res.c_ls*self.chords, self.ys, axis=-1) / (A*b)
+        else:
+            α, res, C_Mx = self.compile()(C_Ls, controls, airbrake)
+
+        return np.rad2deg(α), res.c_ls, res.C_Di, C_Mx
+
+    def save(self, filename:str):
+        """Save lift distributions to binary file
+
+        The file can be memory-mapped by many processes with load,
+        the lift distributions do not need to be calculated again.
+
+        Parameters
+        ----------
+        filename : str
+            path of file
+        """
+
+        arrayfile.write_arrays(filename, *self._to_arrays())
+
+    def _to_arrays(self):
+        """arrays and meta data of stored lift distributions"""
+
+        if self._solver is not None:
+            raise ValueError('Nonlinear lift analyses cannot be saved!')
+
+        names = list(self._control_surfaces.keys())
+
+        bases = np.vstack([self._base._data, self._airbrake._data, self._aoa._data]
+                          + [self._control_surfaces[name]._data for name in names])
+
+        arrays = {'ys': np.asarray(self.ys, dtype=float),
+                  'chords': np.asarray(self.chords, dtype=float),
+                  'bases': bases,
+                  'drag_weights': np.asarray(self._drag_weights, dtype=float)}
+
+        meta = {'type': 'LiftAnalysis', 'control_surfaces': names,
+                'area': float(self._area), 'span': float(self._spanwidth)}
+
+        return arrays, meta
+
+    @classmethod
+    def load(cls, filename:str, mmap:bool=True):
+        """Load lift distributions from binary file
+
+        Parameters
+        ----------
+        filename : str
+            path of file
+        mmap : bool, optional
+            memory-map lift distributions read only instead of
+            reading them, by default True
+
+        Returns
+        -------
+        LiftAnalysis
+            lift analysis object
+        """
+
+        arrays, meta = arrayfile.read_arrays(filename, mmap=mmap)
+
+        if meta.get('type') != 'LiftAnalysis':
+            raise ValueError(f'{filename} does not contain a lift analysis!')
+
+        return cls._from_arrays(arrays, meta)
+
+    @classmethod
+    def _from_arrays(cls, arrays, meta):
+        """lift analysis from arrays and meta data of _to_arrays"""
+
         from .multhop import MulthopResult
 
-        C_L = -target if target_type=='C_L' else 0.0
+        analysis = cls()
+
+        ys = arrays['ys']
+        bases = [MulthopResult._from_data(ys, data) for data in arrays['bases']]
+
+        analysis.ys = ys
+        analysis.chords = arrays['chords']
+
+        analysis._base, analysis._airbrake, analysis._aoa = bases[:3]
+        analysis._control_surfaces = dict(zip(meta['control_surfaces'], bases[3:]))
+
+        analysis._area = meta['area']
+        analysis._spanwidth = meta['span']
+
+        if 'drag_weights' in arrays:
+            analysis._drag_weights = arrays['drag_weights']
+        else:
+            # files without weights contain multhop results
+            b = analysis._spanwidth
+            θs = np.arccos(np.clip(-2*np.asarray(ys)/b, -1.0, 1.0))
+            analysis._drag_weights = π*b**2/analysis._area/(len(ys)+1) * np.sin(θs)
+
+        return analysis
+
+    def compile(self, names=None):
+        """Compile stored lift distributions into a load case operator
+
+        Parameters
+        ----------
+        names : list, optional
+            control surfaces to include, by default all
+
+        Returns
+        -------
+        LoadCaseOperator
+            operator evaluating load cases with one matrix product
+        """
+
+        if names is None:
+            if self._operator is None:
+                self._operator = LoadCaseOperator(self)
+            return self._operator
+
+        return LoadCaseOperator(self, names)
+
+    def _solve_nonlinear(self, targets, target_type, controls, airbrake):
+        """Solve load cases with the nonlinear solver
+
+        Angles of attack distributions are superposed and solved at once,
+        for lift coefficient targets the angle of attack is found with
+        secant iterations starting at the linear solution.
+        """
+
+        solver = self._solver
+
+        N = len(targets)
+
+        airbrake = np.broadcast_to(np.asarray(airbrake, dtype=float), (N,))
+
+        αs = np.tile(solver._base_αs(), (N, 1))
+        αs += np.outer(airbrake, solver._airbrake_αs())
+
+        for name, deflections in controls.items():
+            αs_n = solver._controlsurface_αs_n(name)
+            deflections = np.broadcast_to(np.asarray(deflections, dtype=float), (N, 2))
+            fac = _calc_eta_eff(np.radians(deflections))
+
+            αs += np.outer(fac[:, 0], αs_n) + np.outer(fac[:, 1], αs_n[::-1])
+
+        if target_type != 'C_L':
+            α = np.array(targets, dtype=float)
+            res = solver._multhop(αs + α[:, np.newaxis])
+            self.report = solver.report
+            return α, res
+
+        α, _, _ = self.compile()(targets, controls, airbrake)
+        slope = np.full(N, self._aoa.C_L)
 
-        def zly(): return np.zeros_like(self.ys)
+        res = solver._multhop(αs + α[:, np.newaxis])
 
-        res = MulthopResult(self.ys, zly(), zly(), C_L, 0.0)
+        iteration = 0
 
-        # collect contributions to lift distribution
-        res += self._base
+        while iteration < solver.max_iter:
+            ΔC_L = targets - res.C_L
+
+            if (np.abs(ΔC_L) <= solver.tol).all():
+                break
+
+            iteration += 1
+
+            # limit steps, targets beyond maximum lift are not reachable
+            α_new = α + np.clip(ΔC_L/slope, -np.radians(2.0), np.radians(2.0))
+            res_new = solver._multhop(αs + α_new[:, np.newaxis])
+
+            # secant slope, keep last one beyond maximum lift
+            Δα = α_new - α
+            with np.errstate(divide='ignore', invalid='ignore'):
+                secant = (res_new.C_L - res.C_L)/Δα
+            slope = np.where((np.abs(Δα) > 1e-12) & (secant > 1e-3*self._aoa.C_L), secant, slope)
+
+            α, res = α_new, res_new
+
+        residual = np.abs(targets - res.C_L)
+        self.report = ConvergenceReport((residual <= solver.tol) & solver.report.converged,
+                                        iteration, np.maximum(residual, solver.report.residual))
+
+        return α, res
+
+    def __call__(self, target=0.0, target_type='C_L', controls={}, airbrake=False, out=None):
+        """Calculate lift distribution of a load case
+
+        Parameters
+        ----------
+        target : float, optional
+            lift coefficient or angle of attack (radians), by default 0.0
+        target_type : str, optional
+            'C_L' or 'alpha', by default 'C_L'
+        controls : dict, optional
+            control surface deflections, by default {}
+        airbrake : bool, optional
+            airbrake extended, by default False
+        out : MulthopResult, optional
+            result to store lift distribution in, with it repeated linear
+            evaluations do not allocate memory, by default None
+
+        Returns
+        -------
+        tuple
+            angle of attack (radians) and MulthopResult
+        """
+        
+        if self._solver is not None:
+            α, res = self._solve_nonlinear(np.array([target], dtype=float), target_type,
+                                           controls, airbrake)
+            self.report = ConvergenceReport(self.report.converged[0], self.report.iterations,
+                                            self.report.residual[0])
+            if out is not None:
+                out._data[...] = res._data[0]
+                return α[0], out
+
+            return α[0], res[0]
+
+        if out is None:
+            out = MulthopResult.zeros(self.ys)
+        else:
+            out.ys = self.ys
+
+        buffers = self._call_buffers(out)
+        data = buffers[0]
+
+        # blas routines work in-place without temporary arrays
+        np.copyto(data, self._base._data)
 
         if airbrake: 
-            res += self._airbrake
+            daxpy(self._airbrake._data, data, a=1.0)
 
-        for cs in controls.items():
-            res += self._calc_controlsurface(*cs)
+        self._accumulate_controls(data, controls, buffers[4])
 
         # choose angle of attack
         if target_type == 'C_L':
-            α = -res.C_L / self._aoa.C_L
+            α = (target - data.item(-2)) / self._aoa._data.item(-2)
         else:
             α = target
 
-        res += α * self._aoa
+        daxpy(self._aoa._data, data, a=α)
 
-        res.C_L += target if target_type=='C_L' else 0.0
+        # induced drag is quadratic in circulation and cannot be superposed
+        work = np.multiply(buffers[1], buffers[2], out=buffers[3])
+        data[-1] = ddot(self._drag_weights, work)
 
-        return α, res
+        return α, out
 
+    def _call_buffers(self, out):
+        """views on data of out, work array and control surface names,
+        reused for the same out"""
 
-def calculate_lift(wing, target=0.0, target_type='C_L', controls={}, airbrake=False, M=None, 
-        method='multhop', airfoil_db:dict=defaultdict(AirfoilData), calc_cmx=False):
+        data = out._data
 
-    la = LiftAnalysis.generate(wing, airfoil_db, M=M, method=method)
+        if self._buffers is None or self._buffers[0] is not data:
+            if data.ndim != 1 or not data.flags.c_contiguous or not data.flags.writeable:
+                raise ValueError('out has to be a single result with contiguous data!')
 
-    α, res = la(target, target_type, controls, airbrake)
+            self._buffers = (data, out.α_is, out.γs, np.empty(len(self.ys)),
+                             tuple(self._control_surfaces))
+
+        return self._buffers
+
+    def _accumulate_controls(self, data, controls, names):
+        """add control surface lift distributions to data
+
+        The lift distribution is proportional to effective deflection,
+        not to deflection itself. An index loop is used, as iterators
+        would allocate memory.
+        """
+
+        if not controls:
+            return
+
+        found = 0
+        i = 0
+
+        while i < len(names):
+            name = names[i]
+            i += 1
+
+            deflections = controls.get(name)
+
+            if deflections is None:
+                continue
 
-    additional = {}
+            found += 1
+
+            daxpy(self._control_surfaces[name]._data, data, a=_eta_eff(deflections[0]))
+            daxpy(self._flipped_control(name), data, a=_eta_eff(deflections[1]))
+
+        if found != len(controls):
+            unknown = sorted(set(controls) - set(names))
+            raise KeyError(f'unknown control surfaces {unknown}!')
+
+    def _flipped_control(self, name):
+        """data of mirrored control surface lift distribution"""
+
+        flipped = self._flipped.get(name)
+
+        if flipped is None:
+            flipped = self._flipped[name] = self._control_surfaces[name].flip()._data
+
+        return flipped
+
+
+class LoadCaseOperator:
+    """Linear operator for load cases of a LiftAnalysis
+
+    Every linear load case is a combination of the base, airbrake, angle
+    of attack and (mirrored) control surface lift distributions. These
+    are stacked into one basis matrix, rows hold the result data of
+    MulthopResult and the moment coefficient in flight direction. Load
+    cases are evaluated as product of a factor matrix with the basis.
+
+    Evaluating matrices of load cases takes less than a microsecond per
+    case for grids up to M=127, single cases are dominated by the Python
+    call overhead of some microseconds (see benchmarks/bench_loadcases.py).
+
+    Parameters
+    ----------
+    analysis : LiftAnalysis
+        lift analysis with linear lift distributions
+    names : list, optional
+        control surfaces to include, by default all
+    """
+
+    def __init__(self, analysis, names=None):
+        if names is None:
+            names = list(analysis._control_surfaces.keys())
+
+        results = [analysis._base, analysis._airbrake]
+
+        for name in names:
+            controllift = analysis._control_surfaces[name]
+            results += [controllift, controllift.flip()]
+
+        results.append(analysis._aoa)
+
+        data = np.vstack([res._data for res in results])
+
+        ys = analysis.ys
+        M = len(ys)
+
+        # Moment coefficient in flight direction
+        A = analysis._area
+        b = analysis._spanwidth
+        C_Mx = np.trapz(ys*data[:, :M]*analysis.chords, ys, axis=-1) / (A*b)
+
+        self.ys = ys
+        self.names = list(names)
+        self._index = {name: 2+2*i for i, name in enumerate(self.names)}
+
+        # induced drag is quadratic in circulation: C_Di = Σ w γ α_i = W Q W
+        # with Q of the basis distributions, evaluated after superposition
+        self.basis = np.column_stack([data, C_Mx])
+        self.basis[:, -2] = 0.0
+
+        self._drag_form = (data[:, 2*M:3*M]*analysis._drag_weights) @ data[:, M:2*M].T
+
+        self._C_L = self.basis[:-1, -3].copy()
+        self._C_L_α = self.basis[-1, -3]
+
+    def factors(self, targets, controls:dict={}, airbrake=False, target_type='C_L'):
+        """Calculate factors of basis lift distributions
+
+        Parameters
+        ----------
+        targets : array
+            lift coefficients or angles of attack (radians) (K,)
+        controls : dict, optional
+            control surface deflections in degrees, each value is a
+            (K, 2) or (2,) array for both wing halves, by default {}
+        airbrake : bool or array, optional
+            extended airbrakes, scalar or (K,) array, by default False
+        target_type : str, optional
+            'C_L' or 'alpha', by default 'C_L'
+
+        Returns
+        -------
+        np.ndarray
+            factors (K, number of basis distributions), the last
+            column is the angle of attack
+        """
+
+        targets = np.asarray(targets, dtype=float)
+
+        W = np.zeros(targets.shape + (len(self.basis),))
+
+        W[..., 0] = 1.0
+        W[..., 1] = airbrake
+
+        for name, deflections in controls.items():
+            try:
+                idx = self._index[name]
+            except KeyError:
+                raise KeyError(f'control surface "{name}" is not part of load case operator!')
+
+            # lift is proportional to effective deflection
+            W[..., idx:idx+2] = _calc_eta_eff(np.radians(deflections))
+
+        if target_type == 'C_L':
+            W[..., -1] = (targets - W[..., :-1]@self._C_L)/self._C_L_α
+        else:
+            W[..., -1] = targets
+
+        return W
+
+    def evaluate(self, W, out=None):
+        """Evaluate load cases for given factors
+
+        Parameters
+        ----------
+        W : np.ndarray
+            factors of basis lift distributions, see factors
+        out : np.ndarray, optional
+            array for results, by default None
+
+        Returns
+        -------
+        np.ndarray
+            result data with layout (c_ls, α_is, γs, C_L, C_Di, C_Mx)
+        """
+
+        out = np.matmul(W, self.basis, out=out)
+
+        if W.ndim == 1:
+            out[-2] = W.dot(self._drag_form).dot(W)
+        else:
+            out[..., -2] = np.sum((W @ self._drag_form)*W, axis=-1)
+
+        return out
+
+    def __call__(self, targets, controls:dict={}, airbrake=False, target_type='C_L', out=None):
+        """Evaluate load cases
+
+        Parameters
+        ----------
+        targets : float or array
+            lift coefficients or angles of attack (radians)
+        controls : dict, optional
+            control surface deflections in degrees, by default {}
+        airbrake : bool or array, optional
+            extended airbrakes, by default False
+        target_type : str, optional
+            'C_L' or 'alpha', by default 'C_L'
+        out : np.ndarray, optional
+            array for results, see evaluate, by default None
+
+        Returns
+        -------
+        tuple
+            angles of attack (radians), MulthopResult (MulthopBatchResult
+            for array targets) and moment coefficients in flight direction
+        """
+
+        from .multhop import MulthopResult, MulthopBatchResult
+
+        W = self.factors(targets, controls, airbrake, target_type)
+
+        data = self.evaluate(W, out)
+
+        restype = MulthopBatchResult if data.ndim == 2 else MulthopResult
+
+        return W[..., -1], restype._from_data(self.ys, data[..., :-1]), data[..., -1]
+
+
+GridConvergence = namedtuple('GridConvergence', 
+                             ('M', 'C_L', 'C_Di', 'C_Mb', 'error', 'extrapolated', 'history'))
+
+
+def adaptive_gridsize(wing, airfoil_db=defaultdict(AirfoilData), tol:float=1e-3,
+                      M0:int=7, M_max:int=1023, α:float=5.0, controls:dict={},
+                      richardson:bool=True, method:str='multhop', **options):
+    """Choose number of grid points by grid convergence study
+
+    The number of grid points is refined (M -> 2M+1, nested grids) until
+    the relative change of C_L, C_Di and root bending moment coefficient
+    of a reference load case is below tol. The coefficients are evaluated
+    from the circulation of the superposed load case. With richardson extrapolation
+    the observed order of convergence is used to estimate the remaining
+    error, which usually allows to stop one refinement earlier.
+    
+    Parameters
+    ----------
+    wing : Wing
+        a wing object
+    airfoil_db : dict, optional
+        airfoil data, by default defaultdict(AirfoilData)
+    tol : float, optional
+        relative tolerance, by default 1e-3
+    M0 : int, optional
+        number of grid points of coarsest grid, by default 7
+    M_max : int, optional
+        maximum number of grid points, by default 1023
+    α : float, optional
+        angle of attack of reference load case in degrees, by default 5.0
+    controls : dict, optional
+        control surface deflections of reference load case, by default {}
+    richardson : bool, optional
+        use richardson extrapolation for error estimate, by default True
+    method : str, optional
+        calculation method, by default 'multhop'
+    options : optional
+        additional keyword arguments for calculation method
+    
+    Returns
+    -------
+    GridConvergence
+        chosen M, values on that grid, estimated relative error,
+        extrapolated values (or None) and history of (M, values)
+    """
+
+    if M0%2 != 1:
+        raise ValueError('Number of grid points (M0) has to be uneven!')
+
+    history = []
+
+    M = M0
+    error = np.inf
+    extrapolated = None
+
+    while True:
+        calculator = _calculator(wing, _default_grid(wing, M), airfoil_db, method, options)
+        la = LiftAnalysis._from_calculator(wing, calculator)
+
+        _, res = la(np.radians(α), 'alpha', controls)
+
+        # quadrature of solver, grids of other methods are no multhopp grids
+        values = calculator.coefficients(res)
+        history.append((M, values))
+
+        if len(history) >= 2:
+            Δ = np.abs(values - history[-2][1])
+            scale = np.maximum(np.abs(values), 1e-12)
+
+            error = np.max(Δ/scale)
+            extrapolated = None
+
+            if richardson and len(history) >= 3:
+                Δ_coarse = np.abs(history[-2][1] - history[-3][1])
+
+                # observed order of convergence, grid spacing is halved
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    p = np.log2(Δ_coarse/Δ)
+
+                p = np.where(np.isfinite(p) & (p > 0.5), p, 1.0)
+
+                correction = (values - history[-2][1])/(2**p - 1)
+                extrapolated = values + correction
+
+                error = np.max(np.abs(correction)/scale)
+
+            if error <= tol:
+                break
+
+        if 2*M+1 > M_max:
+            break
+
+        M = 2*M + 1
+
+    extrapolated = None if extrapolated is None else dict(zip(('C_L', 'C_Di', 'C_Mb'),
+                                                              extrapolated))
+
+    return GridConvergence(M, *values, error, extrapolated, history)
+
+
+def _lift_result(wing, la, α, res, calc_cmx):
+    """result dict of calculate_lift, arrays are copies and
+    scalars floats, so results do not share memory with res"""
+
+    result = {'c_ls': np.array(res.c_ls), 'a_is': np.array(res.α_is), 'ys': la.ys,
+              'chords': la.chords, 'C_L': float(res.C_L), 'alpha': float(np.rad2deg(α))}
 
     if calc_cmx:
         # Moment coefficient in flight direction
         A = wing.area
         b = wing.span
-        C_Mx = np.trapz(la.ys*res.c_ls*la.chords, la.ys)/ (A*b)
+        result['C_Mx'] = float(np.trapz(la.ys*res.c_ls*la.chords, la.ys)/ (A*b))
+
+    return result
+
+
+def calculate_lift(wing, target=0.0, target_type='C_L', controls={}, airbrake=False, M=None, 
+        method='multhop', airfoil_db:dict=defaultdict(AirfoilData), calc_cmx=False):
+
+    cache = diskcache.get_disk_cache()
+
+    if cache is not None:
+        key = diskcache.stable_hash('calculate_lift', *diskcache.wing_key(wing, airfoil_db),
+                                    target, target_type, controls, airbrake, M, method,
+                                    calc_cmx)
+        cached = cache.get(key)
+
+        if cached is not None:
+            # scalars are stored as zero dimensional arrays
+            return {name: float(value) if value.ndim == 0 else value
+                    for name, value in cached[0].items()}
+
+    la = LiftAnalysis.generate(wing, airfoil_db, M=M, method=method)
+
+    α, res = la(target, target_type, controls, airbrake)
+
+    result = _lift_result(wing, la, α, res, calc_cmx)
+
+    if cache is not None:
+        cache.put(key, {name: np.asarray(value, dtype=float) for name, value in result.items()},
+                  {'type': 'calculate_lift'})
 
-        additional['C_Mx'] = C_Mx
+    return result
+
+
+def calculate_lift_gradients(wing, target=0.0, target_type='C_L', controls={}, airbrake=False,
+                             M=None, airfoil_db:dict=defaultdict(AirfoilData)):
+    """Calculate derivatives of lift results regarding section twists and chords
+
+    For lift coefficient targets the angle of attack is adjusted to keep
+    the lift coefficient constant, e.g. the C_Di derivatives are those
+    at constant lift.
+    
+    Parameters
+    ----------
+    wing : Wing
+        a wing object
+    target : float, optional
+        lift coefficient or angle of attack (radians), by default 0.0
+    target_type : str, optional
+        'C_L' or 'alpha', by default 'C_L'
+    controls : dict, optional
+        control surface deflections, by default {}
+    airbrake : bool, optional
+        airbrake extended, by default False
+    M : int, optional
+        number of grid points, by default None
+    airfoil_db : dict, optional
+        airfoil data, by default defaultdict(AirfoilData)
     
-    return {'c_ls': res.c_ls, 'a_is': res.α_is, 'ys': la.ys, 'chords': la.chords,
-            'C_L': res.C_L, 'alpha': np.rad2deg(α), **additional}
+    Returns
+    -------
+    dict
+        derivatives of C_L, C_Di, C_Mx and c_ls regarding twist (per degree)
+        and chord of wing sections, e.g. gradients['C_Di']['twist'], for
+        lift coefficient targets also derivatives of angle of attack
+        (degrees) as gradients['alpha']
+    """
+
+    ys = _calc_gridpoints(wing, M)
+    ys[len(ys)//2] = 0.0
+
+    calculator = Multhop(wing, ys, airfoil_db)
+
+    αs = calculator._base_αs()
+
+    if airbrake:
+        αs = αs + calculator._airbrake_αs()
+
+    for name, deflections in controls.items():
+        αs_n = calculator._controlsurface_αs_n(name)
+        fac = _calc_eta_eff(np.radians(deflections))
+
+        αs = αs + fac[0]*αs_n + fac[1]*αs_n[::-1]
+
+    if target_type == 'C_L':
+        res = calculator._solve_linear(np.vstack([αs, calculator._aoa_αs(1.0)]))
+        α = (target - res.C_L[0])/res.C_L[1]
+    else:
+        α = target
+
+    gradients = calculator.gradients(αs + α)
+
+    if target_type != 'C_L':
+        return gradients
+
+    # angle of attack changes to keep lift coefficient constant
+    dC_L = gradients['C_L']
+    dα = {var: -dC_L[var]/dC_L['alpha'] for var in ('twist', 'chord')}
+
+    trimmed = {name: {var: grad[var] + np.multiply.outer(grad['alpha'], dα[var])
+                      for var in ('twist', 'chord')}
+               for name, grad in gradients.items()}
+
+    trimmed['alpha'] = dα
+
+    return trimmed
+
+
+def calculate_lift_batch(batch, target=0.0, target_type='C_L', M=None,
+                         airfoil_db:dict=defaultdict(AirfoilData)):
+    """Calculate lift distributions of all wings of a WingBatch
+
+    Parameters
+    ----------
+    batch : WingBatch
+        wings with same topology
+    target : float or array, optional
+        lift coefficient or angle of attack (radians) for all or every
+        wing, by default 0.0
+    target_type : str, optional
+        'C_L' or 'alpha', by default 'C_L'
+    M : int, optional
+        number of grid points, by default None
+    airfoil_db : dict, optional
+        airfoil data, by default defaultdict(AirfoilData)
+
+    Returns
+    -------
+    dict
+        results like calculate_lift with an additional first dimension
+        for the wings (c_ls, a_is, ys, chords, C_L, C_Di, alpha)
+    """
+
+    from .multhop import BatchMulthop
+
+    calculator = BatchMulthop(batch, airfoil_db, M)
+
+    base, aoa = calculator.liftbases()
+
+    target = np.broadcast_to(np.asarray(target, dtype=float), (len(batch),))
+
+    # choose angle of attack
+    if target_type == 'C_L':
+        α = (target - base.C_L)/aoa.C_L
+    else:
+        α = target
+
+    res = base.copy()
+    res._data += α[:, np.newaxis]*aoa._data
+
+    # induced drag of superposed circulation
+    Λ = batch.span**2/batch.area
+    M = len(calculator.θs)
+    C_Di = π*Λ/(M+1) * np.sum(res.γs*res.α_is*np.sin(calculator.θs), axis=-1)
+
+    return {'c_ls': res.c_ls, 'a_is': res.α_is, 'ys': calculator.ys,
+            'chords': calculator.chords, 'C_L': res.C_L, 'C_Di': C_Di,
+            'alpha': np.rad2deg(α)}
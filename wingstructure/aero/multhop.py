@@ -2,44 +2,207 @@
 prandtl' lifting line problem
 """
 
+import hashlib
+import math
+import threading
+from collections import namedtuple, defaultdict, OrderedDict
+
 import numpy as np
 from numpy import pi as π, sqrt, arctan
-from collections import namedtuple, defaultdict
+from scipy.linalg import lu_factor, lu_solve
 
 
 # Definition of low level functions 
 _multhop_result = namedtuple('ext_multhopp_result', 
                               ('c_ls', 'α_is', 'C_L', 'C_Di'))
 
+def _blocks(data, flip=False):
+    """view of distributions in result data with shape (..., 3, M)"""
+
+    M = (data.shape[-1] - 2)//3
+
+    blocks = data[..., :-2].reshape(data.shape[:-1] + (3, M))
+
+    return blocks[..., ::-1] if flip else blocks
+
+
 class MulthopResult:
-    
+    """Result of a multhop calculation
+
+    Lift coefficients, induced angles of attack, circulation as well as
+    overall lift and induced drag coefficient are stored in one contiguous
+    array with layout (c_ls, α_is, γs, C_L, C_Di). The in-place operations
+    (+=, *=, accumulate, flip with out) do not allocate memory, so results
+    can be reused for repeated superposition.
+    """
+
+    __slots__ = ('ys', '_data', '_work')
+
     def __init__(self, ys, c_ls, α_is, C_L, C_Di, γs=0.0):
+        c_ls = np.asarray(c_ls, dtype=float)
+
         self.ys = ys
+        self._data = np.empty(c_ls.shape[:-1] + (3*c_ls.shape[-1] + 2,))
+        self._work = None
+
         self.c_ls = c_ls
         self.α_is = α_is
+        self.γs = γs
         self.C_L = C_L
         self.C_Di = C_Di
-        self.γs = γs
-    
-    def flip(self):
-        return MulthopResult(self.ys[::-1], self.c_ls[::-1], self.α_is[::-1],
-                             self.C_L, self.C_Di)
-    
+
+    @classmethod
+    def _from_data(cls, ys, data):
+        """create result using data as storage (no copy)"""
+
+        res = cls.__new__(cls)
+        res.ys = ys
+        res._data = data
+        res._work = None
+
+        return res
+
+    @classmethod
+    def zeros(cls, ys, shape=()):
+        """Create result with all values zero, e.g. as out argument"""
+        return cls._from_data(ys, np.zeros(tuple(shape) + (3*len(ys) + 2,)))
+
+    @property
+    def _M(self):
+        return (self._data.shape[-1] - 2)//3
+
+    def _block(self, idx):
+        M = self._M
+        return self._data[..., idx*M:(idx+1)*M]
+
+    @property
+    def c_ls(self):
+        return self._block(0)
+
+    @c_ls.setter
+    def c_ls(self, c_ls):
+        self._block(0)[...] = c_ls
+
+    @property
+    def α_is(self):
+        return self._block(1)
+
+    @α_is.setter
+    def α_is(self, α_is):
+        self._block(1)[...] = α_is
+
+    @property
+    def γs(self):
+        return self._block(2)
+
+    @γs.setter
+    def γs(self, γs):
+        self._block(2)[...] = γs
+
+    @property
+    def C_L(self):
+        return self._data[..., -2]
+
+    @C_L.setter
+    def C_L(self, C_L):
+        self._data[..., -2] = C_L
+
+    @property
+    def C_Di(self):
+        return self._data[..., -1]
+
+    @C_Di.setter
+    def C_Di(self, C_Di):
+        self._data[..., -1] = C_Di
+
+    def copy(self):
+        return self._from_data(self.ys, self._data.copy())
+
+    def flip(self, out=None):
+        """Mirror distributions at wing root
+
+        Parameters
+        ----------
+        out : MulthopResult, optional
+            result to store mirrored values in, by default None
+        """
+
+        if out is None:
+            out = self._from_data(self.ys[::-1], np.empty_like(self._data))
+        else:
+            out.ys = self.ys[::-1]
+
+        _blocks(out._data)[...] = _blocks(self._data, flip=True)
+        out._data[..., -2:] = self._data[..., -2:]
+
+        return out
+
+    def accumulate(self, other, factor=1.0, flip=False):
+        """Add scaled (and mirrored) result in-place
+
+        Equivalent to self += factor*other (or factor*other.flip()),
+        but without temporary results.
+        """
+
+        if self._work is None or self._work.shape != self._data.shape:
+            self._work = np.empty_like(self._data)
+
+        if flip:
+            np.multiply(_blocks(other._data, flip), factor, out=_blocks(self._work))
+            self._work[..., -2] = other._data[..., -2]*factor
+        else:
+            np.multiply(other._data, factor, out=self._work)
+
+        # induced drag is scaled with absolute value
+        self._work[..., -1] = other._data[..., -1]*abs(factor)
+
+        np.add(self._data, self._work, out=self._data)
+
+        return self
+
     def __mul__(self, factor):
-        return MulthopResult(self.ys,
-                             self.c_ls * factor, self.α_is * factor,
-                             self.C_L * factor, self.C_Di * abs(factor),
-                             self.γs * factor ) #TODO check C_Di and alpha_i
-    
+        return self.copy().__imul__(factor)
+
+    def __imul__(self, factor):
+        # induced drag is scaled with absolute value
+        self._data[..., :-1] *= factor
+        self._data[..., -1] *= abs(factor)
+
+        return self
+
     def __add__(self, other):
-        return MulthopResult(self.ys,
-                             self.c_ls+other.c_ls, self.α_is+other.α_is,
-                             self.C_L+other.C_L, self.C_Di+other.C_Di,
-                             self.γs+other.γs)
+        res = self.copy()
+        res += other
+        return res
+
+    def __iadd__(self, other):
+        np.add(self._data, other._data, out=self._data)
+        return self
 
     __rmul__ = __mul__
     __radd__ = __add__
 
+
+class MulthopBatchResult(MulthopResult):
+    """Results of several multhop calculations on the same grid
+
+    Distributions are stored as (K, M) arrays, overall coefficients
+    as arrays of length K. Indexing returns the single results as
+    views on the batch data.
+    """
+
+    __slots__ = ()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, k):
+        return MulthopResult._from_data(self.ys, self._data[k])
+
+    def __iter__(self):
+        return (self[k] for k in range(len(self)))
+
+
 def _prepare_multhop(ys: np.ndarray, αs: np.ndarray, chords: np.ndarray,
              dcls: np.ndarray, S:float, b:float, M=None):
     
@@ -52,58 +215,246 @@ def _prepare_multhop(ys: np.ndarray, αs: np.ndarray, chords: np.ndarray,
     elif M%2 == 0:
         M += 1
 
-    θs = np.linspace(np.pi/(M+1), M/(M+1)*np.pi, M)
+    θs = _multhop_grid(M)
     calc_ys = -b/2 * np.cos(θs)
     calc_ys[M//2] = 0.0
 
     # interpolate input values
     
-    αs_int = np.interp(np.abs(calc_ys), ys, αs)
+    if np.ndim(αs) == 2:
+        αs_int = np.asarray(αs) @ _interp_matrix(np.abs(calc_ys), ys).T
+    else:
+        αs_int = np.interp(np.abs(calc_ys), ys, αs)
     chords_int = np.interp(np.abs(calc_ys), ys, chords)
     dcls_int = np.interp(np.abs(calc_ys), ys, dcls)
 
     return calc_ys, θs, αs_int, chords_int, dcls_int
 
 
-def _multhop_solve(θs, αs, chords, dcls, b):
-    
-    # number of grid points
+def _interp_matrix(x, xp):
+    """Matrix W with W@fp equal to np.interp(x, xp, fp) for every fp"""
+
+    x = np.clip(x, xp[0], xp[-1])
+
+    idx = np.clip(np.searchsorted(xp, x, side='right'), 1, len(xp)-1)
+
+    Δxp = np.asarray(xp)[idx] - np.asarray(xp)[idx-1]
+    t = np.where(Δxp > 0, (x - np.asarray(xp)[idx-1])/np.where(Δxp > 0, Δxp, 1.0), 1.0)
+
+    W = np.zeros((len(x), len(xp)))
+    W[np.arange(len(x)), idx-1] = 1 - t
+    W[np.arange(len(x)), idx] += t
+
+    return W
+
+
+def _multhop_matrix(θs):
+    """Assemble the multhopp coefficient matrix Bb for the grid θs
+
+    The matrix only depends on the angular grid positions, the
+    chord and lift slope dependent diagonal is added by the caller.
+    """
+
     M = len(θs)
 
-    # create empyt matrix (N_MxN_M) for multhoppcoefficients
-    Bb = np.zeros((M, M))
-    Bd = np.zeros(M)
-
-    # calculation of multhopp coefficients
-    for v, (θv, c, dcl_v) in enumerate(zip(θs, chords, dcls)):
-        for n, θn in enumerate(θs):
-
-            # diagonal elements
-            if v == n:
-                # prevent division throught zero
-                if np.isclose(np.sin(θv), 0.0):
-                    θv = 1e-15
-                
-                Bb[v, v] = (M+1)/(4*np.sin(θv))
-                Bd[v] = 2*b/(dcl_v*c)
-            # non diagonal elements
-            else:
-                Bb[v, n] = - ((1-(-1.)**(v-n))/2*(np.sin(θn)/ \
-                            ((M+1)*(np.cos(θn)-np.cos(θv))**2)))
+    sinθs = np.sin(θs)
+    cosθs = np.cos(θs)
+
+    # non diagonal elements, only uneven index differences contribute
+    Δidx = np.subtract.outer(np.arange(M), np.arange(M))
+    uneven = (Δidx % 2) == 1
+
+    Δcos = np.subtract.outer(cosθs, cosθs)
+    Δcos[~uneven] = 1.0
+
+    Bb = np.where(uneven, -sinθs/((M+1)*Δcos**2), 0.0)
 
-    B = Bb + np.diag(Bd)
+    # diagonal elements, prevent division throught zero
+    sinθs_diag = np.where(np.isclose(sinθs, 0.0), np.sin(1e-15), sinθs)
+    Bb[np.diag_indices(M)] = (M+1)/(4*sinθs_diag)
 
-    # calculate local circulation
-    γs = np.dot(np.linalg.inv(B), αs)
+    return Bb
+
+
+CacheInfo = namedtuple('CacheInfo', ('hits', 'misses', 'evictions', 'maxsize', 'currsize'))
+
+
+class InfluenceCache:
+    """Thread-safe LRU cache for multhopp matrices and their factorizations
+
+    The coefficient matrix Bb only depends on the grid, thus it is
+    stored per (M, grid type). Factorizations additionally depend on
+    the chord and lift slope distribution and are stored per grid and
+    diagonal, so wing variants sharing a planform reuse them.
     
-    # calculate induced angle of attack
-    α_is = Bb@γs
+    Parameters
+    ----------
+    maxsize : int, optional
+        maximum number of cached entries, 0 disables caching, by default 64
+    """
+
+    def __init__(self, maxsize:int=64):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._maxsize = maxsize
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def maxsize(self):
+        return self._maxsize
+
+    @maxsize.setter
+    def maxsize(self, maxsize:int):
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def _evict(self):
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key, factory):
+        """Get cached value for key, value is created with factory if missing"""
+
+        with self._lock:
+            try:
+                value = self._entries[key]
+            except KeyError:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+
+        # create value outside of lock, concurrent creation is harmless
+        value = factory()
+
+        with self._lock:
+            if self._maxsize > 0:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                self._evict()
+
+        return value
+
+    def info(self):
+        """Get cache statistics"""
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions,
+                             self._maxsize, len(self._entries))
+
+    def clear(self):
+        """Remove all entries and reset statistics"""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+
+influence_cache = InfluenceCache()
+
+
+def _multhop_grid(M):
+    return np.linspace(np.pi/(M+1), M/(M+1)*np.pi, M)
+
+
+def _grid_key(θs):
+    """identify grid by number of points and grid type"""
+
+    M = len(θs)
+
+    if np.allclose(θs, _multhop_grid(M), rtol=0.0, atol=1e-12):
+        return (M, 'multhop')
+
+    return (M, 'defined', _digest(θs))
+
+
+def _digest(array):
+    return hashlib.sha1(np.ascontiguousarray(array, dtype=float).tobytes()).hexdigest()
+
+
+def _readonly(arrays):
+    for array in arrays:
+        array.setflags(write=False)
+    return arrays
+
+
+class MulthopSystem:
+    """Factorized multhopp equation system
+
+    Stores the LU factorization of the multhopp matrix, so that
+    solutions for further angle of attack distributions can be
+    obtained without assembling or factorizing the system again.
+
+    Parameters
+    ----------
+    θs : np.ndarray
+        angular grid positions
+    chords : np.ndarray
+        chord lengthes at grid positions
+    dcls : np.ndarray
+        lift coefficient slope regarding angle of attack
+    b : float
+        span width of wing
+    cache : InfluenceCache, optional
+        cache for matrices and factorizations, by default the
+        module wide influence_cache
+    """
+
+    def __init__(self, θs, chords, dcls, b, cache:InfluenceCache=None):
+        if cache is None:
+            cache = influence_cache
+
+        self.θs = θs
+        self.Bd = 2*b/(np.asarray(dcls)*np.asarray(chords))
+
+        gridkey = _grid_key(θs)
+
+        self.Bb, = cache.get(('Bb',) + gridkey,
+                             lambda: _readonly((_multhop_matrix(θs),)))
+
+        self.lu = cache.get(('lu',) + gridkey + (_digest(self.Bd),),
+                            lambda: _readonly(lu_factor(self.Bb + np.diag(self.Bd))))
+
+    def solve(self, αs):
+        """Calculate circulation and induced angle of attack
+        
+        Parameters
+        ----------
+        αs : np.ndarray
+            angle of attack at grid positions, either of shape (M,)
+            or (K, M) for K load cases solved at once
+        
+        Returns
+        -------
+        tuple
+            local circulation and induced angle of attack (γs, α_is)
+        """
+
+        αs = np.asarray(αs)
+
+        # calculate local circulation (all right hand sides at once)
+        γs = lu_solve(self.lu, αs.T).T
+
+        # calculate induced angle of attack
+        α_is = γs@self.Bb.T
+
+        return γs, α_is
+
+
+def _multhop_solve(θs, αs, chords, dcls, b):
     
-    return   γs, α_is
+    system = MulthopSystem(θs, chords, dcls, b)
+
+    return system.solve(αs)
 
 
 def multhop(ys: np.ndarray, αs: np.ndarray, chords: np.ndarray,
-             dcls: np.ndarray, S:float, b:float, M:int=None, do_prep=True):
+             dcls: np.ndarray, S:float, b:float, M:int=None, do_prep=True,
+             system:MulthopSystem=None):
     """Low level function for multhop quadrature calculation
 
     The parameters except for S and b have to be numpy arrays of the
@@ -117,7 +468,8 @@ def multhop(ys: np.ndarray, αs: np.ndarray, chords: np.ndarray,
     chords : np.ndarray
         chord lengthes at span positions
     αs: np.ndarray
-        array of angles of attack for chord positions
+        array of angles of attack for chord positions, a (K, M) array
+        solves K cases with a single factorization
     dcls : np.ndarray
         lift coefficient slope regarding angle of attack
     S : float
@@ -126,17 +478,20 @@ def multhop(ys: np.ndarray, αs: np.ndarray, chords: np.ndarray,
         span width of wing
     M: int
         number of grid points
+    do_prep: bool
+        interpolate input values onto multhopp grid, by default True
+    system: MulthopSystem, optional
+        already factorized system for the grid ys (only used
+        without preparation), by default None
     
     Returns
     -------
-    tuple
+    MulthopResult
         multhop results - (c_ls, α_is, C_L, C_Di))
          lift coefficients, induced angle of attack, 
-         wing's lift coefficient, induced drag coefficient
+         wing's lift coefficient, induced drag coefficient,
+         MulthopBatchResult for two dimensional αs
     """
-    
-    # calculate aspect ratio
-    Λ = b**2 / S
 
     if do_prep:
         solverinput = _prepare_multhop(ys, αs, chords, dcls, S, b, M)
@@ -148,20 +503,36 @@ def multhop(ys: np.ndarray, αs: np.ndarray, chords: np.ndarray,
         chords = solverinput[3]
         
     else:
-        M = len(ys)
+        if system is None:
+            θs = np.arccos(-2 * np.array(ys)/b)
+            system = MulthopSystem(θs, chords, dcls, b)
 
-        θs = np.arccos(-2 * np.array(ys)/b)
+        θs = system.θs
 
-        γs, α_is = _multhop_solve(θs, αs, chords, dcls, b)
+        γs, α_is = system.solve(αs)
     
+    return _multhop_result(ys, θs, γs, α_is, chords, S, b)
+
+
+def _multhop_result(ys, θs, γs, α_is, chords, S, b):
+    """Calculate lift coefficients from circulation distribution"""
+
+    M = len(θs)
+
+    # calculate aspect ratio
+    Λ = b**2 / S
+
     # calculate lift coefficient distritbution
     c_ls = 2*b/(np.array(chords)) * np.array(γs)
 
     # calculate overall lift coefficient (whole wing)
-    C_L = π*Λ / (M+1) * np.sum(γs * np.sin(θs))
+    C_L = π*Λ / (M+1) * np.sum(γs * np.sin(θs), axis=-1)
 
     # calculate induced drag
-    C_Di = π*Λ/(M+1) * np.sum( γs * α_is * np.sin(θs))
+    C_Di = π*Λ/(M+1) * np.sum( γs * α_is * np.sin(θs), axis=-1)
+
+    if np.ndim(γs) == 2:
+        return MulthopBatchResult(ys, c_ls, α_is, C_L, C_Di, γs)
 
     return MulthopResult(ys, c_ls, α_is, C_L, C_Di, γs)
 
@@ -174,6 +545,14 @@ class AirfoilData(object):
         self.dif_ca_alpha = dif_ca_alpha
         self.c_m0 = c_m0
 
+    def c_l(self, α, Re=None):
+        """lift coefficient for angle of attack α (rad), linear lift curve"""
+        return self.dif_ca_alpha * (np.asarray(α) - np.radians(self.alpha0))
+
+    def dc_l(self, α, Re=None):
+        """lift coefficient slope (1/rad) at angle of attack α (rad)"""
+        return np.full_like(np.asarray(α, dtype=float), self.dif_ca_alpha)
+
 def _calc_gridpoints(wing, M:int=None):
 
     if M is None:
@@ -181,7 +560,7 @@ def _calc_gridpoints(wing, M:int=None):
 
     b = wing.span
 
-    θs = np.linspace(np.pi/(M+1), M/(M+1)*np.pi, M)
+    θs = _multhop_grid(M)
     calc_ys = -b/2 * np.cos(θs)
 
     return calc_ys
@@ -203,6 +582,11 @@ def _calc_eta_eff(η_k):
     return 22.743 * arctan(0.04715 * η_k)
 
 
+def _eta_eff(η):
+    """effective deflection of one deflection η (degrees) as float"""
+    return 22.743 * math.atan(0.04715 * math.radians(η))
+
+
 def _calc_flap_Δα(controlsurface, ys, η):
 
     cs = controlsurface
@@ -222,55 +606,362 @@ def _calc_flap_Δα(controlsurface, ys, η):
     return αs
 
 
+def _multhop_coefficients(res, b, S):
+    """lift, induced drag and root bending moment coefficient (right wing half)
+    from circulation distribution using multhopp quadrature"""
+
+    M = len(res.ys)
+    θs = np.arccos(-2*np.asarray(res.ys)/b)
+
+    Λ = b**2/S
+    sinθs = np.sin(θs)
+
+    right = θs > π/2
+
+    C_L = π*Λ/(M+1) * np.sum(res.γs * sinθs)
+    C_Di = π*Λ/(M+1) * np.sum(res.γs * res.α_is * sinθs)
+    C_Mb = π*Λ/(M+1) * np.sum((res.γs * -np.cos(θs) * sinθs)[right])
+
+    return np.array([C_L, C_Di, C_Mb])
+
+
 # Definition of high level functions and analysis object
 
-class Multhop:
+class _LiftCalculator:
+    """Angle of attack distributions of load cases and lift bases,
+    calculators provide _solve_linear, coefficients and drag_weights"""
+
     def __init__(self, wing, ys, airfoil_db):
         self.wing = wing
         self.ys = ys
         self.chords = np.interp(np.abs(ys), wing.ys, wing.chords)
-        self.dcls = np.full_like(self.chords, 2*π) #TODO make adaptable
         self.airfoil_db = airfoil_db
-    
+
     def _multhop(self, αs):
-        A = self.wing.area
-        b = self.wing.span
-        return multhop(self.ys, αs, self.chords, self.dcls, A, b, do_prep=False)
+        return self._solve_linear(αs)
 
-    def baselift(self):
+    def _base_αs(self):
         # geometric and aerodynamic twist
-        αs = _calc_base_α(self.wing, self.ys, self.airfoil_db)
-        return self._multhop(αs)
+        return _calc_base_α(self.wing, self.ys, self.airfoil_db)
 
-    def airbrakelift(self):
+    def _airbrake_αs(self):
         α_ab = np.radians(-12.0)
-        αs = np.where(self.wing.within_airbrake(self.ys), α_ab, np.zeros_like(self.ys))
-        return self._multhop(αs)
+        return np.where(self.wing.within_airbrake(self.ys), α_ab, np.zeros_like(self.ys))
 
-    def controlsurfacelift(self, name, η):
+    def _controlsurface(self, name):
         try:
-            control_surf = self.wing.controlsurfaces[name]
+            return self.wing.controlsurfaces[name]
         except:
             raise Exception('control surface "{}" is not set in wing definition!'.format(name))
 
+    def _controlsurface_αs_n(self, name):
+        control_surf = self._controlsurface(name)
+
+        η = 1.0
+
+        return _calc_flap_Δα(control_surf, self.ys, np.radians(η))/_calc_eta_eff(np.radians(η))
+
+    def _aoa_αs(self, α):
+        return np.full_like(self.ys, α)
+
+    def _roll_αs(self, p̂=1.0):
+        # roll rate p̂ = p b/(2V), right wing moving down
+        return p̂ * 2*np.asarray(self.ys)/self.wing.span
+
+    def baselift(self):
+        return self._multhop(self._base_αs())
+
+    def airbrakelift(self):
+        return self._multhop(self._airbrake_αs())
+
+    def controlsurfacelift(self, name, η):
+        control_surf = self._controlsurface(name)
+
         αs = _calc_flap_Δα(control_surf, self.ys, np.radians(η))
 
         return self._multhop(αs)
 
     def _controlsurfacelift_n(self, name):
-        try:
-            control_surf = self.wing.controlsurfaces[name]
-        except:
-            raise Exception('control surface "{}" is not set in wing definition!'.format(name))
+        return self._multhop(self._controlsurface_αs_n(name))
 
-        η = 1.0
+    def aoa(self, α):
+        return self._multhop(self._aoa_αs(α))
 
-        αs = _calc_flap_Δα(control_surf, self.ys, np.radians(η))/_calc_eta_eff(np.radians(η))
+    def liftbases(self):
+        """Calculate all lift distributions needed for a lift analysis
 
-        return self._multhop(αs)
+        Base, airbrake, angle of attack (1 rad) and normalized control
+        surface distributions are solved together with one factorization.
+        The distributions are linear solutions, so they can be superposed.
+        
+        Returns
+        -------
+        tuple
+            base, airbrake and aoa results and dict of control surface results
+        """
 
-    def aoa(self, α):
-        αs = np.full_like(self.ys, α)
-        return self._multhop(αs)
+        names = list(self.wing.controlsurfaces.keys())
+
+        αs = np.vstack([self._base_αs(), self._airbrake_αs(), self._aoa_αs(1)]
+                       + [self._controlsurface_αs_n(name) for name in names])
+
+        results = self._solve_linear(αs)
+
+        base, airbrake, aoa = results[0], results[1], results[2]
+        control_surfaces = {name: results[3+i] for i, name in enumerate(names)}
+
+        return base, airbrake, aoa, control_surfaces
+
+
+class Multhop(_LiftCalculator):
+    def __init__(self, wing, ys, airfoil_db):
+        super().__init__(wing, ys, airfoil_db)
+
+        # local lift slopes from airfoil data
+        dcls = [airfoil_db[airfoil].dif_ca_alpha for airfoil in wing.airfoils]
+        self.dcls = np.interp(np.abs(ys), wing.ys, dcls)
+
+        θs = np.arccos(-2 * np.array(ys)/wing.span)
+        self.system = MulthopSystem(θs, self.chords, self.dcls, wing.span)
+
+    def coefficients(self, res):
+        """Calculate C_L, C_Di and root bending moment coefficient (right
+        wing half) of superposed results with the quadrature of the solver"""
+        return _multhop_coefficients(res, self.wing.span, self.wing.area)
+
+    def drag_weights(self):
+        """Quadrature weights w of induced drag, C_Di = Σ w γ α_i"""
+        Λ = self.wing.aspectratio
+        θs = self.system.θs
+        return π*Λ/(len(θs)+1) * np.sin(θs)
+
+    def _solve_linear(self, αs):
+        A = self.wing.area
+        b = self.wing.span
+        return multhop(self.ys, αs, self.chords, self.dcls, A, b, do_prep=False,
+                       system=self.system)
+
+    def gradients(self, αs):
+        """Derivatives of lift results regarding section twists and chords
+
+        The derivatives are obtained with adjoint solves using the already
+        factorized system, one solve per result instead of one per design
+        variable. The angle of attack distribution has to contain the base
+        twist (e.g. from _base_αs), control surfaces do not depend on twist
+        or chord.
+        
+        Parameters
+        ----------
+        αs : np.ndarray
+            angle of attack distribution at grid points (M,)
         
+        Returns
+        -------
+        dict
+            derivatives of C_L, C_Di, C_Mx (N,) and c_ls (M, N) regarding
+            twist (per degree) and chord of the N wing sections, as well as
+            derivatives regarding angle of attack (per degree), e.g.
+            gradients['C_Di']['twist']
+        """
+
+        system = self.system
+
+        γs, α_is = system.solve(αs)
+
+        # partial derivatives of residual α - (Bb + diag(Bd)) γ
+        W = _interp_matrix(np.abs(self.ys), self.wing.ys)
+
+        R_twist = np.radians(W)
+        R_chord = (system.Bd*γs/self.chords)[:, np.newaxis]*W
+        R_α = np.full((len(γs), 1), np.radians(1.0))
+
+        def adjoint(rhs):
+            return lu_solve(system.lu, rhs, trans=1)
+
+        return self._adjoint_gradients(γs, α_is, adjoint, W, R_twist, R_chord, R_α)
+
+    def _adjoint_gradients(self, γs, α_is, adjoint, W, R_twist, R_chord, R_α):
+        """gradients from solution, adjoint solver (transposed jacobian
+        of residual regarding γs) and partial derivatives of residual
+        regarding twists, chords and angle of attack"""
+
+        wing = self.wing
+        system = self.system
+
+        b = wing.span
+        S = wing.area
+        Λ = b**2/S
+
+        ys = np.asarray(self.ys)
+        chords = self.chords
+        M = len(ys)
+
+        res = _multhop_result(ys, system.θs, γs, α_is, chords, S, b)
+
+        C_Mx = 2*np.trapz(ys*γs, ys)/S
+
+        # sensitivities of results regarding circulation
+        sinθs = np.sin(system.θs)
+        fac = π*Λ/(M+1)
+
+        dC_L = fac*sinθs
+        dC_Di = fac*(sinθs*α_is + system.Bb.T@(sinθs*γs))
+        dC_Mx = 2*ys*np.trapz(np.eye(M), ys, axis=1)/S
+        dc_ls = np.diag(2*b/chords)
+
+        # adjoint solution for all results at once
+        λs = adjoint(np.column_stack([dC_L, dC_Di, dC_Mx, dc_ls]))
+
+        dtwist = λs.T@R_twist
+        dchord = λs.T@R_chord
+        dα = (λs.T@R_α)[:, 0]
+
+        # explicit dependencies on wing area and local chords
+        dS = 2*np.trapz(np.eye(len(wing.ys)), wing.ys, axis=1)
+
+        values = np.concatenate([[res.C_L, res.C_Di, C_Mx], np.zeros(M)])
+        dchord -= np.outer(values, dS)/S
+        dchord[3:] -= (res.c_ls/chords)[:, np.newaxis]*W
+
+        def entry(idx):
+            return {'twist': dtwist[idx], 'chord': dchord[idx], 'alpha': dα[idx]}
+
+        return {'C_L': entry(0), 'C_Di': entry(1), 'C_Mx': entry(2), 'c_ls': entry(slice(3, None))}
+
+
+def _batch_interp(x, xp, fp):
+    """np.interp for every row of x (N, M), xp and fp (N, S)"""
+
+    x = np.clip(x, xp[:, :1], xp[:, -1:])
+
+    idx = np.clip(np.sum(xp[:, np.newaxis, :] <= x[:, :, np.newaxis], axis=-1),
+                  1, xp.shape[1]-1)
+
+    x1, x2 = np.take_along_axis(xp, idx-1, 1), np.take_along_axis(xp, idx, 1)
+    f1, f2 = np.take_along_axis(fp, idx-1, 1), np.take_along_axis(fp, idx, 1)
+
+    Δx = x2 - x1
+    t = np.where(Δx > 0, (x - x1)/np.where(Δx > 0, Δx, 1.0), 1.0)
+
+    return f1 + t*(f2 - f1)
+
+
+class BatchMulthop:
+    """Multhop calculator for all wings of a WingBatch
+
+    All wings use the same angular grid, so the matrix Bb is shared and
+    only the chord dependent diagonal differs. The equation systems of
+    all wings are solved as one stack.
+
+    Parameters
+    ----------
+    batch : WingBatch
+        wings with same topology
+    airfoil_db : dict
+        airfoil data for every airfoil of the wings
+    M : int, optional
+        number of grid points, by default None (chosen for largest
+        aspect ratio)
+    """
+
+    def __init__(self, batch, airfoil_db=defaultdict(AirfoilData), M:int=None):
+        if M is None:
+            M = int(round(np.max(batch.aspectratio))*4-1)
+        elif M%2 == 0:
+            M += 1
+
+        self.batch = batch
+        self.airfoil_db = airfoil_db
+
+        self.span = batch.span
+        self.area = batch.area
+
+        self.θs = _multhop_grid(M)
+
+        self.ys = -self.span[:, np.newaxis]/2 * np.cos(self.θs)
+        self.ys[:, M//2] = 0.0
+
+        abs_ys = np.abs(self.ys)
+
+        self.chords = _batch_interp(abs_ys, batch.ys, batch.chords)
+
+        # local lift slopes and zero lift angles from airfoil data
+        dcls = np.array([airfoil_db[airfoil].dif_ca_alpha for airfoil in batch.airfoils])
+        α0s = np.radians([airfoil_db[airfoil].alpha0 for airfoil in batch.airfoils])
+
+        self.dcls = _batch_interp(abs_ys, batch.ys, np.broadcast_to(dcls, batch.ys.shape))
+        self._α0s = α0s
+
+        self.Bb, = influence_cache.get(('Bb',) + _grid_key(self.θs),
+                                       lambda: _readonly((_multhop_matrix(self.θs),)))
+        self.Bd = 2*self.span[:, np.newaxis]/(self.dcls*self.chords)
+
+        self._B = self.Bb + self.Bd[:, :, np.newaxis]*np.eye(M)
+
+    def _base_αs(self):
+        # geometric and aerodynamic twist
+        αs = np.radians(self.batch.twists) - self._α0s
+        return _batch_interp(np.abs(self.ys), self.batch.ys, αs)
+
+    def _aoa_αs(self, α):
+        return np.full_like(self.ys, α)
+
+    def _solve_linear(self, αs):
+        """Solve multhopp systems of all wings
+
+        Parameters
+        ----------
+        αs : np.ndarray
+            angles of attack (N, M) or (N, K, M) for K cases per wing
+
+        Returns
+        -------
+        MulthopBatchResult
+            results, distributions (N, M) or (N, K, M)
+        """
+
+        αs = np.asarray(αs, dtype=float)
+        single = αs.ndim == 2
+
+        rhs = αs[:, :, np.newaxis] if single else np.swapaxes(αs, 1, 2)
+
+        γs = np.swapaxes(np.linalg.solve(self._B, rhs), 1, 2)
+        α_is = γs@self.Bb.T
+
+        if single:
+            γs, α_is = γs[:, 0], α_is[:, 0]
+
+        M = len(self.θs)
+        b = self.span.reshape((-1,) + (1,)*(γs.ndim-1))
+        Λ = (self.span**2/self.area).reshape(b.shape[:-1])
+
+        sinθs = np.sin(self.θs)
+        chords = self.chords if single else self.chords[:, np.newaxis]
+
+        c_ls = 2*b/chords * γs
+        C_L = π*Λ/(M+1) * np.sum(γs*sinθs, axis=-1)
+        C_Di = π*Λ/(M+1) * np.sum(γs*α_is*sinθs, axis=-1)
+
+        return MulthopBatchResult(self.ys, c_ls, α_is, C_L, C_Di, γs)
+
+    def baselift(self):
+        return self._solve_linear(self._base_αs())
+
+    def aoa(self, α):
+        return self._solve_linear(self._aoa_αs(α))
+
+    def liftbases(self):
+        """Calculate base and angle of attack (1 rad) lift distributions
+
+        Returns
+        -------
+        tuple
+            base and aoa results of all wings
+        """
+
+        res = self._solve_linear(np.stack([self._base_αs(), self._aoa_αs(1.0)], axis=1))
+
+        base = MulthopBatchResult._from_data(self.ys, res._data[:, 0])
+        aoa = MulthopBatchResult._from_data(self.ys, res._data[:, 1])
 
+        return base, aoa
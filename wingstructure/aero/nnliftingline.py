@@ -1,110 +1,259 @@
+"""Module providing a nonlinear lifting line method
+
+The multhopp equation system is solved with the lift curves of the
+airfoil polars instead of a constant lift slope, which allows lift
+estimates beyond stall.
+"""
+
+from collections import namedtuple, defaultdict
+
 import numpy as np
+from scipy.linalg import lu_factor, lu_solve
 
-def nonlinearLL(a, c_li, y_li, airfoil_li, v_inf, polars, max_iter=200):
-    """ Nichtlineares Iterationsverfahren zur Bestimmung der Auftriebsverteilung.
-    Erlaubt die direkte Verwendung von Profilpolaren.
-    :param a: Anstellwinkel
-    :param c_li: Profiltiefen
-    :param y_li: Spannweitenpositionen
-    :param airfoil_li: Profile
-    :param v_inf: Anströmgeschwindigkeit
-    :param polars: Polaren für die angegebenen Profile
-    :param max_iter: Maximale Anzahl an Iterationen
-    :return: """
-      
-    # Geometriegrößen bestimmen  
-    S = PlaneGeom2.calcWingSRef(c_li, y_li)    # Flügelfläche
-    b = PlaneGeom2.calcWingBRef(y_li)         # Spannweite
-    AR = b**2/S                          # Streckung
-
-    # Stützstellen auf Spannweite verteilt
-    y_ar = np.array(y_li)
-
-    # Stützstellen Profiltiefe
-    c_ar = np.array(c_li)
-    
-    # Elliptische Auftriebsverteilung als Startwert für Zirkulationsverteilung
-
-    theta_0 = 0  # werden hier zu hohe Werte definiert werden seltsame Lösungen gefunden
-    
-    theta_ar = theta_0*np.sqrt(1-(2*y_ar/b)**2)
-    
-    # Durchführen der Iterationen
-    
-    convergence = 0
-    iteration = 0
-
-    # Nachdem über 5 Iterationen Konvergenzkriterium erreicht wurde oder
-    # anzahl maximaler Iterationen erreicht wurde abbrechen
-    while convergence < 5 and iteration < max_iter:
-
-        theta_neu = np.zeros(theta_ar.shape)
-
-        # Schleife über Spannweitenpositionen zur Bestimmung der Ableitung
-        dThetady = np.zeros(y_ar.shape)
-        for jj, y2 in enumerate(y_ar):
-            if jj == 0:
-                # Vorwärtsdifferenzenquotient
-                dThetady[jj] = (theta_ar[1]-theta_ar[0])/(y_ar[1]-y_ar[0])
-            elif jj == len(y_ar)-1:
-                # Rückwärtsdifferenzenquotient
-                dThetady[jj] = (theta_ar[-1]-theta_ar[-2])/(y_ar[-1]-y_ar[-2])
-            else:
-                # zentraler Differenzenquotient 1. Ordnung
-                dThetady[jj] = (theta_ar[jj+1]-theta_ar[jj-1])/(y_ar[jj+1]-y_ar[jj-1])
+from .multhop import (Multhop, AirfoilData, _multhop_result, _interp_matrix,
+                      _calc_gridpoints)
 
-        # Schleife über Spannweitenpositionen
-        for ii, y in enumerate(y_ar):
-            # Berechnung der induzierten Anstellwinkel
 
-            deltay = y-y_ar
+ConvergenceReport = namedtuple('ConvergenceReport', ('converged', 'iterations', 'residual'))
 
-            if ii == 0:
-                deltay[0] = deltay[1]
-            elif ii == len(y_ar)-1:
-                deltay[-1] = deltay[-2]
-            else:
-                deltay[ii] = 0.5*(deltay[ii-1]+deltay[ii+1])
 
-            integrand = dThetady/deltay
+class NonlinearMulthop(Multhop):
+    """Multhop calculator using the lift curves of the airfoil database
+
+    The circulation γ is determined with a damped newton iteration for
+    the residual 2b/c γ - c_l(α + α_0 - α_i(γ)), starting from the linear
+    multhop solution. The airfoil database entries need to provide
+    c_l(α) and dc_l(α) like AirfoilData and AirfoilPolar.
+
+    Parameters
+    ----------
+    wing : Wing
+        wing object
+    ys : array
+        span positions of grid points
+    airfoil_db : dict
+        airfoil data for every airfoil of the wing
+    tol : float, optional
+        tolerance for lift coefficient residual, by default 1e-8
+    max_iter : int, optional
+        maximum number of newton iterations, by default 50
+    relaxation : float, optional
+        relaxation factor of fixed point steps, used where newton
+        steps do not decrease the residual, by default 0.2
+    reynolds : float or array, optional
+        reynolds number (for every grid point), by default None
+        (reference reynolds number of polars)
+    """
+
+    nonlinear = True
+
+    def __init__(self, wing, ys, airfoil_db, tol:float=1e-8, max_iter:int=50,
+                 relaxation:float=0.2, reynolds=None):
+        super().__init__(wing, ys, airfoil_db)
+
+        self.reynolds = reynolds
+
+        self.tol = tol
+        self.max_iter = max_iter
+        self.relaxation = relaxation
+        self.report = None
+
+        # zero lift angles are part of the polars, the linear αs are relative to them
+        α0s = np.radians([airfoil_db[airfoil].alpha0 for airfoil in wing.airfoils])
+        self._α0s = np.interp(np.abs(ys), wing.ys, α0s)
+
+        # lift curves between sections are blended linearly
+        names = sorted(set(wing.airfoils))
+        indicator = np.array([[airfoil == name for name in names] for airfoil in wing.airfoils],
+                             dtype=float)
+
+        self._airfoils = [airfoil_db[name] for name in names]
+        self._weights = (_interp_matrix(np.abs(ys), wing.ys) @ indicator).T
+
+    def _c_l(self, α_effs):
+        return sum(w * airfoil.c_l(α_effs, self.reynolds)
+                   for w, airfoil in zip(self._weights, self._airfoils))
+
+    def _dc_l(self, α_effs):
+        return sum(w * airfoil.dc_l(α_effs, self.reynolds)
+                   for w, airfoil in zip(self._weights, self._airfoils))
+
+    def _multhop(self, αs):
+        result, self.report = self.solve(αs)
+        return result
+
+    def gradients(self, αs):
+        """Derivatives of lift results regarding section twists and chords
+
+        Like Multhop.gradients for the converged nonlinear solution, the
+        adjoint system uses the newton jacobian diag(2b/c) + diag(dc_l) Bb
+        of the residual.
+
+        Parameters
+        ----------
+        αs : np.ndarray
+            angle of attack distribution relative to zero lift angle at
+            grid points (M,)
+
+        Returns
+        -------
+        dict
+            derivatives of C_L, C_Di, C_Mx (N,) and c_ls (M, N), see
+            Multhop.gradients
+
+        Raises
+        ------
+        ValueError
+            if the nonlinear solution does not converge
+        """
+
+        result, report = self.solve(np.asarray(αs, dtype=float))
+
+        if not report.converged:
+            raise ValueError('Nonlinear lifting line solution did not converge, '
+                             'gradients are not available!')
+
+        γs, α_is = result.γs, result.α_is
+
+        fac = 2*self.wing.span/self.chords
+        dc_ls = self._dc_l(αs + self._α0s - α_is)
+
+        J = np.diag(fac) + dc_ls[:, np.newaxis] * self.system.Bb
+        lu = lu_factor(J)
+
+        # partial derivatives of negative residual c_l(α + α_0 - α_i) - 2b/c γ
+        W = _interp_matrix(np.abs(self.ys), self.wing.ys)
+
+        R_twist = dc_ls[:, np.newaxis] * np.radians(W)
+        R_chord = (fac*γs/self.chords)[:, np.newaxis]*W
+        R_α = np.radians(dc_ls)[:, np.newaxis]
+
+        def adjoint(rhs):
+            return lu_solve(lu, rhs, trans=1)
+
+        return self._adjoint_gradients(γs, α_is, adjoint, W, R_twist, R_chord, R_α)
+
+    def solve(self, αs):
+        """Solve nonlinear lifting line problem
+
+        Parameters
+        ----------
+        αs : array
+            angles of attack relative to zero lift angle, (M,) or (K, M)
+
+        Returns
+        -------
+        tuple
+            MulthopResult (or MulthopBatchResult) and ConvergenceReport
+        """
+
+        αs = np.asarray(αs, dtype=float)
+        αs_2d = np.atleast_2d(αs)
+
+        b = self.wing.span
+        Bb = self.system.Bb
+        fac = 2*b/self.chords
+
+        def residual(γs, αs_):
+            α_effs = αs_ + self._α0s - γs@Bb.T
+            return fac*γs - self._c_l(α_effs), α_effs
+
+        # linear solution as starting point
+        γs, _ = self.system.solve(αs_2d)
+
+        R, α_effs = residual(γs, αs_2d)
+        norm = np.linalg.norm(R, axis=1)
+
+        iteration = 0
+
+        while iteration < self.max_iter:
+            active = norm > self.tol
+
+            if not active.any():
+                break
+
+            iteration += 1
+
+            γs_act, αs_act = γs[active], αs_2d[active]
+
+            J = np.diag(fac) + self._dc_l(α_effs[active])[:, :, np.newaxis] * Bb
+
+            try:
+                Δγs = np.linalg.solve(J, -R[active][:, :, np.newaxis])[:, :, 0]
+            except np.linalg.LinAlgError:
+                # damped fixed point iteration as fall back
+                Δγs = -self.relaxation * R[active]/fac
+
+            # backtracking, halve step until residual decreases
+            λ = np.ones(len(Δγs))
+
+            for _ in range(10):
+                γs_try = γs_act + λ[:, np.newaxis]*Δγs
+                R_try, α_try = residual(γs_try, αs_act)
+                norm_try = np.linalg.norm(R_try, axis=1)
+
+                worse = norm_try >= norm[active]
+
+                if not worse.any():
+                    break
 
-            if ii == 0:
-                integrand[0] = integrand[1]
-            elif ii == len(y_ar)-1:
-                integrand[-1] = integrand[-2]
+                λ = np.where(worse, λ/2, λ)
             else:
-                integrand[ii] = 0.5*(integrand[ii-1]+integrand[ii+1])
+                # no descent along newton direction, damped fixed point step
+                Δγs_fp = -self.relaxation * R[active]/fac
+                γs_try[worse] = γs_act[worse] + Δγs_fp[worse]
+                R_try, α_try = residual(γs_try, αs_act)
+                norm_try = np.linalg.norm(R_try, axis=1)
 
-            a_ind = 1 / (4 * np.pi * v_inf) * integrate.simps(integrand, y_ar)
-            
-            a_eff = a - a_ind
+            γs[active], R[active], α_effs[active], norm[active] = γs_try, R_try, α_try, norm_try
 
-            #TODO: Re berechnen
-            re = 0
+        α_is = γs@Bb.T
 
-            c_l,c_w = polars.interpolate(airfoil_li[ii],re,a_eff)
+        result = _multhop_result(self.ys, self.system.θs, γs, α_is, self.chords,
+                                 self.wing.area, b)
 
-            theta_neu[ii] = 0.5 * v_inf * c_li[ii] * c_l
+        report = ConvergenceReport(norm <= self.tol, iteration, norm)
 
-        # Randbedingungen setzen (ohne geht nix..)
-        theta_neu[0] = theta_neu[-1] = 0
+        if αs.ndim == 1:
+            return result[0], ConvergenceReport(report.converged[0], iteration, norm[0])
 
+        return result, report
 
-        theta_d = 0.05*(theta_neu - theta_ar)
 
-        if all(theta_d < 1e-5):
-            convergence += 1
-        elif convergence > 1:
-            convergence = 0
+def nonlinearLL(wing, α:float, airfoil_db=defaultdict(AirfoilData), M:int=None,
+                tol:float=1e-8, max_iter:int=50, reynolds=None):
+    """Calculate lift distribution with lift curves of airfoil polars
 
-        theta_ar += theta_d
+    Parameters
+    ----------
+    wing : Wing
+        wing object
+    α : float
+        angle of attack in degrees
+    airfoil_db : dict, optional
+        airfoil data, e.g. AirfoilPolar objects, by default defaultdict(AirfoilData)
+    M : int, optional
+        number of grid points, by default None
+    tol : float, optional
+        tolerance for lift coefficient residual, by default 1e-8
+    max_iter : int, optional
+        maximum number of newton iterations, by default 50
+    reynolds : float or array, optional
+        reynolds number (for every grid point), by default None
 
-        iteration += 1
+    Returns
+    -------
+    dict
+        results (c_ls, a_is, ys, chords, C_L, C_Di, report)
+    """
 
-        print('Iteration {}, Convergence {}'.format(iteration, convergence))
+    ys = _calc_gridpoints(wing, M)
+    ys[len(ys)//2] = 0.0
 
-    c_l = 2 / v_inf * theta_ar/c_ar
+    solver = NonlinearMulthop(wing, ys, airfoil_db, tol=tol, max_iter=max_iter,
+                              reynolds=reynolds)
 
-    c_L = 2*integrate.simps(c_ar*c_l,y_ar)/S
+    res = solver._multhop(solver._base_αs() + np.radians(α))
 
-    return {'Theta':theta_ar,'C_L':c_L,'c_l':c_l}
+    return {'c_ls': res.c_ls, 'a_is': res.α_is, 'ys': ys, 'chords': solver.chords,
+            'C_L': res.C_L, 'C_Di': res.C_Di, 'report': solver.report}
@@ -0,0 +1,198 @@
+"""Module providing twist optimization for minimum induced drag
+
+The circulation of the multhopp method depends linearly on the section
+twists, the induced drag is a quadratic form of the circulation. Thus
+the twist distribution with minimum induced drag for a given lift
+coefficient is the solution of a small quadratic program.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+from numpy import pi as π
+from scipy.linalg import lu_solve
+
+from .multhop import Multhop, AirfoilData, _calc_gridpoints, _interp_matrix
+
+
+def _kkt_solve(Q, q, A, b):
+    """minimize 1/2 x Q x + q x subject to A x = b"""
+
+    n, m = len(q), len(b)
+
+    KKT = np.block([[Q, A.T], [A, np.zeros((m, m))]])
+    solution = np.linalg.lstsq(KKT, np.concatenate([-q, b]), rcond=None)[0]
+
+    return solution[:n], solution[n:]
+
+
+def _solve_qp(Q, q, A_eq, b_eq, A_ub, b_ub, names=None, max_iter:int=100):
+    """Solve convex quadratic program with an active set method
+
+    Violated inequality constraints are added to the equality constraints
+    one after another, constraints with negative multipliers are released.
+    Without violated constraints the KKT solution is returned directly.
+    Active constraints which cannot be satisfied together are reported
+    with their names.
+    """
+
+    if names is None:
+        names = [f'inequality constraint {i}' for i in range(len(b_ub))]
+
+    active = []
+
+    tol = 1e-10*np.maximum(1.0, np.abs(b_ub))
+
+    for _ in range(max_iter):
+        A = np.vstack([A_eq, A_ub[active]])
+        b = np.concatenate([b_eq, b_ub[active]])
+
+        x, μ = _kkt_solve(Q, q, A, b)
+
+        if not np.allclose(A@x, b, rtol=1e-8, atol=1e-8):
+            conflicting = ', '.join(names[i] for i in active)
+            raise ValueError(f'Constraints are infeasible, conflicting: {conflicting}!')
+
+        μ_ub = μ[len(b_eq):]
+
+        if len(active) > 0 and μ_ub.min() < 0.0:
+            active.pop(int(np.argmin(μ_ub)))
+            continue
+
+        violation = A_ub@x - b_ub - tol
+        violation[active] = 0.0
+
+        if len(violation) == 0 or violation.max() <= 0.0:
+            return x
+
+        active.append(int(np.argmax(violation)))
+
+    raise ValueError('Twist optimization did not converge, check constraints!')
+
+
+def optimize_twist(wing, C_L:float, constraints:dict={}, M:int=None,
+                   airfoil_db:dict=defaultdict(AirfoilData)):
+    """Calculate section twists with minimum induced drag
+
+    The twists of the wing sections and the angle of attack are the
+    design variables. Without inequality constraints the optimum is
+    found by solving the KKT equation system directly.
+
+    Parameters
+    ----------
+    wing : Wing
+        a wing object, its twists are not changed
+    C_L : float
+        target lift coefficient
+    constraints : dict, optional
+        'fixed': dict of section index and twist in degrees, by default
+        the root section keeps its twist ({0: wing.twists[0]}),
+        'bounds': tuple of lower and upper twist bounds in degrees
+        (scalars or arrays for every section),
+        'root_bending': maximum root bending moment coefficient of right
+        wing half (C_Mb as in adaptive_gridsize), by default {}
+    M : int, optional
+        number of grid points, by default None
+    airfoil_db : dict, optional
+        airfoil data, by default defaultdict(AirfoilData)
+
+    Returns
+    -------
+    dict
+        optimized twists (degrees), angle of attack (degrees), C_Di,
+        C_L, C_Mb as well as lift distribution (ys, c_ls)
+    """
+
+    ys = _calc_gridpoints(wing, M)
+    ys[len(ys)//2] = 0.0
+
+    calculator = Multhop(wing, ys, airfoil_db)
+    system = calculator.system
+
+    b = wing.span
+    S = wing.area
+    Λ = b**2/S
+
+    N = len(wing.sections)
+    M = len(ys)
+
+    sinθs = np.sin(system.θs)
+    cosθs = np.cos(system.θs)
+    fac = π*Λ/(M+1)
+
+    # circulation is linear in design variables x = (twists, α): γ = G x + γ_0
+    W = _interp_matrix(np.abs(ys), wing.ys)
+
+    α0s = np.radians([airfoil_db[airfoil].alpha0 for airfoil in wing.airfoils])
+
+    G = lu_solve(system.lu, np.column_stack([np.radians(W), np.full(M, np.radians(1.0))]))
+    γ_0 = lu_solve(system.lu, -W@α0s)
+
+    # quadratic form of induced drag and linear forms of lift and root bending
+    H = fac*(sinθs[:, np.newaxis]*system.Bb)
+    H = H + H.T
+
+    Q = G.T@H@G
+    q = G.T@H@γ_0
+
+    a_L = fac*sinθs
+    a_Mb = fac*np.where(system.θs > π/2, -cosθs*sinθs, 0.0)
+
+    # equality constraints: lift coefficient and fixed twists
+    fixed = constraints.get('fixed', {0: wing.twists[0]})
+
+    A_eq = [a_L@G]
+    b_eq = [C_L - a_L@γ_0]
+
+    for idx, twist in fixed.items():
+        row = np.zeros(N+1)
+        row[idx] = 1.0
+        A_eq.append(row)
+        b_eq.append(twist)
+
+    A_eq = np.array(A_eq)
+    b_eq = np.array(b_eq)
+
+    if not np.allclose(A_eq@np.linalg.lstsq(A_eq, b_eq, rcond=None)[0], b_eq):
+        raise ValueError('Fixed twists do not allow target lift coefficient!')
+
+    # inequality constraints A_ub x <= b_ub
+    A_ub = [np.zeros((0, N+1))]
+    b_ub = [np.zeros(0)]
+    names = []
+
+    if 'bounds' in constraints:
+        lower, upper = constraints['bounds']
+
+        lower = np.broadcast_to(np.asarray(lower, dtype=float), (N,))
+        upper = np.broadcast_to(np.asarray(upper, dtype=float), (N,))
+
+        for idx in range(N):
+            if lower[idx] > upper[idx]:
+                raise ValueError(f'Lower twist bound of section {idx} ({lower[idx]}) '
+                                 f'exceeds upper bound ({upper[idx]})!')
+
+        for idx, twist in fixed.items():
+            if not lower[idx] <= twist <= upper[idx]:
+                raise ValueError(f'Fixed twist of section {idx} ({twist}) is outside of '
+                                 f'bounds ({lower[idx]}, {upper[idx]})!')
+
+        I = np.eye(N, N+1)
+
+        A_ub += [-I, I]
+        b_ub += [-lower, upper]
+        names += [f'lower bound of section {idx}' for idx in range(N)]
+        names += [f'upper bound of section {idx}' for idx in range(N)]
+
+    if 'root_bending' in constraints:
+        A_ub.append((a_Mb@G)[np.newaxis])
+        b_ub.append([constraints['root_bending'] - a_Mb@γ_0])
+        names.append('root_bending')
+
+    x = _solve_qp(Q, q, A_eq, b_eq, np.vstack(A_ub), np.concatenate(b_ub), names)
+
+    γs = G@x + γ_0
+    α_is = γs@system.Bb.T
+
+    return {'twists': x[:N], 'alpha': x[N], 'C_Di': fac*np.sum(γs*α_is*sinθs),
+            'C_L': a_L@γs, 'C_Mb': a_Mb@γs, 'ys': ys, 'c_ls': 2*b/calculator.chords*γs}
@@ -0,0 +1,427 @@
+"""Module providing tabulated airfoil polars
+"""
+
+import os
+import re
+
+import numpy as np
+
+from .multhop import AirfoilData
+from ..data import arrayfile
+
+
+class AirfoilPolar(AirfoilData):
+    """Airfoil data based on tabulated polars
+
+    Coefficients are tabulated over angle of attack and optionally over
+    reynolds number and interpolated bilinearly, beyond the tabulated
+    range values are held constant. Zero lift angle and lift slope are
+    determined from the linear part of the lift curve at the reference
+    reynolds number, so the object can be used in place of AirfoilData.
+
+    Parameters
+    ----------
+    alphas : array
+        angles of attack in degrees (ascending)
+    c_ls : array
+        lift coefficients (n_α,) or (n_Re, n_α)
+    c_ds : array, optional
+        drag coefficients, by default None
+    c_ms : array, optional
+        moment coefficients, by default None
+    reynolds : array, optional
+        reynolds numbers of table rows (ascending), by default None
+    linear_range : tuple, optional
+        range of angles of attack (degrees) used to determine
+        zero lift angle and lift slope, by default (-5.0, 5.0)
+    reference_re : float, optional
+        reynolds number for zero lift angle, lift slope and c_m0,
+        by default middle row of table
+    """
+
+    def __init__(self, alphas, c_ls, c_ds=None, c_ms=None, reynolds=None,
+                 linear_range=(-5.0, 5.0), reference_re=None):
+
+        self.alphas = np.ascontiguousarray(alphas, dtype=float)
+        self.c_ls = self._table(c_ls)
+        self.c_ds = None if c_ds is None else self._table(c_ds)
+        self.c_ms = None if c_ms is None else self._table(c_ms)
+
+        n_Re = self.c_ls.shape[0]
+
+        if reynolds is None:
+            if n_Re > 1:
+                raise ValueError('reynolds numbers are needed for multiple table rows!')
+            reynolds = [0.0]
+
+        self.reynolds = np.ascontiguousarray(reynolds, dtype=float)
+
+        if self.reynolds.shape != (n_Re,):
+            raise ValueError('number of reynolds numbers and table rows differ!')
+
+        # lift slopes of linearly interpolated segments (1/rad)
+        self._dc_ls = np.diff(self.c_ls, axis=1)/np.diff(np.radians(self.alphas))
+
+        # linear lift curve at reference reynolds number
+        if reference_re is None:
+            reference_re = self.reynolds[n_Re//2]
+
+        self.reference_re = reference_re
+
+        ref_alphas = np.radians(self.alphas)
+        ref_c_ls = self.c_l(ref_alphas, reference_re)
+
+        inrange = (linear_range[0] <= self.alphas) & (self.alphas <= linear_range[1])
+
+        if inrange.sum() < 2:
+            inrange = np.full_like(inrange, True)
+
+        slope, offset = np.polyfit(ref_alphas[inrange], ref_c_ls[inrange], 1)
+
+        c_m0 = 0.0 if self.c_ms is None else float(self.c_m(0.0, reference_re))
+
+        super().__init__(alpha0=np.degrees(-offset/slope), dif_ca_alpha=slope, c_m0=c_m0)
+
+    def _table(self, values):
+        # keep memory-mapped tables without copying them
+        table = np.atleast_2d(np.asanyarray(values, dtype=float))
+
+        if not table.flags.c_contiguous:
+            table = np.ascontiguousarray(table)
+
+        if table.shape[1] != len(self.alphas):
+            raise ValueError('tables need one column per angle of attack!')
+
+        return table
+
+    def _weights(self, α, Re):
+        """indices and weights for bilinear interpolation"""
+
+        α_deg = np.degrees(α)
+
+        ia = np.clip(np.searchsorted(self.alphas, α_deg, side='right')-1, 0, len(self.alphas)-2)
+        ta = np.clip((α_deg - self.alphas[ia])/(self.alphas[ia+1] - self.alphas[ia]), 0.0, 1.0)
+
+        if len(self.reynolds) == 1:
+            ir = np.zeros_like(ia)
+            tr = np.zeros_like(ta)
+        else:
+            Re = self.reference_re if Re is None else Re
+            Re = np.broadcast_to(Re, np.broadcast(α_deg, Re).shape)
+            ir = np.clip(np.searchsorted(self.reynolds, Re, side='right')-1, 0,
+                         len(self.reynolds)-2)
+            tr = np.clip((Re - self.reynolds[ir])/(self.reynolds[ir+1] - self.reynolds[ir]),
+                         0.0, 1.0)
+            ia, ta = np.broadcast_arrays(ia, ta, ir)[:2]
+
+        return ia, ta, ir, tr
+
+    def _interp(self, table, α, Re):
+        ia, ta, ir, tr = self._weights(α, Re)
+
+        ir1 = np.minimum(ir+1, len(self.reynolds)-1)
+
+        low = (1-ta)*table[ir, ia] + ta*table[ir, ia+1]
+        high = (1-ta)*table[ir1, ia] + ta*table[ir1, ia+1]
+
+        return (1-tr)*low + tr*high
+
+    def c_l(self, α, Re=None):
+        """lift coefficient for angle of attack α (rad) and reynolds number"""
+        return self._interp(self.c_ls, α, Re)
+
+    def dc_l(self, α, Re=None):
+        """lift coefficient slope (1/rad) at angle of attack α (rad)"""
+
+        ia, _, ir, tr = self._weights(α, Re)
+
+        ir1 = np.minimum(ir+1, len(self.reynolds)-1)
+
+        slope = (1-tr)*self._dc_ls[ir, ia] + tr*self._dc_ls[ir1, ia]
+
+        α_deg = np.degrees(α)
+        inside = (self.alphas[0] <= α_deg) & (α_deg <= self.alphas[-1])
+
+        return np.where(inside, slope, 0.0)
+
+    def c_d(self, α, Re=None):
+        """drag coefficient for angle of attack α (rad) and reynolds number"""
+        if self.c_ds is None:
+            raise ValueError('no drag coefficients given for polar!')
+        return self._interp(self.c_ds, α, Re)
+
+    def c_m(self, α, Re=None):
+        """moment coefficient for angle of attack α (rad) and reynolds number"""
+        if self.c_ms is None:
+            raise ValueError('no moment coefficients given for polar!')
+        return self._interp(self.c_ms, α, Re)
+
+
+def read_xfoil(filename):
+    """Read polar file written by XFOIL
+
+    Returns
+    -------
+    tuple
+        reynolds number and array with columns alpha, CL, CD, CDp, CM, ...
+    """
+
+    Re = None
+    rows = []
+    intable = False
+
+    with open(filename, 'r') as datfile:
+        for line in datfile:
+            match = re.search(r'Re\s*=\s*([\d.]+)\s*e\s*(\d+)', line)
+            if match:
+                Re = float(match.group(1)) * 10**int(match.group(2))
+
+            if line.strip().startswith('---'):
+                intable = True
+                continue
+
+            if intable and line.strip():
+                rows.append([float(value) for value in line.split()])
+
+    if Re is None or not rows:
+        raise ValueError(f'{filename} is not a valid XFOIL polar file!')
+
+    return Re, np.array(rows)
+
+
+class PolarDatabase:
+    """Collection of tabulated airfoil polars
+
+    Polars can be added for several reynolds numbers per airfoil, they
+    are resampled to a common angle of attack grid per airfoil and stored
+    as contiguous (n_Re, n_α) tables. The database can be saved to a binary
+    file and memory-mapped from it. It can be used as airfoil_db for lift
+    calculations.
+
+    Parameters
+    ----------
+    default : AirfoilData, optional
+        airfoil data returned for unknown airfoils, by default None
+    """
+
+    def __init__(self, default:AirfoilData=None):
+        self.default = default
+        self.sources = None
+
+        self._polars = {}
+        self._raw = {}
+
+    def add_polar(self, name:str, Re:float, alphas, c_ls, c_ds=None, c_ms=None):
+        """Add polar of airfoil for one reynolds number
+
+        Parameters
+        ----------
+        name : str
+            airfoil name
+        Re : float
+            reynolds number
+        alphas : array
+            angles of attack in degrees
+        c_ls : array
+            lift coefficients
+        c_ds : array, optional
+            drag coefficients, by default zeros
+        c_ms : array, optional
+            moment coefficients, by default zeros
+        """
+
+        alphas = np.asarray(alphas, dtype=float)
+        order = np.argsort(alphas)
+
+        def sort(values):
+            values = np.zeros_like(alphas) if values is None else np.asarray(values, dtype=float)
+            return values[order]
+
+        self._raw.setdefault(name, {})[float(Re)] = (
+            alphas[order], sort(c_ls), sort(c_ds), sort(c_ms)
+        )
+
+        self._polars.pop(name, None)
+
+    def load_xfoil(self, name:str, filename:str):
+        """Add polar from XFOIL polar file"""
+
+        Re, table = read_xfoil(filename)
+
+        self.add_polar(name, Re, table[:, 0], table[:, 1], table[:, 2], table[:, 4])
+
+    def _build(self, name):
+        raw = self._raw[name]
+
+        reynolds = sorted(raw.keys())
+
+        # common grid within range covered by all polars
+        alpha_min = max(raw[Re][0][0] for Re in reynolds)
+        alpha_max = min(raw[Re][0][-1] for Re in reynolds)
+
+        alphas = np.unique(np.concatenate([raw[Re][0] for Re in reynolds]))
+        alphas = alphas[(alpha_min <= alphas) & (alphas <= alpha_max)]
+
+        tables = [
+            np.array([np.interp(alphas, raw[Re][0], raw[Re][i]) for Re in reynolds])
+            for i in (1, 2, 3)
+        ]
+
+        return AirfoilPolar(alphas, *tables, reynolds=reynolds)
+
+    def __getitem__(self, name):
+        try:
+            return self._polars[name]
+        except KeyError:
+            pass
+
+        if name in self._raw:
+            self._polars[name] = self._build(name)
+            return self._polars[name]
+
+        if self.default is not None:
+            return self.default
+
+        raise KeyError(f'no polar for airfoil {name} in database!')
+
+    def __contains__(self, name):
+        return name in self._polars or name in self._raw
+
+    def keys(self):
+        return sorted(set(self._polars) | set(self._raw))
+
+    def interpolate(self, airfoils, α, Re=None):
+        """Interpolate coefficients for all span stations and load cases at once
+
+        Parameters
+        ----------
+        airfoils : sequence
+            airfoil name for each span station (M,)
+        α : array
+            angles of attack in radians (M,) or (K, M)
+        Re : float or array, optional
+            reynolds numbers broadcastable to α, by default reference values
+
+        Returns
+        -------
+        tuple
+            lift, drag and moment coefficients with shape of α
+        """
+
+        airfoils = np.asarray(airfoils)
+        α = np.asarray(α, dtype=float)
+
+        Re = None if Re is None else np.broadcast_to(Re, α.shape)
+
+        c_ls, c_ds, c_ms = (np.zeros(α.shape) for _ in range(3))
+
+        for name in np.unique(airfoils):
+            station = np.broadcast_to(airfoils == name, α.shape)
+            polar = self[name]
+
+            α_ = α[station]
+            Re_ = None if Re is None else Re[station]
+
+            c_ls[station] = polar.c_l(α_, Re_)
+
+            if isinstance(polar, AirfoilPolar):
+                c_ds[station] = polar.c_d(α_, Re_)
+                c_ms[station] = polar.c_m(α_, Re_)
+            else:
+                c_ms[station] = polar.c_m0
+
+        return c_ls, c_ds, c_ms
+
+    def save(self, filename:str, sources:dict=None):
+        """Save tables to binary file
+
+        Parameters
+        ----------
+        filename : str
+            path of file
+        sources : dict, optional
+            description of source files, stored to check validity of caches
+        """
+
+        arrays = {}
+
+        for i, name in enumerate(self.keys()):
+            polar = self[name]
+            arrays[f'{i}/alphas'] = polar.alphas
+            arrays[f'{i}/reynolds'] = polar.reynolds
+            arrays[f'{i}/c_ls'] = polar.c_ls
+            arrays[f'{i}/c_ds'] = polar.c_ds
+            arrays[f'{i}/c_ms'] = polar.c_ms
+
+        meta = {'type': 'PolarDatabase', 'airfoils': self.keys(), 'sources': sources}
+
+        arrayfile.write_arrays(filename, arrays, meta)
+
+    @classmethod
+    def load(cls, filename:str, mmap:bool=True, default:AirfoilData=None):
+        """Load tables from binary file
+
+        Parameters
+        ----------
+        filename : str
+            path of file
+        mmap : bool, optional
+            memory-map tables instead of reading them, by default True
+        default : AirfoilData, optional
+            airfoil data returned for unknown airfoils, by default None
+        """
+
+        arrays, meta = arrayfile.read_arrays(filename, mmap=mmap)
+
+        if meta.get('type') != 'PolarDatabase':
+            raise ValueError(f'{filename} does not contain a polar database!')
+
+        database = cls(default)
+
+        for i, name in enumerate(meta['airfoils']):
+            database._polars[name] = AirfoilPolar(
+                arrays[f'{i}/alphas'], arrays[f'{i}/c_ls'], arrays[f'{i}/c_ds'],
+                arrays[f'{i}/c_ms'], reynolds=arrays[f'{i}/reynolds'])
+
+        database.sources = meta.get('sources')
+
+        return database
+
+    @classmethod
+    def from_xfoil(cls, files:dict, cache:str=None, default:AirfoilData=None):
+        """Create database from XFOIL polar files
+
+        Parameters
+        ----------
+        files : dict
+            list of polar files (one per reynolds number) by airfoil name
+        cache : str, optional
+            binary cache file, it is used if the source files did not
+            change and rewritten otherwise, by default None
+        default : AirfoilData, optional
+            airfoil data returned for unknown airfoils, by default None
+        """
+
+        sources = {name: [[os.path.abspath(filename), os.path.getmtime(filename),
+                           os.path.getsize(filename)] for filename in filenames]
+                   for name, filenames in files.items()}
+
+        if cache is not None and os.path.exists(cache):
+            try:
+                database = cls.load(cache, default=default)
+            except ValueError:
+                pass
+            else:
+                if database.sources == sources:
+                    return database
+
+        database = cls(default)
+
+        for name, filenames in files.items():
+            for filename in filenames:
+                database.load_xfoil(name, filename)
+
+        if cache is not None:
+            database.save(cache, sources)
+
+        return database
@@ -0,0 +1,110 @@
+"""Module providing stability derivatives of wings
+
+Roll damping, aileron effectiveness and lift curve slope are derived
+from linear lift distributions. Besides the symmetric angle of attack
+distribution an antisymmetric roll rate distribution (αs ∝ y) is used.
+All distributions are calculated once and reused for every flap setting.
+"""
+
+from collections import defaultdict
+
+import numpy as np
+
+from .multhop import AirfoilData, _calc_gridpoints, _calc_eta_eff
+from .liftingline import _calculator_dict
+
+
+_table_dtype = np.dtype([('flap', float), ('C_L_0', float), ('C_L_α', float),
+                         ('C_l_p', float), ('C_l_δa', float)])
+
+
+def _deta_eff(η_k):
+    """derivative of effective deflection regarding deflection (radians)"""
+    return 22.743 * 0.04715/(1 + (0.04715 * η_k)**2)
+
+
+def stability_table(wing, flap_settings=(0.0,), aileron:str='aileron', flaps=(),
+                    coupled:bool=True, M:int=None, method:str='multhop',
+                    airfoil_db:dict=defaultdict(AirfoilData)):
+    """Calculate stability derivatives for several flap settings
+
+    Roll moments use body axes, positive C_l turns the right wing down.
+    The roll rate is normalized as p̂ = p b/(2V), a positive aileron
+    deflection δa deflects the right aileron trailing edge up and the
+    left one down.
+
+    Parameters
+    ----------
+    wing : Wing
+        a wing object
+    flap_settings : array, optional
+        flap deflections in degrees, by default (0.0,)
+    aileron : str, optional
+        name of aileron control surface, by default 'aileron'
+    flaps : tuple, optional
+        names of control surfaces deflected symmetrically with flap
+        setting, by default ()
+    coupled : bool, optional
+        ailerons are deflected with flaps (flaperons), by default True
+    M : int, optional
+        number of grid points, by default None
+    method : str, optional
+        linear calculation method ('multhop' or 'vortexlattice'),
+        by default 'multhop'
+    airfoil_db : dict, optional
+        airfoil data, by default defaultdict(AirfoilData)
+
+    Returns
+    -------
+    np.ndarray
+        structured array with flap setting (degrees), lift coefficient at
+        zero angle of attack, lift curve slope C_L_α (1/rad), roll damping
+        C_l_p and aileron effectiveness C_l_δa (1/rad) for every flap setting
+    """
+
+    ys = _calc_gridpoints(wing, M)
+    ys[len(ys)//2] = 0.0
+
+    calculator = _calculator_dict[method](wing, ys, airfoil_db)
+
+    if getattr(calculator, 'nonlinear', False):
+        raise NotImplementedError('Stability derivatives need a linear calculation method!')
+
+    # all needed distributions with one solve
+    names = [aileron] + list(flaps)
+
+    αs = np.vstack([calculator._base_αs(), calculator._aoa_αs(1.0), calculator._roll_αs(1.0)]
+                   + [calculator._controlsurface_αs_n(name) for name in names])
+
+    res = calculator._solve_linear(αs)
+
+    # roll moment coefficient in body axes
+    S = wing.area
+    b = wing.span
+    C_ls = -np.trapz(ys*res.c_ls*calculator.chords, ys, axis=-1)/(S*b)
+
+    C_L_base, C_L_α = res.C_L[:2]
+    C_l_p = C_ls[2]
+
+    # normalized control surface distributions are those of right wing half
+    C_L_aileron, C_L_flaps = res.C_L[3], res.C_L[4:]
+    C_l_aileron = C_ls[3]
+
+    η = np.radians(np.atleast_1d(np.asarray(flap_settings, dtype=float)))
+    η_eff = _calc_eta_eff(η)
+
+    table = np.empty(len(η), dtype=_table_dtype)
+
+    table['flap'] = np.degrees(η)
+    table['C_L_α'] = C_L_α
+    table['C_l_p'] = C_l_p
+
+    # both wing halves, aileron lift of right half decreases, left one increases
+    η_aileron = η if coupled else np.zeros_like(η)
+
+    table['C_l_δa'] = -2*C_l_aileron*_deta_eff(η_aileron)
+
+    table['C_L_0'] = C_L_base + 2*η_eff*np.sum(C_L_flaps) \
+                     + 2*_calc_eta_eff(η_aileron)*C_L_aileron
+
+    return table
@@ -0,0 +1,204 @@
+"""Module providing a vortex lattice method for lift calculations
+
+One horseshoe vortex per spanwise panel is placed on the quarter chord
+line of the wing, the flow tangency condition is enforced at the three
+quarter chord points. Sweep and dihedral are taken from the section
+positions, so wings do not need to be flattened.
+"""
+
+import numpy as np
+from numpy import pi as π
+from scipy.linalg import lu_factor, lu_solve
+
+from .multhop import _LiftCalculator, MulthopResult, MulthopBatchResult
+
+
+def _segment_velocity(P, A, B, core=1e-12):
+    """velocity induced by straight vortex segments A->B of unit strength"""
+
+    r1 = P - A
+    r2 = P - B
+    r0 = B - A
+
+    cross = np.cross(r1, r2)
+    cross2 = np.sum(cross**2, axis=-1)
+
+    n1 = np.linalg.norm(r1, axis=-1)
+    n2 = np.linalg.norm(r2, axis=-1)
+
+    # points on the vortex line do not see any induced velocity
+    singular = (cross2 < core) | (n1 < core) | (n2 < core)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fac = np.sum(r0 * (r1/n1[..., np.newaxis] - r2/n2[..., np.newaxis]), axis=-1) / cross2
+
+    fac = np.where(singular, 0.0, fac)
+
+    return cross * fac[..., np.newaxis] / (4*π)
+
+
+def _semiinfinite_velocity(P, A, u=np.array([1.0, 0.0, 0.0]), core=1e-12):
+    """velocity induced by vortex lines of unit strength from A to infinity along u"""
+
+    r = P - A
+
+    cross = np.cross(u, r)
+    cross2 = np.sum(cross**2, axis=-1)
+
+    n = np.linalg.norm(r, axis=-1)
+
+    singular = (cross2 < core) | (n < core)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fac = (1 + np.sum(r*u, axis=-1)/n) / cross2
+
+    fac = np.where(singular, 0.0, fac)
+
+    return cross * fac[..., np.newaxis] / (4*π)
+
+
+def _trefftz_velocity(P, A, B):
+    """velocity induced in the Trefftz plane by trailing vortex pairs of
+    unit strength leaving A and B (only y and z coordinates are used)
+
+    The trailing legs are infinite line vortices far downstream, the
+    velocity is twice the one of semi-infinite legs at the bound vortex.
+    """
+
+    def line_velocity(A):
+        r = (P - A)*[0.0, 1.0, 1.0]
+        r2 = np.sum(r**2, axis=-1)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            fac = np.where(r2 > 1e-24, 1/r2, 0.0)
+
+        return np.cross([1.0, 0.0, 0.0], r) * fac[..., np.newaxis] / (2*π)
+
+    return line_velocity(B) - line_velocity(A)
+
+
+def _horseshoe_velocity(P, A, B, bound=True):
+    """velocity induced by horseshoe vortices (trailing legs along x axis)
+
+    P is broadcasted against A and B, e.g. P[:, np.newaxis] and A[np.newaxis]
+    give the influence matrix of all vortices on all points.
+    """
+
+    v = _semiinfinite_velocity(P, B) - _semiinfinite_velocity(P, A)
+
+    if bound:
+        v += _segment_velocity(P, A, B)
+
+    return v
+
+
+class VortexLattice(_LiftCalculator):
+    """Vortex lattice calculator with the load cases and results of Multhop
+
+    Parameters
+    ----------
+    wing : Wing
+        wing object, sections may have sweep and dihedral
+    ys : array
+        span positions (projected) of collocation points, ascending
+    airfoil_db : dict
+        airfoil data, zero lift angles are used for base lift
+    """
+
+    def __init__(self, wing, ys, airfoil_db):
+        super().__init__(wing, ys, airfoil_db)
+
+        # vortex lattice inherently uses thin airfoil lift slope
+        self.dcls = np.full_like(self.chords, 2*π)
+
+        b = wing.span
+
+        ys = np.asarray(ys, dtype=float)
+
+        # panel edges halfway between collocation points in terms of the
+        # multhopp angle θ, outer edges at wing tips
+        θs = np.arccos(np.clip(-2*ys/b, -1.0, 1.0))
+        θ_edges = np.concatenate([[0.0], (θs[1:]+θs[:-1])/2, [π]])
+        edges = -b/2*np.cos(θ_edges)
+
+        def points(y, chordpos):
+            x = np.interp(np.abs(y), wing.ys, wing.xs) \
+                + chordpos*np.interp(np.abs(y), wing.ys, wing.chords)
+            z = np.interp(np.abs(y), wing.ys, wing.zs)
+            return np.column_stack([x, y, z])
+
+        edgepoints = points(edges, 0.25)
+        A, B = edgepoints[:-1], edgepoints[1:]
+
+        collocation = points(ys, 0.75)
+        midpoints = (A+B)/2
+
+        # panel normals from chord direction and bound vortex direction
+        s = B - A
+        normals = np.cross([1.0, 0.0, 0.0], s)
+        normals /= np.linalg.norm(normals, axis=1)[:, np.newaxis]
+
+        self._normals = normals
+        self._cosφs = normals[:, 2]
+        self._Δys = s[:, 1]
+        self._midys = midpoints[:, 1]
+
+        # panel widths in the Trefftz plane
+        self._lengths = np.linalg.norm(s[:, 1:], axis=1)
+
+        # influence of all horseshoes on all collocation points
+        V = _horseshoe_velocity(collocation[:, np.newaxis], A[np.newaxis], B[np.newaxis])
+        self.influence = np.einsum('ijk,ik->ij', V, normals)
+
+        # induced angle of attack from half of the far field downwash in the
+        # Trefftz plane, the near field of swept trailing legs underestimates
+        # the induced drag
+        V_t = _trefftz_velocity(midpoints[:, np.newaxis], A[np.newaxis], B[np.newaxis])
+        self.downwash = 0.5*np.einsum('ijk,ik->ij', V_t, normals)
+
+        self.lu = lu_factor(self.influence)
+
+    def _solve_linear(self, αs):
+        αs = np.asarray(αs, dtype=float)
+
+        b = self.wing.span
+        S = self.wing.area
+
+        # flow tangency with linearized free stream (cos α, 0, sin α)
+        Γs = lu_solve(self.lu, -(αs*self._cosφs).T).T
+
+        α_is = -Γs@self.downwash.T
+
+        c_ls = 2*Γs/self.chords
+
+        C_L = 2*np.sum(Γs*self._Δys, axis=-1)/S
+        C_Di = 2*np.sum(Γs*α_is*self._lengths, axis=-1)/S
+
+        # circulation in multhop's normalization
+        γs = Γs/b
+
+        if αs.ndim == 2:
+            return MulthopBatchResult(self.ys, c_ls, α_is, C_L, C_Di, γs)
+
+        return MulthopResult(self.ys, c_ls, α_is, C_L, C_Di, γs)
+
+    def coefficients(self, res):
+        """Calculate C_L, C_Di and root bending moment coefficient (right
+        wing half) of superposed results with panel quadrature"""
+
+        b = self.wing.span
+        S = self.wing.area
+
+        Γs = np.asarray(res.γs)*b
+
+        right = self._midys > 0.0
+
+        C_L = 2*np.sum(Γs*self._Δys)/S
+        C_Di = 2*np.sum(Γs*res.α_is*self._lengths)/S
+        C_Mb = 4*np.sum((Γs*self._midys*self._Δys)[right])/(S*b)
+
+        return np.array([C_L, C_Di, C_Mb])
+
+    def drag_weights(self):
+        """Quadrature weights w of induced drag, C_Di = Σ w γ α_i"""
+        return 2*self.wing.span*self._lengths/self.wing.area
@@ -1,4 +1,6 @@
-from . import wing
+from . import wing, wingbatch, loader
 
 
 from .wing import Wing, Point
+from .wingbatch import WingBatch
+from .loader import WingLoader, load_wings
@@ -0,0 +1,139 @@
+"""Module providing a simple versioned binary file format for named arrays
+
+The file starts with a magic string, the format version and a JSON header
+describing meta data and the position of every array. Array data is stored
+uncompressed and aligned, so it can be memory-mapped without copying.
+"""
+
+import json
+import os
+import tempfile
+
+import numpy as np
+
+
+MAGIC = b'WSARRAY\x00'
+VERSION = 1
+
+_ALIGNMENT = 64
+
+
+def _aligned(offset):
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def write_arrays(filename, arrays:dict, meta:dict=None):
+    """Write named arrays and meta data to a file
+
+    The file is written to a temporary file first and then moved,
+    so readers never see partially written files.
+
+    Parameters
+    ----------
+    filename : str
+        path of file
+    arrays : dict
+        arrays by name, object arrays are not supported
+    meta : dict, optional
+        JSON serializable meta data, by default None
+    """
+
+    arrays = {name: np.asarray(array, order='C') for name, array in arrays.items()}
+
+    for name, array in arrays.items():
+        if array.dtype.hasobject:
+            raise ValueError(f'array {name} has object dtype and cannot be stored!')
+
+    # header with offsets relative to start of data section
+    entries = {}
+    offset = 0
+
+    for name, array in arrays.items():
+        entries[name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset = _aligned(offset + array.nbytes)
+
+    header = json.dumps({'meta': meta or {}, 'arrays': entries}).encode('utf-8')
+
+    datastart = _aligned(len(MAGIC) + 8 + len(header))
+
+    # unique temporary file for every writer (processes and threads)
+    fd, tmpname = tempfile.mkstemp(prefix=os.path.basename(filename) + '.', suffix='.tmp',
+                                   dir=os.path.dirname(os.path.abspath(filename)))
+
+    try:
+        with os.fdopen(fd, 'wb') as datfile:
+            datfile.write(MAGIC)
+            datfile.write(np.array([VERSION, len(header)], dtype='<u4').tobytes())
+            datfile.write(header)
+
+            for name, array in arrays.items():
+                datfile.seek(datastart + entries[name]['offset'])
+                datfile.write(array.tobytes())
+
+            # make sure file has full length even for empty last array
+            datfile.truncate(datastart + offset)
+
+        # temporary files are only readable by owner
+        os.chmod(tmpname, 0o644)
+        os.replace(tmpname, filename)
+    finally:
+        # only left if writing or renaming failed
+        if os.path.exists(tmpname):
+            os.remove(tmpname)
+
+
+def read_header(filename):
+    """Read meta data and array descriptions of file"""
+
+    with open(filename, 'rb') as datfile:
+        magic = datfile.read(len(MAGIC))
+
+        if magic != MAGIC:
+            raise ValueError(f'{filename} is not a wingstructure array file!')
+
+        version, headerlength = np.frombuffer(datfile.read(8), dtype='<u4')
+
+        if version > VERSION:
+            raise ValueError(f'array file version {version} is not supported!')
+
+        header = json.loads(datfile.read(headerlength).decode('utf-8'))
+
+    header['datastart'] = _aligned(len(MAGIC) + 8 + int(headerlength))
+
+    return header
+
+
+def read_arrays(filename, mmap:bool=True):
+    """Read named arrays and meta data from file
+
+    Parameters
+    ----------
+    filename : str
+        path of file
+    mmap : bool, optional
+        memory-map arrays read only instead of reading them, by default True
+
+    Returns
+    -------
+    tuple
+        dict of arrays and meta data dict
+    """
+
+    header = read_header(filename)
+
+    arrays = {}
+
+    for name, entry in header['arrays'].items():
+        dtype = np.dtype(entry['dtype'])
+        shape = tuple(entry['shape'])
+        offset = header['datastart'] + entry['offset']
+
+        if mmap and int(np.prod(shape)) > 0:
+            arrays[name] = np.memmap(filename, dtype=dtype, mode='r', offset=offset, shape=shape)
+        else:
+            with open(filename, 'rb') as datfile:
+                datfile.seek(offset)
+                count = int(np.prod(shape))
+                arrays[name] = np.fromfile(datfile, dtype=dtype, count=count).reshape(shape)
+
+    return arrays, header['meta']
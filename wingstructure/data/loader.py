@@ -0,0 +1,197 @@
+"""Module providing lazy loading of many wing definition files
+
+Wing files (YAML, like for Wing.load_from_file) are read from a directory
+or zip archive when they are accessed. Parsed wings are stored in binary
+cache files, which are reused as long as the content hash of the source
+file does not change.
+"""
+
+import fnmatch
+import hashlib
+import os
+import zipfile
+from collections.abc import Mapping
+
+import numpy as np
+
+from . import arrayfile
+from .wing import Wing
+
+
+CACHE_SUFFIX = '.wsc'
+
+
+def _parse_yaml(content:bytes):
+    import yaml
+
+    # use libyaml bindings if available
+    Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+    return yaml.load(content, Loader=Loader)
+
+
+def _write_cache(filename, wing, digest):
+    data = wing.compiled
+
+    arrays = {'sections': np.column_stack([data['x'], data['y'], data['z'],
+                                           data['chord'], data['twist']])}
+
+    meta = {'type': 'Wing', 'hash': digest, 'pos': [wing.x, wing.y, wing.z],
+            'airfoils': [str(airfoil) for airfoil in wing.airfoils],
+            'controlsurfaces': {name: list(cs) for name, cs in wing.controlsurfaces.items()}}
+
+    arrayfile.write_arrays(filename, arrays, meta)
+
+
+def _read_cache(filename, digest):
+    """wing from cache file, None if cache is missing or outdated"""
+
+    try:
+        arrays, meta = arrayfile.read_arrays(filename, mmap=False)
+    except (OSError, ValueError):
+        return None
+
+    if meta.get('type') != 'Wing' or meta.get('hash') != digest:
+        return None
+
+    wing = Wing(pos=meta['pos'])
+
+    for (x, y, z, chord, twist), airfoil in zip(arrays['sections'].tolist(), meta['airfoils']):
+        wing.append((x, y, z), chord, twist, airfoil)
+
+    for name, cs in meta['controlsurfaces'].items():
+        wing.add_controlsurface(name, *cs)
+
+    return wing
+
+
+class WingLoader(Mapping):
+    """Lazy mapping of wing file names to Wing objects
+
+    Parameters
+    ----------
+    source : str
+        directory or zip archive containing wing files
+    pattern : str, optional
+        file name pattern of wing files, by default '*.yaml'
+    cache : bool, optional
+        use binary cache files, by default True
+    cache_dir : str, optional
+        directory for cache files, by default next to the wing files
+        (directories) or in directory <archive>.cache (zip archives)
+
+    Archives are kept open until close is called, loaders can be used as
+    context manager.
+    """
+
+    def __init__(self, source:str, pattern:str='*.yaml', cache:bool=True, cache_dir:str=None):
+        self.source = source
+        self.cache = cache
+
+        archive = zipfile.is_zipfile(source) if os.path.isfile(source) else False
+
+        # archive stays open, so its index is only read once
+        self._archive = zipfile.ZipFile(source) if archive else None
+
+        if self._archive is not None:
+            names = [name for name in self._archive.namelist() if not name.endswith('/')]
+
+            if cache_dir is None:
+                cache_dir = source + '.cache'
+        else:
+            names = [os.path.relpath(os.path.join(root, filename), source)
+                     for root, _, filenames in os.walk(source) for filename in filenames]
+
+        self.names = sorted(name for name in names
+                            if fnmatch.fnmatch(os.path.basename(name), pattern))
+
+        # index for constant time lookups
+        self._index = frozenset(self.names)
+
+        self.cache_dir = cache_dir
+
+    def __len__(self):
+        return len(self.names)
+
+    def __iter__(self):
+        return iter(self.names)
+
+    def __contains__(self, name):
+        return name in self._index
+
+    def close(self):
+        """Close archive of wing files"""
+
+        if self._archive is not None:
+            self._archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def _read(self, name):
+        if self._archive is not None:
+            return self._archive.read(name)
+
+        with open(os.path.join(self.source, name), 'rb') as datfile:
+            return datfile.read()
+
+    def cachefile(self, name):
+        """Get path of cache file of wing file"""
+
+        if self.cache_dir is None:
+            return os.path.join(self.source, name) + CACHE_SUFFIX
+
+        return os.path.join(self.cache_dir, name.replace('/', '__')) + CACHE_SUFFIX
+
+    def __getitem__(self, name):
+        if name not in self._index:
+            raise KeyError(f'{name} is not a wing file of {self.source}!')
+
+        content = self._read(name)
+
+        if not self.cache:
+            return Wing.deserialize(_parse_yaml(content)['wing'])
+
+        digest = hashlib.sha1(content).hexdigest()
+        cachefile = self.cachefile(name)
+
+        wing = _read_cache(cachefile, digest)
+
+        if wing is None:
+            wing = Wing.deserialize(_parse_yaml(content)['wing'])
+
+            try:
+                os.makedirs(os.path.dirname(cachefile) or '.', exist_ok=True)
+                _write_cache(cachefile, wing, digest)
+            except OSError:
+                # read only sources are loaded without cache
+                pass
+
+        return wing
+
+
+def load_wings(source:str, pattern:str='*.yaml', cache:bool=True, cache_dir:str=None):
+    """Load all wing files of a directory or zip archive
+
+    Parameters
+    ----------
+    source : str
+        directory or zip archive containing wing files
+    pattern : str, optional
+        file name pattern of wing files, by default '*.yaml'
+    cache : bool, optional
+        use binary cache files, by default True
+    cache_dir : str, optional
+        directory for cache files, see WingLoader, by default None
+
+    Returns
+    -------
+    dict
+        Wing objects by file name
+    """
+
+    with WingLoader(source, pattern, cache, cache_dir) as loader:
+        return dict(loader.items())
@@ -1,5 +1,5 @@
 from collections import namedtuple
-from copy import deepcopy
+from functools import wraps
 
 import numpy as np
 
@@ -15,9 +15,67 @@ def serializesection(self):
     return data
 
 
+def _counted(method):
+    """list method counting modifications"""
+
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        self.version += 1
+        return method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class _SectionList(list):
+    """List of sections with version, increased by every modification"""
+
+    version = 0
+
+    __setitem__ = _counted(list.__setitem__)
+    __delitem__ = _counted(list.__delitem__)
+    __iadd__ = _counted(list.__iadd__)
+    __imul__ = _counted(list.__imul__)
+    append = _counted(list.append)
+    extend = _counted(list.extend)
+    insert = _counted(list.insert)
+    pop = _counted(list.pop)
+    remove = _counted(list.remove)
+    reverse = _counted(list.reverse)
+    sort = _counted(list.sort)
+    clear = _counted(list.clear)
+
+
+def _cached(func):
+    """cache derived geometry until sections change"""
+
+    name = func.__name__
+
+    @wraps(func)
+    def wrapper(self):
+        cache = self._geometry_cache()
+
+        try:
+            return cache[name]
+        except KeyError:
+            value = cache[name] = func(self)
+            return value
+
+    return wrapper
+
+
+def _readonly(array):
+    array.setflags(write=False)
+    return array
+
+
 class _Wing:
     """
     A data structue for multi trapez wing definitions.
+
+    Section data is compiled into a structured array (see compiled) and
+    derived quantities are cached. Sections are immutable and every
+    modification of the section list (or its replacement) invalidates
+    the cache.
     """
 
     _Section = namedtuple('Section', ['pos', 'chord', 'twist', 'airfoil'])
@@ -29,12 +87,48 @@ class _Wing:
     def __init__(self, pos=(0.0, 0.0, 0.0)):
         self.x, self.y, self.z = pos
         self.sections = []
+        self._cache = None
+
+    @property
+    def sections(self):
+        return self._sections
+
+    @sections.setter
+    def sections(self, sections):
+        self._sections = _SectionList(sections)
     
     def append(self, pos=(0.0, 0.0, 0.0), chord=1.0, twist=0.0, airfoil=''):
         self.sections.append(
             self._Section(Point(*pos), chord, twist, airfoil)
         )
 
+    def _geometry_cache(self):
+        cache = getattr(self, '_cache', None)
+        sections = self.sections
+
+        if cache is None or cache['_sections'] is not sections \
+                or cache['_version'] != sections.version:
+            cache = self._cache = {'_sections': sections, '_version': sections.version}
+
+        return cache
+
+    @property
+    @_cached
+    def compiled(self):
+        """Get read only structured array of section data
+        (x, y, z, chord, twist, airfoil)"""
+
+        airfoils = [str(sec.airfoil) for sec in self.sections]
+        length = max((len(airfoil) for airfoil in airfoils), default=0)
+
+        dtype = np.dtype([('x', float), ('y', float), ('z', float), ('chord', float),
+                          ('twist', float), ('airfoil', f'U{max(length, 1)}')])
+
+        data = np.array([(*sec.pos, sec.chord, sec.twist, airfoil)
+                         for sec, airfoil in zip(self.sections, airfoils)], dtype=dtype)
+
+        return _readonly(data)
+
     def get_mac(self):
         """Calculate mean aerodynamic chord.
         
@@ -49,6 +143,12 @@ class _Wing:
         -----
         Implements formulas reported in http://dx.doi.org/10.1063/1.4951901
         """
+
+        pos, mac = self._mac()
+
+        return pos.copy(), mac
+
+    def _calc_mac(self):
         
         pos = np.zeros(3)
         area = 0.0
@@ -87,23 +187,30 @@ class _Wing:
 
         return pos, mac
 
+    @_cached
+    def _mac(self):
+        pos, mac = self._calc_mac()
+        return _readonly(pos), mac
+
     @property
+    @_cached
     def span(self):
         """Get span of wing."""
-        return 2*max((sec.pos.y for sec in self.sections))
+        return 2*np.max(self.compiled['y'])
 
     @property
+    @_cached
     def area(self):
         """Get wing area."""
 
-        span_positions = [sec.pos.y for sec in self.sections]
-        chord_lengths = [sec.chord for sec in self.sections]
+        data = self.compiled
 
-        area = np.trapz(chord_lengths, span_positions)
+        area = np.trapz(data['chord'], data['y'])
 
         return 2*area
 
     @property
+    @_cached
     def aspectratio(self):
         """Get aspect ratio."""
         return self.span**2/self.area
@@ -111,7 +218,7 @@ class _Wing:
     @property
     def mac(self):
         """Get mac length"""
-        return self.get_mac()[1] 
+        return self._mac()[1] 
 
 
 class Wing(_Wing):
@@ -152,25 +259,35 @@ class Wing(_Wing):
         self.controlsurfaces[name] = self._ControlSurface(
                 pos1, pos2, depth1, depth2, cstype)
 
+    # section data as new arrays, cached compiled data stays unchanged
+
     @property
     def chords(self):
-        return np.array([sec.chord for sec in self.sections])
+        return self.compiled['chord'].copy()
 
     @property
     def xs(self):
-        return np.array([sec.pos.x for sec in self.sections])
+        return self.compiled['x'].copy()
     
     @property
     def ys(self):
-        return np.array([sec.pos.y for sec in self.sections])
+        return self.compiled['y'].copy()
+
+    @property
+    def zs(self):
+        return self.compiled['z'].copy()
 
     @property
     def twists(self):
-        return np.array([sec.twist for sec in self.sections])
+        return self.compiled['twist'].copy()
 
     @property
     def airfoils(self):
-        return np.array([sec.airfoil for sec in self.sections])
+        return self._airfoils().copy()
+
+    @_cached
+    def _airfoils(self):
+        return _readonly(np.array([sec.airfoil for sec in self.sections]))
 
     def within_control(self, csname, y):
         y = np.abs(y)
@@ -192,7 +309,7 @@ class Wing(_Wing):
     def serialize(self):
         data = {
             'pos': {'x': self.x, 'y': self.y, 'z': self.z},
-            'sections': [deepcopy(sec.serialize()) for sec in self.sections],
+            'sections': [sec.serialize() for sec in self.sections],
             'controlsurfaces': {name: dict(cs._asdict()) for name, cs in self.controlsurfaces.items()}
         }
 
@@ -226,8 +343,9 @@ class Wing(_Wing):
 
         # generate sections
         for secdict in adict['sections']:
-            secdict_ = deepcopy(secdict)
-            secdict_['pos'] = Point(**secdict_['pos'])
+            # shallow copy is sufficient, only position is replaced
+            secdict_ = dict(secdict)
+            secdict_['pos'] = Point(**secdict['pos'])
             wing.append(**secdict_)
 
         # add control surfaces
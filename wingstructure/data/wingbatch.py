@@ -0,0 +1,150 @@
+"""Module providing a container for many wings with the same topology
+
+All wings have the same number of sections and the same airfoils,
+section positions, chords and twists are stored as (N_wings, N_sections)
+arrays, so geometric properties are calculated for all wings at once.
+"""
+
+import numpy as np
+
+from .wing import Wing
+
+
+class WingBatch:
+    """Structure of arrays representation of wings with the same topology
+
+    Parameters
+    ----------
+    xs, ys, zs : array
+        section positions (N_wings, N_sections), zs defaults to zero
+    chords : array
+        chord lengthes (N_wings, N_sections)
+    twists : array, optional
+        twists in degrees (N_wings, N_sections), by default zero
+    airfoils : list, optional
+        airfoil names of sections (same for all wings), by default ''
+    """
+
+    def __init__(self, xs, ys, chords, twists=None, airfoils=None, zs=None):
+        self.ys = np.atleast_2d(np.asarray(ys, dtype=float))
+
+        shape = self.ys.shape
+
+        self.xs = np.broadcast_to(np.asarray(xs, dtype=float), shape).copy()
+        self.chords = np.broadcast_to(np.asarray(chords, dtype=float), shape).copy()
+
+        self.zs = np.zeros(shape) if zs is None else \
+                  np.broadcast_to(np.asarray(zs, dtype=float), shape).copy()
+        self.twists = np.zeros(shape) if twists is None else \
+                      np.broadcast_to(np.asarray(twists, dtype=float), shape).copy()
+
+        if airfoils is None:
+            airfoils = ['']*shape[1]
+
+        if len(airfoils) != shape[1]:
+            raise ValueError('Number of airfoils has to match number of sections!')
+
+        self.airfoils = np.array(airfoils)
+
+    @classmethod
+    def from_wings(cls, wings):
+        """Create batch from Wing objects with same topology
+
+        Parameters
+        ----------
+        wings : list
+            Wing objects with equal number of sections and airfoils
+
+        Returns
+        -------
+        WingBatch
+            batch of wings
+        """
+
+        wings = list(wings)
+
+        airfoils = wings[0].airfoils
+        n_sections = len(airfoils)
+
+        for wing in wings:
+            if len(wing.sections) != n_sections or (wing.airfoils != airfoils).any():
+                raise ValueError('Wings of a batch need same sections and airfoils!')
+
+        data = np.stack([wing.compiled[['x', 'y', 'z', 'chord', 'twist']].tolist()
+                         for wing in wings])
+
+        xs, ys, zs, chords, twists = np.moveaxis(data, -1, 0)
+
+        return cls(xs, ys, chords, twists, list(airfoils), zs)
+
+    def __len__(self):
+        return len(self.ys)
+
+    def __getitem__(self, k):
+        """Create Wing object of k-th wing"""
+
+        wing = Wing()
+
+        for x, y, z, chord, twist, airfoil in zip(self.xs[k], self.ys[k], self.zs[k],
+                                                  self.chords[k], self.twists[k],
+                                                  self.airfoils):
+            wing.append((x, y, z), chord, twist, str(airfoil))
+
+        return wing
+
+    def __iter__(self):
+        return (self[k] for k in range(len(self)))
+
+    @property
+    def span(self):
+        """Get span of wings."""
+        return 2*np.max(self.ys, axis=1)
+
+    @property
+    def area(self):
+        """Get wing areas."""
+        return 2*np.trapz(self.chords, self.ys, axis=1)
+
+    @property
+    def aspectratio(self):
+        """Get aspect ratios."""
+        return self.span**2/self.area
+
+    def get_mac(self):
+        """Calculate mean aerodynamic chords.
+
+        Returns
+        -------
+        pos: array
+           leading edge positions of mean aerodynamic chords (N_wings, 3)
+        mac: array
+           mac lengthes (N_wings,)
+        """
+
+        x1, x2 = self.xs[:, :-1], self.xs[:, 1:]
+        y1, y2 = self.ys[:, :-1], self.ys[:, 1:]
+        c1, c2 = self.chords[:, :-1], self.chords[:, 1:]
+
+        # segment properties
+        S = (c1+c2)/2 * (y2-y1)
+        λ = c2 / c1
+
+        segmac = 2/3 * c1 * (λ**2 + λ + 1) / (λ + 1)
+        segx = x1 + (x2-x1) * (1+2*λ)/(3+3*λ)
+        segy = y1 + (y2-y1) * (1+2*λ)/(3+3*λ)
+
+        # weighted by segment area
+        area = np.sum(S, axis=1)
+
+        pos = np.zeros((len(self), 3))
+        pos[:, 0] = np.sum(segx*S, axis=1)/area
+        pos[:, 1] = np.sum(segy*S, axis=1)/area
+
+        mac = np.sum(segmac*S, axis=1)/area
+
+        return pos, mac
+
+    @property
+    def mac(self):
+        """Get mac lengthes"""
+        return self.get_mac()[1]
@@ -0,0 +1,245 @@
+"""Module providing maneuver and gust load envelopes
+
+Load factors of the V-n diagram are calculated for all combinations of
+mass, center of gravity, speed and altitude. The resulting wing lift
+coefficients are evaluated with the load case operator of one
+LiftAnalysis in a single vectorized pass.
+"""
+
+from collections import namedtuple, defaultdict
+
+import numpy as np
+
+from .aero import LiftAnalysis, AirfoilData
+
+
+g = 9.80665 # m/s², standard gravity
+ρ_0 = 1.225 # kg/m³, sea level density of standard atmosphere
+
+_R = 287.05287 # J/(kg K), specific gas constant of air
+
+
+def isa(altitude):
+    """International standard atmosphere (up to 20 km)
+
+    Parameters
+    ----------
+    altitude : float or array
+        geopotential altitude in m
+
+    Returns
+    -------
+    tuple
+        temperature (K), pressure (Pa) and density (kg/m³)
+    """
+
+    h = np.asarray(altitude, dtype=float)
+
+    # troposphere with constant lapse rate, isothermal above 11 km
+    T = np.where(h <= 11000.0, 288.15 - 0.0065*h, 216.65)
+
+    p_tropo = 101325.0*(T/288.15)**(g/(0.0065*_R))
+    p_strato = 22632.06*np.exp(-g/(_R*216.65)*(h - 11000.0))
+
+    p = np.where(h <= 11000.0, p_tropo, p_strato)
+
+    return T, p, p/(_R*T)
+
+
+def true_airspeed(V_EAS, altitude):
+    """Convert equivalent airspeed to true airspeed"""
+
+    return V_EAS*np.sqrt(ρ_0/isa(altitude)[2])
+
+
+def equivalent_airspeed(V_TAS, altitude):
+    """Convert true airspeed to equivalent airspeed"""
+
+    return V_TAS*np.sqrt(isa(altitude)[2]/ρ_0)
+
+
+def maneuver_loadfactors(V_EAS, wingloading, n_max:float, n_min:float,
+                         C_L_max:float, C_L_min:float):
+    """Positive and negative maneuver load factors limited by stall
+
+    Parameters
+    ----------
+    V_EAS : float or array
+        equivalent airspeed in m/s
+    wingloading : float or array
+        weight per wing area in N/m²
+    n_max, n_min : float
+        limit load factors
+    C_L_max, C_L_min : float
+        maximum and minimum lift coefficient of aircraft
+
+    Returns
+    -------
+    tuple
+        positive and negative load factors
+    """
+
+    q = ρ_0/2*np.asarray(V_EAS)**2
+
+    n_pos = np.minimum(n_max, q*C_L_max/wingloading)
+    n_neg = np.maximum(n_min, q*C_L_min/wingloading)
+
+    return n_pos, n_neg
+
+
+def gust_loadfactors(V_EAS, U_de, wingloading, altitude, mac:float, lift_slope:float):
+    """Gust load factors using Pratt's formula with alleviation factor
+
+    Parameters
+    ----------
+    V_EAS : float or array
+        equivalent airspeed in m/s
+    U_de : float or array
+        derived gust velocity (EAS) in m/s
+    wingloading : float or array
+        weight per wing area in N/m²
+    altitude : float or array
+        altitude in m
+    mac : float
+        mean aerodynamic chord in m
+    lift_slope : float
+        lift curve slope of aircraft in 1/rad
+
+    Returns
+    -------
+    tuple
+        positive and negative load factors
+    """
+
+    ρ = isa(altitude)[2]
+
+    # aircraft mass ratio and gust alleviation factor
+    μ_g = 2*wingloading/(g*ρ*mac*lift_slope)
+    k_g = 0.88*μ_g/(5.3 + μ_g)
+
+    Δn = k_g*ρ_0*U_de*V_EAS*lift_slope/(2*wingloading)
+
+    return 1 + Δn, 1 - Δn
+
+
+LoadEnvelope = namedtuple('LoadEnvelope', ('cases', 'ys', 'chords', 'lineloads'))
+
+_case_dtype = np.dtype([('mass', float), ('x_cg', float), ('altitude', float),
+                        ('V_EAS', float), ('V_TAS', float), ('kind', 'U10'), ('n', float),
+                        ('q', float), ('C_L', float), ('alpha', float), ('C_Di', float),
+                        ('C_Mx', float), ('stalled', bool)])
+
+_kinds = np.array(['maneuver+', 'maneuver-', 'gust+', 'gust-'])
+
+
+def load_envelope(wing, masses, speeds, altitudes=0.0, cgs=None, n_max:float=5.3,
+                  n_min:float=-2.65, C_L_max:float=1.5, C_L_min:float=-1.0,
+                  gust_velocity=15.0, x_tail:float=None, analysis:LiftAnalysis=None,
+                  airfoil_db=defaultdict(AirfoilData), M:int=None):
+    """Calculate spanwise loads of maneuver and gust load cases
+
+    Every combination of mass, center of gravity, speed and altitude gives
+    four load cases (positive and negative maneuver and gust). With a tail
+    position the lift is split between wing and tail by moment balance
+    around the center of gravity (neglecting the zero lift moment),
+    otherwise the wing carries the whole lift.
+
+    Parameters
+    ----------
+    wing : Wing
+        a wing object
+    masses : float or array
+        aircraft masses in kg
+    speeds : float or array
+        equivalent airspeeds in m/s
+    altitudes : float or array, optional
+        altitudes in m, by default 0.0
+    cgs : float or array, optional
+        x positions of center of gravity in m, by default None (quarter
+        chord of mean aerodynamic chord)
+    n_max, n_min : float, optional
+        limit maneuver load factors, by default 5.3 and -2.65
+    C_L_max, C_L_min : float, optional
+        maximum and minimum lift coefficient, by default 1.5 and -1.0
+    gust_velocity : float or array, optional
+        derived gust velocity for every speed in m/s, by default 15.0
+    x_tail : float, optional
+        x position of tail aerodynamic center in m, by default None
+    analysis : LiftAnalysis, optional
+        lift analysis of wing, by default generated with airfoil_db and M
+    airfoil_db : dict, optional
+        airfoil data, by default defaultdict(AirfoilData)
+    M : int, optional
+        number of grid points, by default None
+
+    Returns
+    -------
+    LoadEnvelope
+        cases (structured array), ys, chords and line loads (N/m) of
+        every case (K, M)
+    """
+
+    if analysis is None:
+        analysis = LiftAnalysis.generate(wing, airfoil_db, M=M)
+
+    S = wing.area
+
+    pos, mac = wing.get_mac()
+    x_ac = wing.x + pos[0] + 0.25*mac
+
+    if cgs is None:
+        cgs = x_ac
+
+    # all combinations (mass, cg, altitude, speed)
+    m, x_cg, h, V = np.meshgrid(np.atleast_1d(masses).astype(float),
+                                np.atleast_1d(cgs).astype(float),
+                                np.atleast_1d(altitudes).astype(float),
+                                np.atleast_1d(speeds).astype(float), indexing='ij')
+
+    U_de = np.broadcast_to(np.asarray(gust_velocity, dtype=float), V.shape[-1:])
+
+    wingloading = m*g/S
+    lift_slope = analysis._aoa.C_L
+
+    n = np.stack(maneuver_loadfactors(V, wingloading, n_max, n_min, C_L_max, C_L_min)
+                 + gust_loadfactors(V, U_de, wingloading, h, mac, lift_slope), axis=-1)
+
+    q = ρ_0/2*V**2
+
+    # part of lift carried by wing
+    if x_tail is None:
+        wingshare = np.ones_like(x_cg)
+    else:
+        wingshare = (x_tail - x_cg)/(x_tail - x_ac)
+
+    C_L = n*(wingloading*wingshare/q)[..., np.newaxis]
+
+    # flatten to load cases
+    shape = n.shape
+    K = n.size
+
+    expand = lambda values: np.broadcast_to(values[..., np.newaxis], shape).ravel()
+
+    C_Ls = C_L.ravel()
+
+    α, res, C_Mx = analysis.compile()(C_Ls)
+
+    cases = np.empty(K, dtype=_case_dtype)
+
+    cases['mass'] = expand(m)
+    cases['x_cg'] = expand(x_cg)
+    cases['altitude'] = expand(h)
+    cases['V_EAS'] = expand(V)
+    cases['V_TAS'] = expand(true_airspeed(V, h))
+    cases['kind'] = np.broadcast_to(_kinds, shape).ravel()
+    cases['n'] = n.ravel()
+    cases['q'] = expand(q)
+    cases['C_L'] = C_Ls
+    cases['alpha'] = np.degrees(α)
+    cases['C_Di'] = res.C_Di
+    cases['C_Mx'] = C_Mx
+    cases['stalled'] = (C_Ls > C_L_max) | (C_Ls < C_L_min)
+
+    lineloads = res.c_ls*analysis.chords*cases['q'][:, np.newaxis]
+
+    return LoadEnvelope(cases, analysis.ys, analysis.chords, lineloads)
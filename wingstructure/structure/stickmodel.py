@@ -1,9 +1,17 @@
+from contextlib import contextmanager
+
 import numpy as np
 from matplotlib import pyplot as plt
 
 
 class Stickmodel:
-    """Object for representation and calculation of unbranched Beam structures"""
+    """Object for representation and calculation of unbranched Beam structures
+
+    Internal loads of every named force and moment array are calculated
+    separately and superposed, so adding or removing loads only requires
+    the solution for these loads. Stored solutions are discarded when
+    nodes, prescribed values or the loads themselves were modified.
+    """
 
     def __init__(self, nodes:np.ndarray, forces:dict=None, moments:dict=None, prescribed:dict=None,
                  use_local_coordinate_system:bool=True, do_auto_updates:bool=True):
@@ -13,17 +21,33 @@ class Stickmodel:
         self.acting_moments = {} if moments is None else moments
         self.prescribed = {} if prescribed is None else prescribed
 
+        for discrete_forces in self.acting_forces.values():
+            _check_loads(discrete_forces, 7)
+
+        for discrete_moments in self.acting_moments.values():
+            _check_loads(discrete_moments, 4)
+
         self.resulting_forces = None
         self.resulting_moments = None
 
         self._use_local_coordinate_system = use_local_coordinate_system
 
-        self.auto_updates = True
+        # internal loads (global coordinates) of prescribed values and named
+        # loads, valid for nodes and prescribed values of state
+        self._state = None
+        self._prescribed_loads = None
+        self._contributions = {}
+
+        self.auto_updates = do_auto_updates
+
+        self._update()
 
     def add_discreteforces(self, name:str, discrete_forces:np.ndarray):
         if name in self.acting_forces.keys():
             raise AttributeError(f'forces with key {name} exist already!')
 
+        _check_loads(discrete_forces, 7)
+
         self.acting_forces[name] = discrete_forces
 
         self._update()
@@ -32,97 +56,218 @@ class Stickmodel:
         if name in self.acting_moments.keys():
             raise AttributeError(f'moments with key {name} exist already!')
 
+        _check_loads(discrete_moments, 4)
+
         self.acting_moments[name] = discrete_moments
 
         self._update()
 
+    def remove_discreteforces(self, name:str):
+        del self.acting_forces[name]
+        self._contributions.pop(('forces', name), None)
+
+        self._update()
+
+    def remove_discretemoments(self, name:str):
+        del self.acting_moments[name]
+        self._contributions.pop(('moments', name), None)
+
+        self._update()
+
     def set_local_coordinatesystem(self, use_local_coordinate_system:bool):
         self._use_local_coordinate_system = use_local_coordinate_system
 
         self._update()
 
+    @contextmanager
+    def deferred_updates(self):
+        """Context manager collecting modifications, the internal loads
+        are updated once when leaving the context"""
+
+        auto_updates = self.auto_updates
+        self.auto_updates = False
+
+        try:
+            yield self
+        finally:
+            self.auto_updates = auto_updates
+
+        if self.prescribed:
+            self._superpose()
+
     def _update(self):
-        if self.auto_updates:
-            try:
-                self.update()
-            except:
-                self.resulting_moments = None
-                self.resulting_moments = None
+        # incomplete models without prescribed values are not solved
+        if self.auto_updates and self.prescribed:
+            self._superpose()
 
-    def update(self):
+    def _superpose(self):
+        """solve loads without valid stored contribution and superpose all"""
+
+        loads = [('forces', name, part) for name, part in self.acting_forces.items()] + \
+                [('moments', name, part) for name, part in self.acting_moments.items()]
+
+        state = (_snapshot(self.nodes),
+                 sorted((node, _snapshot(values)) for node, values in self.prescribed.items()))
+
+        if state != self._state:
+            self._state = state
+            self._prescribed_loads = None
+            self._contributions = {}
+
+        if self._prescribed_loads is None:
+            self._prescribed_loads = self._solve(np.zeros((len(self.nodes)-1, 6)))
+
+        x = self._prescribed_loads
+
+        for kind, name, part in loads:
+            snapshot = _snapshot(part)
+            contribution = self._contributions.get((kind, name))
+
+            # loads may have been replaced or modified in place
+            if contribution is None or contribution[0] != snapshot:
+                external = self._external_loads([part], []) if kind == 'forces' else \
+                           self._external_loads([], [part])
+
+                contribution = self._contributions[kind, name] = \
+                    (snapshot, self._solve(external, homogeneous=True))
+
+            x = x + contribution[1]
+
+        if self._use_local_coordinate_system:
+            x = internalloads2spar(x, self.nodes)
+        
+        self.resulting_forces = x[..., :3]
+        self.resulting_moments = x[..., 3:]
+
+    def _prescribed_node(self):
+        """node and values if all values of exactly one node are prescribed"""
+
+        if len(self.prescribed) != 1:
+            return None
+
+        (node, values), = self.prescribed.items()
+        values = np.asarray(values, dtype=float)
+
+        if values.shape != (6,) or not np.isfinite(values).all():
+            return None
+
+        return node, values
+
+    def _external_loads(self, forces=None, moments=None):
+        """external forces and moments (regarding first node) of every
+        element (n-1, 6), load arrays with leading load case axis give
+        (K, n-1, 6), by default of all acting loads"""
 
         n = len(self.nodes)
-        A = np.zeros([6*n,6*n])
-        b = np.zeros(6*n)
+
+        if forces is None:
+            forces = self.acting_forces.values()
+
+        if moments is None:
+            moments = self.acting_moments.values()
+
+        force_parts = [_check_loads(part, 7) for part in forces]
+        moment_parts = [_check_loads(part, 4) for part in moments]
+
+        # load case shape (numpy < 1.20 has no broadcast_shapes)
+        batch = ()
+
+        for part in force_parts+moment_parts:
+            batch = np.broadcast(np.empty(batch), np.empty(part.shape[:-2])).shape
+
+        loads = np.zeros(batch + (n-1, 6))
+
+        # forces and their moments regarding first node of element
+        for forces in force_parts:
+            segs = forces[..., -1]
+            nodes = self.nodes[np.clip(segs.astype(int), 0, n-1)]
+
+            loads[..., :3] += _element_sums(segs, forces[..., 3:-1], n-1)
+            loads[..., 3:] += _element_sums(segs, np.cross(forces[..., :3] - nodes,
+                                                           forces[..., 3:-1]), n-1)
+
+        # moments
+        for moments in moment_parts:
+            loads[..., 3:] += _element_sums(moments[..., -1], moments[..., :-1], n-1)
+
+        return loads
+
+    def _solve(self, loads, homogeneous=False):
+        """internal loads (global coordinates) for external loads of
+        elements, homogeneous solutions use zero prescribed values"""
+
+        prescribed = self._prescribed_node()
+
+        if prescribed is None:
+            return self._solve_sparse(loads, homogeneous)
+
+        # sweep from prescribed node, linear in number of nodes
+        node, values = prescribed
+
+        return _equilibrium_sweep(self.nodes, loads, node, 0.0*values if homogeneous else values)
+
+    def _solve_sparse(self, loads, homogeneous=False):
+        """solve full equilibrium system, used if prescribed values
+        do not belong to a single node"""
+
+        from scipy.sparse import coo_matrix
+        from scipy.sparse.linalg import splu
+
+        n = len(self.nodes)
+
+        rows, cols, values = [], [], []
 
         # equilibrium conditions (-force_node0 + force_node1 = 0, just the same for moments)
-        for i in range(6*(n-1)):
-            A[i][i] = -1
-            A[i][i+6] = 1
+        idx = np.arange(6*(n-1))
+        rows += [idx, idx]
+        cols += [idx, idx+6]
+        values += [-np.ones(6*(n-1)), np.ones(6*(n-1))]
 
-        # moments resulting from internal forces
-        for i in range(n-1):
-            lx, ly, lz = self.nodes[i+1] - self.nodes[i]
-            idx = 6*i
+        # moments resulting from internal forces (cross product lever x internal force)
+        lx, ly, lz = np.diff(self.nodes, axis=0).T
+        idx = 6*np.arange(n-1)
 
-            ## cross product lever x internal force
-            A[idx+3][idx+7] = -lz
-            A[idx+3][idx+8] = ly
+        for row, col, value in ((3, 7, -lz), (3, 8, ly), (4, 6, lz),
+                                (4, 8, -lx), (5, 7, lx), (5, 6, -ly)):
+            rows.append(idx+row)
+            cols.append(idx+col)
+            values.append(value)
 
-            A[idx+4][idx+6] = lz
-            A[idx+4][idx+8] = -lx
+        # right hand sides of all load cases as columns
+        batch = loads.shape[:-2]
+        loads = np.reshape(loads, (-1, 6*(n-1))).T
 
-            A[idx+5][idx+7] = lx
-            A[idx+5][idx+6] = -ly
+        b = np.zeros((6*n, loads.shape[1]))
+        b[:6*(n-1)] = loads
 
         # equations for prescribed values
         for node, prescribed_values in self.prescribed.items():
             for i, prescribed_value in enumerate(prescribed_values):
-                if prescribed_value is np.NaN:
+                if np.isnan(prescribed_value):
                     continue
-                A[6*(n-1) + i][6*node + i] = 1
-                b[6*(n-1) + i] = -prescribed_value
+                rows.append([6*(n-1) + i])
+                cols.append([6*node + i])
+                values.append([1.0])
+                if not homogeneous:
+                    b[6*(n-1) + i] = -prescribed_value
+
+        A = coo_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                       shape=(6*n, 6*n)).tocsc()
 
+        # factorize once for all load cases
         try:
-            acting_force_array = np.vstack([
-                part for part in self.acting_forces.values()
-            ])
-
-            acting_moment_array = np.vstack([
-                part for part in self.acting_moments.values()
-            ])
-        except:
-            raise ValueError("forces and/or moments are not given in correct form")
-
-        # external loads
-        for i in range(n-1):
-            # forces
-            forces_on_current_element = \
-                 acting_force_array[acting_force_array[:,-1] == i]
-            for l in forces_on_current_element:
-                # force
-                b[6*i:6*i+3] += l[3:-1]
-        
-                # resulting moment (cross product)
-                M = np.cross(l[:3] - self.nodes[i], l[3:-1]) 
-                b[6*i+3:6*i+6] += M
+            x = splu(A).solve(-b)
+        except RuntimeError:
+            raise np.linalg.LinAlgError('Equilibrium system is singular, check prescribed values!')
 
-            # moments
-            moments_on_current_element = \
-                acting_moment_array[acting_moment_array[:,-1] == i]
-            for m in moments_on_current_element:
-                b[6*i+3:6*i+6] += m[:-1]
+        return np.reshape(x.T, batch + (n, 6))
 
-        # solve the linear equation system
-        x = np.linalg.solve(A, -b)
+    def update(self):
+        """Calculate internal loads of all acting loads"""
 
-        x = np.reshape(x, (len(x)//6, 6))
+        self._state = None
 
-        if self._use_local_coordinate_system:
-            x = internalloads2spar(x, self.nodes)
-        
-        self.resulting_forces = x[:, :3]
-        self.resulting_moments = x[:, 3:]
+        self._superpose()
 
     def plot_acting_loads(self, fig=None, clear=True):
         if fig is None:
@@ -159,71 +304,154 @@ class Stickmodel:
             print(f'{force_type} - {i}')
             ax.quiver(*forces[:,:3].T, *forces[:,3:-1].T*1e-2, color='C{:02d}'.format(i))     
 
+def _check_loads(loads, width):
+    """discrete loads as float array, (m, width) or stacked (K, m, width)"""
+
+    loads = np.asarray(loads, dtype=float)
+
+    if loads.ndim not in (2, 3) or loads.shape[-1] != width:
+        raise ValueError("forces and/or moments are not given in correct form")
+
+    return loads
+
+
+def _snapshot(array):
+    """shape and data of array for detection of modifications"""
+
+    array = np.asarray(array, dtype=float)
+
+    return array.shape, array.tobytes()
+
+
+def _element_sums(segs, values, n_segs):
+    """sums of values (..., m, 3) grouped by element indices segs (..., m),
+    values with indices of no element are ignored"""
+
+    valid = (segs >= 0) & (segs < n_segs) & (segs == np.floor(segs))
+
+    # distinct bins for every load case
+    batch = segs.shape[:-1]
+    cases = np.arange(int(np.prod(batch))).reshape(batch + (1,))
+
+    index = (cases*n_segs + np.where(valid, segs, 0)).astype(int).ravel()
+    weights = np.where(valid[..., np.newaxis], values, 0.0).reshape(-1, 3)
+
+    sums = np.column_stack([np.bincount(index, weights=column, minlength=cases.size*n_segs)
+                            for column in weights.T])
+
+    return sums.reshape(batch + (n_segs, 3))
+
+
+def _cumulative(increments, node, value):
+    """values x_i with x_(i+1) = x_i - increments_i and x_node = value"""
+
+    shape = increments.shape
+
+    sums = np.zeros(shape[:-2] + (shape[-2]+1, shape[-1]))
+    np.cumsum(increments, axis=-2, out=sums[..., 1:, :])
+
+    return value - (sums - sums[..., node:node+1, :])
+
+
+def _equilibrium_sweep(nodes, loads, node, values):
+    """Solve equilibrium of internal loads starting at a prescribed node
+
+    Internal loads of neighbouring nodes differ by the external loads of
+    the element between them (and the moment of the internal force), so
+    the block bidiagonal system is solved with cumulative sums.
+
+    Parameters
+    ----------
+    nodes : array
+        coordinates of nodes (n, 3)
+    loads : array
+        external forces and moments regarding first node of every
+        element (n-1, 6) or (K, n-1, 6)
+    node : int
+        index of prescribed node
+    values : array
+        prescribed internal forces and moments (6,)
+
+    Returns
+    -------
+    array
+        internal loads [[Fx, Fy, Fz, Mx, My, Mz], ...] (n, 6) or (K, n, 6)
+    """
+
+    forces = _cumulative(loads[..., :3], node, values[:3])
+
+    levers = np.diff(nodes, axis=0)
+    moments = _cumulative(loads[..., 3:] + np.cross(levers, forces[..., 1:, :]), node, values[3:])
+
+    return np.concatenate([forces, moments], axis=-1)
+
+
 def calc_lineloadresultants(ys, q):
     """Calculate resultants of loads for piecewise linear load distributin
+
+    Segments with sign change are represented by the resultants of two
+    triangles.
     
     Parameters
     ----------
     ys : numpy array, list
         grid points
     q : numpy array, list
-        field values
+        field values (N,) or field values of load cases (K, N)
     
     Returns
     -------
     array
-        discrete resultant forces and coordinates [[x, y, z, Q_x, Q_y, Q_z], ...]
+        discrete resultant forces and coordinates [[x, y, z, Q_x, Q_y, Q_z, segment], ...],
+        for load cases (K, 2*(N-1), 7) with two resultants per segment
+        (unused ones are zero)
     """
 
+    ys = np.asarray(ys, dtype=float)
+    q = np.asarray(q, dtype=float)
+
     # calculate element lengths
     Δys = np.diff(ys)
-    
-    # initialize arrays for
-    
-    # force resultants
-    Q = []
-    
-    # resultants attack point
-    y_res = []
 
-    # segments force resultant acts on
-    segs = []
-    
-    # iterate over parts of wing
-    for i in range(1,len(ys)):
-        
-        if q[i]==0 and q[i-1]==0:
-            # Nothing to do..
-            continue
-        elif (q[i]>=0 and q[i-1]>=0) or (q[i]<=0 and q[i-1]<=0):
-            # trapez rule to get resultant
-            Q.append(Δys[i-1] * (q[i]+q[i-1])/2)
-            # center of trapez as attack point of resultant
-            y_res.append(ys[i-1] + np.abs(Δys[i-1])/3 * np.abs((q[i-1]+2*q[i]) / (q[i]+q[i-1])))
-            segs.append(i-1)
-        else:
-            # sign changes from q[i-1] to q[i]
-            # cannot be captured by single resultant within this section
-            # -> resultants of the two triangles are used
-            y_0 = ys[i-1] + Δys[i-1] * np.abs(q[i]/q[i-1]) / (1 + np.abs(q[i]/q[i-1]))
-
-            #print(f'y_0 = {y_0, Δys, ys[i-1]}')
-
-            # left triangle
-            Q.append(0.5*(y_0-ys[i-1])*q[i-1])
-            y_res.append(ys[i-1] + (y_0 - ys[i-1])/3.0)
-            segs.append(i-1)
-
-            # right triangle
-            Q.append(0.5*(ys[i] - y_0)*q[i])
-            y_res.append(ys[i] - (ys[i]-y_0)/3.0)
-            segs.append(i-1)
-    
-    loads = np.zeros((len(y_res), 7))
-    loads[:, 1] = y_res
-    loads[:, -2] = Q
-    loads[:, -1] = segs
-    
+    q0 = q[..., :-1]
+    q1 = q[..., 1:]
+
+    # sign changes from q[i-1] to q[i]
+    # cannot be captured by single resultant within this section
+    # -> resultants of the two triangles are used
+    unloaded = (q0 == 0) & (q1 == 0)
+    change = ~(((q0 >= 0) & (q1 >= 0)) | ((q0 <= 0) & (q1 <= 0)))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # trapez rule to get resultant, center of trapez as attack point
+        Q_trapez = Δys * (q0+q1)/2
+        y_trapez = ys[:-1] + np.abs(Δys)/3 * np.abs((q0+2*q1) / (q0+q1))
+
+        # zero crossing
+        ratio = np.abs(q1/q0)
+        y_0 = ys[:-1] + Δys * ratio / (1 + ratio)
+
+    # left triangle (or trapez) and right triangle for every segment
+    Q = np.stack([np.where(change, 0.5*(y_0-ys[:-1])*q0, Q_trapez),
+                  np.where(change, 0.5*(ys[1:]-y_0)*q1, 0.0)], axis=-1)
+
+    y_res = np.stack([np.where(change, ys[:-1] + (y_0 - ys[:-1])/3.0, y_trapez),
+                      np.where(change, ys[1:] - (ys[1:]-y_0)/3.0, ys[:-1])], axis=-1)
+
+    used = np.stack([~unloaded, change], axis=-1)
+
+    segs = np.broadcast_to(np.arange(len(Δys))[:, np.newaxis], used.shape)
+
+    loads = np.zeros(used.shape + (7,))
+    loads[..., 1] = np.where(used, y_res, ys[:-1, np.newaxis])
+    loads[..., -2] = np.where(used, Q, 0.0)
+    loads[..., -1] = segs
+
+    loads = loads.reshape(q.shape[:-1] + (-1, 7))
+
+    if q.ndim == 1:
+        return loads[used.ravel()]
+
     return loads
 
 
@@ -435,7 +663,8 @@ def internalloads2spar(internalloads, sparnodes):
     Parameters
     ----------
     internalloads : array
-        internal loads (global cartesian coordinate system)
+        internal loads (global cartesian coordinate system), (n, 6) or
+        stacked load cases (K, n, 6)
     sparnodes : array
         coordinates of spar nodes
     
@@ -445,35 +674,37 @@ def internalloads2spar(internalloads, sparnodes):
         transformed internal loads [[Qn, Q1 Q2, Mt, Mb1, Mb2], ...]
     """
 
-    internalloads = np.copy(internalloads)
-    
-    for i, load in enumerate(internalloads):
+    internalloads = np.asarray(internalloads)
 
-        # get current spar normal
+    rotmats = _spar_rotations(sparnodes)
 
-        ## if last node - use same direction vector as before
-        if i == sparnodes.shape[0]-1:
-            i -= 1
-        
-        ns = _get_normal(*sparnodes[i:i+2,:])
-        
-        # rotation axis
-        nx = np.array([1,0,0])
-        n_rot = np.cross(nx, ns)
-        
-        # collect all direction vectors
-        n1 = ns
-        n2 = rotmat2(n_rot) @ ns
-        n3 = np.cross(n2, n1)
+    # do transformation, same rotation for all load cases
+    transformed = np.empty(np.broadcast(internalloads, 0.0).shape)
+    transformed[..., :3] = np.einsum('...ij,ijk->...ik', internalloads[..., :3], rotmats)
+    transformed[..., 3:] = np.einsum('...ij,ijk->...ik', internalloads[..., 3:], rotmats)
+
+    return transformed
+
+
+def _spar_rotations(sparnodes):
+    """rotation matrices from global into spar coordinate system of every node"""
+
+    # spar normals, last node uses same direction vector as before
+    ns = np.diff(sparnodes, axis=0).astype(float)
+    ns /= np.linalg.norm(ns, axis=1, keepdims=True)
+    ns = np.vstack([ns, ns[-1:]])
 
-        # build rotation matrix
-        rotmat = np.linalg.inv(np.vstack((n2,n1,n3)))
+    # rotation axis
+    nx = np.array([1,0,0])
+    n_rot = np.cross(nx, ns)
 
-        # do transformation
-        internalloads[i,:3] = load[:3] @ rotmat
-        internalloads[i, 3:] = load[3:] @ rotmat
+    # collect all direction vectors
+    n1 = ns
+    n2 = np.einsum('ijk,kj->ki', rotmat2(n_rot.T), ns)
+    n3 = np.cross(n2, n1)
 
-    return internalloads
+    # build rotation matrices
+    return np.linalg.inv(np.stack((n2,n1,n3), axis=1))
 
 def _get_normal(p1, p2):
     n = p2-p1